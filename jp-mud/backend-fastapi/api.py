@@ -1,20 +1,34 @@
+from contextlib import asynccontextmanager
 from fastapi import FastAPI, HTTPException
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 from typing import Dict, List, Optional
 import os
 from datetime import datetime, timedelta
 import uuid
 import json
+import asyncio
 
 # Import our modules
 from lib.session_manager import SessionManager, GameState, GameSession
-from lib.game import Game
+from lib.session_store import FileSessionStore, SQLiteSessionStore
+from lib.game import Game, command_stats
+from lib.game_cache import GameCache
 from lib.adventure_text import AdventureText
 from lib.world_generator import WorldGenerator
+from lib.world_pool import WorldPool
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Top up the world pools; worlds already pooled on disk are not generated again
+    for theme in WORLD_POOL_THEMES:
+        world_pool.prefetch(theme)
+    yield
+    world_pool.executor.shutdown(wait=False, cancel_futures=True)
 
 # Initialize FastAPI
-app = FastAPI(title="MUD Adventure API")
+app = FastAPI(title="MUD Adventure API", lifespan=lifespan)
 
 # Add CORS middleware to allow requests from the frontend
 app.add_middleware(
@@ -25,21 +39,21 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-# Directory to store session files
-SESSIONS_DIR = os.path.join(os.path.dirname(__file__), "data", "sessions")
-WORLDS_DIR = os.path.join(os.path.dirname(__file__), "data", "worlds")
-
-# Ensure the directories exist
-os.makedirs(SESSIONS_DIR, exist_ok=True)
-os.makedirs(WORLDS_DIR, exist_ok=True)
-
-# Function to get the file path for a session
-def get_session_file_path(session_id):
-    return os.path.join(SESSIONS_DIR, f"{session_id}.json")
-
-# Function to get the file path for a world
-def get_world_file_path(session_id):
-    return os.path.join(WORLDS_DIR, f"{session_id}.txt")
+# Session storage engine: "sqlite" (default) or "file" for one JSON file per session
+SESSION_STORE = os.getenv("SESSION_STORE", "sqlite")
+# Directory holding session data; override with MUD_DATA_DIR, e.g. for load tests
+DATA_DIR = os.getenv("MUD_DATA_DIR", os.path.join(os.path.dirname(__file__), "data"))
+# Database used by the SQLite storage engine
+DATABASE_FILE = os.path.join(DATA_DIR, "mud.sqlite3")
+# Directories used by the file storage engine
+SESSIONS_DIR = os.path.join(DATA_DIR, "sessions")
+WORLDS_DIR = os.path.join(DATA_DIR, "worlds")
+# Pre-generated worlds waiting for a game, kept across restarts
+WORLD_POOL_DIR = os.path.join(DATA_DIR, "world_pool")
+# Comma-separated popular themes whose worlds are pre-generated; other themes are generated on demand
+WORLD_POOL_THEMES = [theme.strip() for theme in os.getenv("WORLD_POOL_THEMES", "cafe").split(",") if theme.strip()]
+# Worlds kept ready per theme; 0 disables pre-generation
+WORLD_POOL_DEPTH = int(os.getenv("WORLD_POOL_DEPTH", "2"))
 
 # Data models
 class NewGameRequest(BaseModel):
@@ -54,40 +68,53 @@ class MessageResponse(BaseModel):
     session_id: str
     message: str
     game_state: Optional[GameState] = None
+    # Estimated tokens of the prompt sent for this turn; None if no LLM call was needed
+    prompt_tokens: Optional[int] = None
 
 # Initialize the session manager
-session_manager = SessionManager(SESSIONS_DIR)
+if SESSION_STORE == "file":
+    session_store = FileSessionStore(SESSIONS_DIR, WORLDS_DIR)
+else:
+    session_store = SQLiteSessionStore(DATABASE_FILE)
+    # Sessions and worlds kept by the file engine before SQLite became the default
+    if os.path.isdir(SESSIONS_DIR) or os.path.isdir(WORLDS_DIR):
+        session_store.migrate_from_files(FileSessionStore(SESSIONS_DIR, WORLDS_DIR))
+session_manager = SessionManager(store=session_store)
+# Live games of recently active sessions, kept across requests
+game_cache = GameCache(session_manager)
 # Initialize the world generator
 world_generator = WorldGenerator()
+# Pre-generated and recently generated worlds by theme
+world_pool = WorldPool(world_generator, themes=WORLD_POOL_THEMES, target_depth=WORLD_POOL_DEPTH,
+                       pool_dir=WORLD_POOL_DIR)
 
 # Helper function to get a game instance
-def get_game(session_id, theme, world_content):
-    return Game(session_manager, session_id, theme, world_content)
+def get_game(session_id, theme=None, world_content=None):
+    return game_cache.get_game(session_id, theme, world_content)
+
+# Handlers await LLM calls and run session storage (file or SQLite I/O) in
+# worker threads, so one slow request never stalls the event loop; handlers
+# that only touch storage are plain functions, which FastAPI runs in its threadpool
 
 @app.post("/api/game/new")
 async def new_game(request: NewGameRequest):
     # Generate a new session ID if none provided
     session_id = str(uuid.uuid4())
 
-    # Clean up old session if it exists
-    session_manager.delete_session(session_id)
-    # Clean up old world if it exists
-    world_file_path = get_world_file_path(session_id)
-    if os.path.exists(world_file_path):
-        os.remove(world_file_path)
+    # Clean up old session and world if they exist
+    await asyncio.to_thread(session_manager.delete_session, session_id)
+    game_cache.discard(session_id)
     print(f"Deleted session {session_id}")
 
-    # Generate new world content
-    world_content = world_generator.generate_world(request.theme)
+    # Take a pre-generated world for the theme, generating one only if none is ready
+    world_content = await world_pool.aget(request.theme)
     
     # Save the world content
-    world_file_path = get_world_file_path(session_id)
-    with open(world_file_path, 'w', encoding='utf-8') as f:
-        f.write(world_content)
+    await asyncio.to_thread(session_manager.save_world, session_id, world_content)
     
     # Create new game with the generated world
-    game = get_game(session_id, request.theme, world_content)
-    initial_message = game.process_command("look around")
+    game = await asyncio.to_thread(get_game, session_id, request.theme, world_content)
+    initial_message = await game.aprocess_command("look around")
     
     return {
         "session_id": game.session_id,
@@ -97,34 +124,60 @@ async def new_game(request: NewGameRequest):
 
 @app.post("/api/game/message")
 async def process_message(request: MessageRequest):
-    # Load the world content if it exists
-    world_content = None
-    if request.session_id:
-        world_file_path = get_world_file_path(request.session_id)
-        if os.path.exists(world_file_path):
-            with open(world_file_path, 'r', encoding='utf-8') as f:
-                world_content = f.read()
-    
-    game = get_game(request.session_id, request.theme, world_content)
-    response = game.process_command(request.message)
+    # Reuse the live game; its world is only loaded when the game is not cached
+    game = await asyncio.to_thread(get_game, request.session_id, request.theme)
+    response = await game.aprocess_command(request.message)
     return MessageResponse(
         session_id=game.session_id,
         message=response,
-        game_state=game.state
+        game_state=game.state,
+        prompt_tokens=game.prompt_tokens
+    )
+
+def sse_event(data: dict) -> str:
+    """Format one Server-Sent Event carrying JSON data"""
+    return f"data: {json.dumps(data, ensure_ascii=False)}\n\n"
+
+@app.post("/api/game/message/stream")
+async def stream_message(request: MessageRequest):
+    """
+    Process a message like /api/game/message, streaming the response as
+    Server-Sent Events: "token" events while the text is generated, then a
+    "done" event with the full message and the updated game state, or an
+    "error" event if the turn fails part-way.
+    """
+    game = await asyncio.to_thread(get_game, request.session_id, request.theme)
+
+    async def events():
+        parts = []
+        try:
+            async for text in game.astream_command(request.message):
+                parts.append(text)
+                yield sse_event({"type": "token", "text": text})
+        except Exception as e:
+            print(f"Error streaming message for session {game.session_id}: {str(e)}")
+            yield sse_event({"type": "error", "detail": str(e)})
+            return
+        yield sse_event({
+            "type": "done",
+            "session_id": game.session_id,
+            "message": "".join(parts),
+            "game_state": game.state.model_dump(),
+            "prompt_tokens": game.prompt_tokens
+        })
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
     )
 
 @app.get("/api/game/load/{session_id}")
-async def load_game(session_id: str):
+def load_game(session_id: str):
     session = session_manager.get_session(session_id)
     if session:
-        # Load the world content if it exists
-        world_content = None
-        world_file_path = get_world_file_path(session_id)
-        if os.path.exists(world_file_path):
-            with open(world_file_path, 'r', encoding='utf-8') as f:
-                world_content = f.read()
-        
-        game = get_game(session_id, session.state.theme, world_content)
+        # Build (or reuse) the live game so the next message finds it cached
+        game = get_game(session_id, session.state.theme)
         return {
             "success": True,
             "message": f"Game session {session_id} loaded successfully",
@@ -139,24 +192,31 @@ async def load_game(session_id: str):
         }
 
 @app.get("/api/game/sessions")
-async def list_sessions():
-    sessions = session_manager.list_sessions()
-    session_info = []
-    
-    for session_id in sessions:
-        session = session_manager.get_session(session_id)
-        if session:
-            session_info.append({
-                "id": session_id,
-                "theme": session.state.theme,
-                "created_at": session.created_at.isoformat() if hasattr(session, 'created_at') else None,
-                "last_active": session.last_active.isoformat() if hasattr(session, 'last_active') else None
-            })
+def list_sessions():
+    # Summaries come from one indexed query, so no session is loaded here
+    session_info = [
+        {
+            "id": entry["id"],
+            "theme": entry["theme"],
+            "created_at": entry["created_at"],
+            "last_active": entry["last_active"]
+        }
+        for entry in session_manager.list_session_summaries()
+    ]
     
     return {"sessions": session_info}
 
+@app.get("/api/game/metrics")
+def game_metrics():
+    """Commands served locally vs by the LLM, with latencies, game cache hit-rate and world pool depth"""
+    return {
+        "commands": command_stats.metrics(),
+        "game_cache": game_cache.metrics(),
+        "world_pool": world_pool.metrics()
+    }
+
 @app.post("/api/game/cleanup")
-async def cleanup_sessions(days: int = 7):
+def cleanup_sessions(days: int = 7):
     """Manually trigger cleanup of old sessions"""
     if days < 1:
         return {
@@ -164,9 +224,10 @@ async def cleanup_sessions(days: int = 7):
             "message": "Days parameter must be at least 1"
         }
     
-    initial_count = len(session_manager.sessions)
     removed_count = session_manager.cleanup_old_sessions(max_age_days=days)
-    final_count = len(session_manager.sessions)
+    # Drop live games of removed sessions
+    game_cache.clear()
+    final_count = session_manager.count_sessions()
     return {
         "success": True,
         "message": f"Cleaned up sessions older than {days} days",
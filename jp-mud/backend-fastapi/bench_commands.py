@@ -0,0 +1,64 @@
+import argparse
+import os
+import random
+import tempfile
+
+from lib.clients import register_openai_client, reset_openai_client
+from lib.fakes import FakeOpenAIClient
+from lib.game import Game, command_stats
+from lib.session_manager import SessionManager
+from lib.session_store import SQLiteSessionStore
+
+WORLD_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "worlds", "cafe-world.txt")
+
+# A player's command mix: navigation and inventory alongside open-ended interactions
+COMMANDS = [
+    "look", "見ます", "inventory", "持ち物", "exits", "go north",
+    "ドアを取ります", "take umbrella",
+    "メニューを見ます", "田中さんと話します", "コーヒーを飲みます", "ケーキを食べます",
+]
+
+
+def play(game: Game, commands: int, rng: random.Random):
+    """Mix fixed commands with moves to a random exit of the current room"""
+    for _ in range(commands):
+        if rng.random() < 0.3:
+            exits = game.world.exits(game.state.room)
+            command = f"{rng.choice(exits).japanese}に行きます" if exits else "look"
+        else:
+            command = rng.choice(COMMANDS)
+        game.process_command(command)
+
+
+def report(name: str, stats: dict):
+    print(f"{name:<6} {stats['count']:>5} commands  mean {stats['mean_ms']:8.2f} ms  "
+          f"p50 {stats['p50_ms']:8.2f} ms  p95 {stats['p95_ms']:8.2f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Commands answered by the local interpreter vs the LLM")
+    parser.add_argument("--commands", type=int, default=500, help="Commands to send")
+    parser.add_argument("--llm-latency", type=float, default=0.05, help="Simulated completion latency (s)")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    register_openai_client(FakeOpenAIClient(latency=args.llm_latency))
+    with open(WORLD_FILE, 'r', encoding='utf-8') as f:
+        world_content = f.read()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        session_manager = SessionManager(store=SQLiteSessionStore(os.path.join(data_dir, "mud.sqlite3")))
+        game = Game(session_manager, None, "cafe", world_content)
+        command_stats.reset()
+        play(game, args.commands, random.Random(args.seed))
+
+    metrics = command_stats.metrics()
+    print(f"{metrics['commands']} commands, {metrics['local_fraction']:.0%} answered locally, "
+          f"LLM latency {args.llm_latency * 1000:.0f} ms simulated")
+    report("local", metrics['local'])
+    report("llm", metrics['llm'])
+    reset_openai_client()
+
+
+if __name__ == "__main__":
+    main()
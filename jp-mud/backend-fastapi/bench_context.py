@@ -0,0 +1,64 @@
+import argparse
+import os
+import statistics
+
+from lib.adventure_text import AdventureText
+from lib.context_builder import estimate_tokens
+from lib.session_manager import GameState
+
+WORLD_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "worlds", "cafe-world.txt")
+ROOMS = ["entrance", "counter area", "coffee bar", "seating area", "kitchen"]
+
+
+def full_prompt_tokens(adventure_text: AdventureText, command: str, state: GameState) -> int:
+    """Prompt size as it used to be: the whole world and every item, room and word in full"""
+    mastered = [k for k, v in state.vocabulary.items() if v]
+    prompt = f"""
+        Current room: {state.room}
+        Inventory: {', '.join(state.inventory) if state.inventory else 'empty'}
+        Visited rooms: {', '.join(state.visited_rooms)}
+        The player has entered the command: "{command}"
+        Current vocabulary mastered: {', '.join(mastered)}
+        """
+    return estimate_tokens(adventure_text.context) + estimate_tokens(adventure_text.world_content) + estimate_tokens(prompt)
+
+
+def simulate_turn(state: GameState, turn: int):
+    """Grow the game state the way a long game does"""
+    state.room = ROOMS[turn % len(ROOMS)]
+    state.visited_rooms.append(state.room)
+    if turn % 3 == 0:
+        state.inventory.append(f"item{turn}")
+    state.vocabulary[f"word{turn}"] = True
+
+
+def report(name: str, tokens: list):
+    print(f"{name:<8} mean {statistics.mean(tokens):7.0f}  p50 {statistics.median(tokens):7.0f}  "
+          f"max {max(tokens):7d}  last {tokens[-1]:7d} estimated prompt tokens")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Prompt size over a long game, whole world vs room context")
+    parser.add_argument("--turns", type=int, default=500, help="Turns to simulate")
+    args = parser.parse_args()
+
+    with open(WORLD_FILE, 'r', encoding='utf-8') as f:
+        world_content = f.read()
+    adventure_text = AdventureText("cafe", world_content)
+    state = GameState(room=ROOMS[0], theme="cafe")
+
+    full, windowed = [], []
+    for turn in range(args.turns):
+        simulate_turn(state, turn)
+        command = "メニューを見ます"
+        full.append(full_prompt_tokens(adventure_text, command, state))
+        adventure_text._messages(adventure_text.build_prompt(command, state), state.room)
+        windowed.append(adventure_text.last_prompt_tokens)
+
+    print(f"{args.turns} turns, budget {adventure_text.max_prompt_tokens} tokens")
+    report("full", full)
+    report("windowed", windowed)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+import argparse
+import json
+import os
+import statistics
+import tempfile
+import time
+from datetime import datetime
+
+from lib.session_manager import SessionManager, GameState
+from lib.session_store import FileSessionStore, SQLiteSessionStore
+
+RESPONSE = "カウンターに着きました。レジ (reji / cash register) とレシート (reshiito / receipt) が見えます。"
+
+
+def rewrite_turn(manager: SessionManager, session):
+    """Persist a turn by rewriting the whole session JSON, as save_session used to"""
+    if not isinstance(manager.store, FileSessionStore):
+        manager.save_session(session.id, session)
+        return
+    session_data = {
+        'id': session.id,
+        'state': session.state.model_dump(),
+        'history': session.history,
+        'created_at': session.created_at.isoformat(),
+        'last_active': session.last_active.isoformat()
+    }
+    with open(manager.store.get_session_file_path(session.id), 'w') as f:
+        json.dump(session_data, f, indent=2)
+
+
+def append_turn(manager: SessionManager, session):
+    manager.append_history(session.id, session, session.history[-1])
+
+
+def run_session(manager: SessionManager, session_id: str, turns: int, persist) -> list:
+    """Play turns against a session, returning the persistence latency of each turn"""
+    session = manager.create_session(session_id, GameState(room="entrance", visited_rooms=["entrance"]))
+    latencies = []
+    for turn in range(turns):
+        session.history.append({"command": f"look around {turn}", "response": RESPONSE})
+        session.state.score += 1
+        session.last_active = datetime.now()
+        start = time.perf_counter()
+        persist(manager, session)
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name: str, latencies: list, window: int = 100):
+    first = statistics.mean(latencies[:window]) * 1000
+    last = statistics.mean(latencies[-window:]) * 1000
+    p99 = sorted(latencies)[int(len(latencies) * 0.99)] * 1000
+    print(f"{name:<8} first {window} turns {first:7.3f} ms  last {window} turns {last:7.3f} ms  "
+          f"p99 {p99:7.3f} ms  total {sum(latencies):6.2f} s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-turn session persistence benchmark")
+    parser.add_argument("--turns", type=int, default=1000, help="Turns per session")
+    parser.add_argument("--sessions", type=int, default=5, help="Sessions to play")
+    parser.add_argument("--compact-every", type=int, default=100, help="Turns between history log compactions")
+    parser.add_argument("--store", choices=["file", "sqlite"], default="file", help="Storage engine")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as sessions_dir:
+        if args.store == "file":
+            make_store = lambda: FileSessionStore(sessions_dir, compact_every=args.compact_every)
+        else:
+            make_store = lambda: SQLiteSessionStore(os.path.join(sessions_dir, "mud.sqlite3"))
+        manager = SessionManager(store=make_store())
+        for name, persist in (("rewrite", rewrite_turn), ("append", append_turn)):
+            latencies = []
+            for i in range(args.sessions):
+                latencies += run_session(manager, f"{name}-{i}", args.turns, persist)
+            report(name, latencies)
+
+        reader = SessionManager(store=make_store())
+        start = time.perf_counter()
+        session = reader.get_session("append-0")
+        elapsed = time.perf_counter() - start
+        assert len(session.history) == args.turns and session.state.score == args.turns
+        print(f"Loading a {args.turns}-turn session: {elapsed * 1000:.2f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import os
+import statistics
+import tempfile
+import time
+
+from openai import OpenAI
+
+from lib.clients import register_openai_client, reset_openai_client
+from lib.fakes import FakeOpenAIClient
+from lib.game import Game
+from lib.game_cache import GameCache
+from lib.session_manager import SessionManager
+from lib.session_store import FileSessionStore, SQLiteSessionStore
+
+WORLD_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "worlds", "cafe-world.txt")
+
+
+def rebuild_game(game_cache: GameCache, session_id: str) -> Game:
+    """Per-message setup as the API used to do it: reload the world, build a new Game and OpenAI client"""
+    session_manager = game_cache.session_manager
+    world_content = session_manager.get_world(session_id)
+    OpenAI(api_key="bench")
+    return Game(session_manager, session_id, "cafe", world_content)
+
+
+def cached_game(game_cache: GameCache, session_id: str) -> Game:
+    return game_cache.get_game(session_id)
+
+
+def run(game_cache: GameCache, session_ids: list, messages: int, get_game) -> list:
+    """Send messages round-robin across sessions, returning per-message latency"""
+    latencies = []
+    for i in range(messages):
+        session_id = session_ids[i % len(session_ids)]
+        start = time.perf_counter()
+        game = get_game(game_cache, session_id)
+        game.process_command("メニューを見ます")
+        latencies.append(time.perf_counter() - start)
+    return latencies
+
+
+def report(name: str, latencies: list):
+    latencies = sorted(latencies)
+    p95 = latencies[int(len(latencies) * 0.95)]
+    print(f"{name:<8} mean {statistics.mean(latencies) * 1000:7.3f} ms  "
+          f"p50 {statistics.median(latencies) * 1000:7.3f} ms  p95 {p95 * 1000:7.3f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Per-message overhead benchmark, excluding LLM time")
+    parser.add_argument("--sessions", type=int, default=50, help="Concurrent game sessions")
+    parser.add_argument("--messages", type=int, default=2000, help="Messages to send")
+    parser.add_argument("--store", choices=["file", "sqlite"], default="sqlite", help="Storage engine")
+    args = parser.parse_args()
+
+    # Instant completions, so only the per-message overhead is measured
+    llm = FakeOpenAIClient()
+    register_openai_client(llm)
+    with open(WORLD_FILE, 'r', encoding='utf-8') as f:
+        world_content = f.read()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        if args.store == "file":
+            store = FileSessionStore(os.path.join(data_dir, "sessions"), os.path.join(data_dir, "worlds"))
+        else:
+            store = SQLiteSessionStore(os.path.join(data_dir, "mud.sqlite3"))
+        game_cache = GameCache(SessionManager(store=store))
+
+        session_ids = []
+        for i in range(args.sessions):
+            session_id = f"bench-{i}"
+            game_cache.session_manager.save_world(session_id, world_content)
+            game_cache.get_game(session_id, "cafe", world_content)
+            session_ids.append(session_id)
+
+        for name, get_game in (("rebuild", rebuild_game), ("cached", cached_game)):
+            report(name, run(game_cache, session_ids, args.messages, get_game))
+
+        print(f"Game cache: {game_cache.metrics()}")
+        print(f"LLM calls: {llm.calls}")
+
+    reset_openai_client()
+
+
+if __name__ == "__main__":
+    main()
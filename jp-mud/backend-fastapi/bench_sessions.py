@@ -0,0 +1,135 @@
+import argparse
+import contextlib
+import io
+import json
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+from lib.session_manager import SessionManager, GameSession
+from lib.session_store import FileSessionStore, SQLiteSessionStore, state_from_data
+
+THEMES = ["cafe", "office", "school", "station", "hospital"]
+
+
+def session_data(i: int, history_length: int) -> dict:
+    """A synthetic session laid out the way session files store it"""
+    last_active = (datetime.now() - timedelta(minutes=i)).isoformat()
+    return {
+        'id': f"bench-{i:06d}",
+        'state': {
+            'room': 'entrance',
+            'inventory': ['メニュー'],
+            'visited_rooms': ['entrance'],
+            'npc_interactions': {},
+            'vocabulary': {'ドア': True},
+            'conversation_vocabulary': {},
+            'score': 5,
+            'theme': THEMES[i % len(THEMES)]
+        },
+        'history': [
+            {'command': 'look around', 'response': 'ドア (doa / door) があります。'}
+            for _ in range(history_length)
+        ],
+        'created_at': last_active,
+        'last_active': last_active
+    }
+
+
+def write_session_files(sessions_dir: str, count: int, history_length: int):
+    """Write count session files (with inline history, as before the history log) and their index"""
+    index_lines = []
+    for i in range(count):
+        data = session_data(i, history_length)
+        with open(os.path.join(sessions_dir, f"{data['id']}.json"), 'w') as f:
+            json.dump(data, f, indent=2)
+        index_lines.append(json.dumps({
+            'id': data['id'],
+            'theme': data['state']['theme'],
+            'created_at': data['created_at'],
+            'last_active': data['last_active']
+        }))
+    with open(os.path.join(sessions_dir, FileSessionStore.INDEX_FILE), 'w') as f:
+        f.write("\n".join(index_lines) + "\n")
+
+
+def write_session_rows(db_file: str, count: int, history_length: int):
+    store = SQLiteSessionStore(db_file)
+    for i in range(count):
+        data = session_data(i, history_length)
+        store.save(GameSession(
+            id=data['id'],
+            state=state_from_data(data['state']),
+            history=data['history'],
+            created_at=datetime.fromisoformat(data['created_at']),
+            last_active=datetime.fromisoformat(data['last_active'])
+        ))
+    store.conn.close()
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return result, time.perf_counter() - start
+
+
+def eager_load(sessions_dir: str) -> int:
+    """Parse every session file up front, as SessionManager used to at startup"""
+    store = FileSessionStore(sessions_dir)
+    sessions = {}
+    for filename in os.listdir(sessions_dir):
+        if filename.endswith('.json'):
+            sessions[filename[:-5]] = store.load(filename[:-5])
+    return len(sessions)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Session manager startup benchmark")
+    parser.add_argument("--sessions", type=int, default=100_000, help="Sessions to generate")
+    parser.add_argument("--history", type=int, default=10, help="History entries per session")
+    parser.add_argument("--store", choices=["file", "sqlite"], default="file", help="Storage engine")
+    parser.add_argument("--skip-eager", action="store_true", help="Skip the eager-load baseline (file store)")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        print(f"Writing {args.sessions} sessions...")
+        if args.store == "file":
+            write_session_files(data_dir, args.sessions, args.history)
+            make_store = lambda: FileSessionStore(data_dir)
+            if not args.skip_eager:
+                loaded, elapsed = timed(eager_load, data_dir)
+                print(f"Eager load of {loaded} sessions:      {elapsed:8.3f} s")
+        else:
+            db_file = os.path.join(data_dir, "mud.sqlite3")
+            write_session_rows(db_file, args.sessions, args.history)
+            make_store = lambda: SQLiteSessionStore(db_file)
+
+        manager, elapsed = timed(lambda: SessionManager(store=make_store()))
+        print(f"Lazy startup:                        {elapsed * 1000:8.3f} ms")
+
+        sessions, elapsed = timed(manager.list_session_summaries)
+        print(f"First listing ({len(sessions)} sessions):     {elapsed * 1000:8.1f} ms")
+
+        session_ids = [f"bench-{i:06d}" for i in random.sample(range(args.sessions), min(1000, args.sessions))]
+        _, elapsed = timed(lambda: [manager.get_session(session_id) for session_id in session_ids])
+        print(f"Cold get_session:                    {elapsed / len(session_ids) * 1000:8.3f} ms/session")
+        _, elapsed = timed(lambda: [manager.get_session(session_id) for session_id in session_ids[-100:]])
+        print(f"Warm get_session:                    {elapsed / 100 * 1000:8.3f} ms/session")
+        print(f"Sessions held in memory:             {len(manager.sessions):8d}")
+
+        # Sessions are a minute apart, so this removes roughly the older half
+        days = args.sessions / 2 / (24 * 60)
+        with contextlib.redirect_stdout(io.StringIO()):
+            removed, elapsed = timed(manager.store.delete_inactive, datetime.now() - timedelta(days=days))
+        print(f"Cleanup of {removed} idle sessions:     {elapsed:8.3f} s")
+
+        if args.store == "file":
+            os.remove(manager.store.get_index_file_path())
+            _, elapsed = timed(FileSessionStore(data_dir).list_summaries)
+            print(f"One-off index rebuild:               {elapsed:8.3f} s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+import argparse
+import json
+import os
+import socket
+import statistics
+import tempfile
+import threading
+import time
+
+import httpx
+import uvicorn
+
+from lib.clients import register_openai_client, reset_openai_client
+from lib.fakes import FakeAsyncOpenAIClient
+
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+
+def start_server(app, port: int) -> uvicorn.Server:
+    """Serve the app over real HTTP in a background thread, so streamed bytes arrive as sent"""
+    server = uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=server.run, daemon=True).start()
+    while not server.started:
+        time.sleep(0.01)
+    return server
+
+
+def time_message(client: httpx.Client, session_id: str) -> tuple:
+    """Time-to-text and total time of the buffered endpoint (the same, since the body arrives at once)"""
+    start = time.perf_counter()
+    client.post("/api/game/message", json={"session_id": session_id, "message": "メニューを見ます"}).raise_for_status()
+    elapsed = time.perf_counter() - start
+    return elapsed, elapsed
+
+
+def time_stream(client: httpx.Client, session_id: str) -> tuple:
+    """Time to the first token event and to the done event of the streaming endpoint"""
+    start = time.perf_counter()
+    first_token = None
+    with client.stream("POST", "/api/game/message/stream", json={"session_id": session_id, "message": "メニューを見ます"}) as response:
+        for line in response.iter_lines():
+            if not line.startswith("data: "):
+                continue
+            event = json.loads(line[len("data: "):])
+            if event["type"] == "token" and first_token is None:
+                first_token = time.perf_counter() - start
+    return first_token, time.perf_counter() - start
+
+
+def report(name: str, timings: list):
+    first, total = zip(*timings)
+    print(f"{name:<9} first text p50 {statistics.median(first) * 1000:7.1f} ms  "
+          f"complete p50 {statistics.median(total) * 1000:7.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time-to-first-token of buffered vs streamed game responses")
+    parser.add_argument("--messages", type=int, default=10, help="Messages per endpoint")
+    parser.add_argument("--latency", type=float, default=0.5, help="Simulated time to the first LLM token (s)")
+    parser.add_argument("--chunk-delay", type=float, default=0.02, help="Simulated delay between LLM chunks (s)")
+    args = parser.parse_args()
+
+    register_openai_client(async_client=FakeAsyncOpenAIClient(latency=args.latency, chunk_delay=args.chunk_delay))
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        os.environ["MUD_DATA_DIR"] = data_dir
+        import api
+
+        port = free_port()
+        server = start_server(api.app, port)
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}", timeout=60) as client:
+            session_id = client.post("/api/game/new", json={"theme": "cafe"}).json()["session_id"]
+            report("buffered", [time_message(client, session_id) for _ in range(args.messages)])
+            report("streamed", [time_stream(client, session_id) for _ in range(args.messages)])
+            history = client.get(f"/api/game/load/{session_id}").json()["history"]
+            print(f"Turns recorded: {len(history)}")
+        server.should_exit = True
+
+    reset_openai_client()
+
+
+if __name__ == "__main__":
+    main()
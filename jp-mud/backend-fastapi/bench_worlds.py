@@ -0,0 +1,61 @@
+import argparse
+import os
+import statistics
+import time
+
+from lib.clients import register_openai_client, reset_openai_client
+from lib.fakes import FakeOpenAIClient
+from lib.world_generator import WorldGenerator
+from lib.world_pool import WorldPool
+
+WORLD_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "worlds", "cafe-world.txt")
+
+
+def start_games(get_world, games: int, interval: float) -> list:
+    """Start games interval seconds apart, returning how long each waited for its world"""
+    latencies = []
+    for i in range(games):
+        start = time.perf_counter()
+        get_world("cafe")
+        latencies.append(time.perf_counter() - start)
+        time.sleep(interval)
+    return latencies
+
+
+def report(name: str, latencies: list):
+    latencies = sorted(latencies)
+    p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+    print(f"{name:<9} mean {statistics.mean(latencies) * 1000:8.1f} ms  "
+          f"p50 {statistics.median(latencies) * 1000:8.1f} ms  p95 {p95 * 1000:8.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Time to a world for a new game, generated vs pooled")
+    parser.add_argument("--games", type=int, default=20, help="New games to start")
+    parser.add_argument("--interval", type=float, default=0.2, help="Seconds between new games")
+    parser.add_argument("--llm-latency", type=float, default=1.0, help="Simulated world generation latency (s)")
+    parser.add_argument("--depth", type=int, default=2, help="Worlds kept ready per theme")
+    parser.add_argument("--no-reuse", action="store_true", help="Generate on the spot when the pool is empty")
+    args = parser.parse_args()
+
+    with open(WORLD_FILE, 'r', encoding='utf-8') as f:
+        world_content = f.read()
+    register_openai_client(FakeOpenAIClient(lambda messages: world_content, latency=args.llm_latency))
+    world_generator = WorldGenerator()
+
+    report("generate", start_games(world_generator.generate_world, args.games, args.interval))
+
+    world_pool = WorldPool(world_generator, target_depth=args.depth, reuse_worlds=not args.no_reuse)
+    # Warm the pool as the API does at startup
+    world_pool.prefetch("cafe")
+    while world_pool.depth("cafe") < args.depth:
+        time.sleep(0.01)
+    report("pooled", start_games(world_pool.get, args.games, args.interval))
+
+    world_pool.executor.shutdown(wait=True)
+    print(f"World pool: {world_pool.metrics()}")
+    reset_openai_client()
+
+
+if __name__ == "__main__":
+    main()
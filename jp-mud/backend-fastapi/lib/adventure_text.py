@@ -1,31 +1,50 @@
-from openai import OpenAI
 from dotenv import load_dotenv
 import os
 import pathlib
 import re
+from collections import deque
+
+from lib.clients import get_async_openai_client, get_openai_client
+from lib.context_builder import (
+    MAX_PROMPT_TOKENS, RECENT_ITEMS, RECENT_ROOMS, RECENT_WORDS,
+    estimate_tokens, fit_world_context, summarize
+)
+from lib.world_model import parse_world
 
 # Load environment variables from .env file
 load_dotenv()
 
 class AdventureText:
-    def __init__(self, theme="cafe", world_content: str = None):
-        self.client = OpenAI()
+    def __init__(self, theme="cafe", world_content: str = None, max_prompt_tokens: int = MAX_PROMPT_TOKENS):
         self.theme = theme
         
         # Use provided world content or load from file
         if world_content is None:
             world_content = self._load_world_file(theme)
+        self.world_content = world_content
+        # Rooms, exits, objects and NPCs of the world, parsed once per world
+        self.world = parse_world(world_content)
+        self.max_prompt_tokens = max_prompt_tokens
+        # Estimated prompt tokens of recent turns, newest last
+        self.prompt_tokens = deque(maxlen=100)
         
         self.context = f"""
         You are a Japanese language learning text adventure game.
         Generate engaging responses that teach Japanese vocabulary naturally.
         Keep responses concise and focused on the current action.
         Always include relevant Japanese vocabulary with format: 日本語 (romaji / english)
-        
-        World information:
-        {world_content}
         """
     
+    @property
+    def client(self):
+        """Shared, connection-pooled OpenAI client"""
+        return get_openai_client()
+
+    @property
+    def async_client(self):
+        """Shared, connection-pooled async OpenAI client"""
+        return get_async_openai_client()
+
     def _load_world_file(self, theme):
         """Try to load the world file based on theme"""
         world_file_name = f"{theme}-world.txt"
@@ -76,21 +95,75 @@ class AdventureText:
         print(f"Warning: Could not find {world_file_name} file")
         return ""
     
-    def generate_text(self, prompt: str) -> str:
+    def world_context(self, room, budget: int) -> str:
+        """
+        World information for the current room within a token budget: the
+        room, its connections and its NPCs rather than the whole world.
+        """
+        if room is None or not self.world.rooms:
+            # Unstructured world text: send what fits
+            return fit_world_context({'room': self.world_content}, budget)
+        return fit_world_context(self.world.room_context(room), budget)
+
+    def _messages(self, prompt: str, room=None):
+        budget = self.max_prompt_tokens - estimate_tokens(self.context) - estimate_tokens(prompt)
+        system = f"""{self.context}
+        World information:
+        {self.world_context(room, budget)}
+        """
+        self.prompt_tokens.append(estimate_tokens(system) + estimate_tokens(prompt))
+        return [
+            {"role": "system", "content": system},
+            {"role": "user", "content": prompt}
+        ]
+
+    @property
+    def last_prompt_tokens(self):
+        """Estimated prompt tokens of the latest turn"""
+        return self.prompt_tokens[-1] if self.prompt_tokens else None
+
+    def generate_text(self, prompt: str, room=None) -> str:
         """Generate text based on a prompt using OpenAI LLMs"""
         try:
             response = self.client.chat.completions.create(
                 model="gpt-4",
-                messages=[
-                    {"role": "system", "content": self.context},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._messages(prompt, room),
                 temperature=0.7,
                 max_tokens=150
             )
             return response.choices[0].message.content
         except Exception as e:
             return f"Error generating response: {str(e)}"
+
+    async def agenerate_text(self, prompt: str, room=None) -> str:
+        """Generate text like generate_text, without blocking the event loop"""
+        try:
+            response = await self.async_client.chat.completions.create(
+                model="gpt-4",
+                messages=self._messages(prompt, room),
+                temperature=0.7,
+                max_tokens=150
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            return f"Error generating response: {str(e)}"
+
+
+    async def astream_text(self, prompt: str, room=None):
+        """Generate text like agenerate_text, yielding it piece by piece as the model writes it"""
+        try:
+            stream = await self.async_client.chat.completions.create(
+                model="gpt-4",
+                messages=self._messages(prompt, room),
+                temperature=0.7,
+                max_tokens=150,
+                stream=True
+            )
+            async for chunk in stream:
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
+        except Exception as e:
+            yield f"Error generating response: {str(e)}"
             
     def process_command(self, command: str, game_state) -> str:
         """
@@ -103,7 +176,18 @@ class AdventureText:
         Returns:
             Text response to the command
         """
-        # Create a prompt that includes the game state and command
+        response = self.generate_text(self.build_prompt(command, game_state), game_state.room)
+        self.apply_response(command, response, game_state)
+        return response
+
+    async def aprocess_command(self, command: str, game_state) -> str:
+        """Process a user command like process_command, awaiting the LLM instead of blocking on it"""
+        response = await self.agenerate_text(self.build_prompt(command, game_state), game_state.room)
+        self.apply_response(command, response, game_state)
+        return response
+
+    def build_prompt(self, command: str, game_state) -> str:
+        """Create a prompt that includes the game state and command"""
         room = game_state.room
         inventory = game_state.inventory
         visited_rooms = game_state.visited_rooms
@@ -117,10 +201,11 @@ class AdventureText:
         mastered_words = sum(1 for v in vocabulary.values() if v) + sum(1 for v in conversation_vocabulary.values() if v)
         progress_percentage = (mastered_words / total_words) * 100 if total_words > 0 else 0
         
+        # Long lists are summarized so the prompt stays bounded over a long game
         prompt = f"""
         Current room: {room}
-        Inventory: {', '.join(inventory) if inventory else 'empty'}
-        Visited rooms: {', '.join(visited_rooms)}
+        Inventory: {summarize(inventory, RECENT_ITEMS) if inventory else 'empty'}
+        Visited rooms: {len(visited_rooms)} ({summarize(visited_rooms, RECENT_ROOMS)})
         Theme: {theme}
         Score: {score}
         Vocabulary mastered: {mastered_words}/{total_words} ({progress_percentage:.1f}%)
@@ -135,13 +220,13 @@ class AdventureText:
         2. Increase their score
         3. Mention in your response that they've learned a new word
         
-        Current vocabulary mastered: {', '.join(k for k, v in vocabulary.items() if v)}
-        Current conversation vocabulary mastered: {', '.join(k for k, v in conversation_vocabulary.items() if v)}
+        Recently mastered vocabulary: {summarize([k for k, v in vocabulary.items() if v], RECENT_WORDS)}
+        Recently mastered conversation vocabulary: {summarize([k for k, v in conversation_vocabulary.items() if v], RECENT_WORDS)}
         """
-        
-        # Generate the response
-        response = self.generate_text(prompt)
-        
+        return prompt
+
+    def apply_response(self, command: str, response: str, game_state):
+        """Update the game state from a generated response, e.g. mark learned vocabulary"""
         # Check if new vocabulary was learned (this would be indicated in the response)
         # This is a simple implementation - in a real game, you'd want more sophisticated parsing
         if "learned a new word" in response.lower():
@@ -165,6 +250,3 @@ class AdventureText:
                     if new_word not in game_state.vocabulary:
                         game_state.vocabulary[new_word] = True
                         game_state.score += 5  # Points for object vocabulary
-        
-        # Generate and return the response
-        return response
\ No newline at end of file
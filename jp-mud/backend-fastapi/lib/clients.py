@@ -0,0 +1,65 @@
+import threading
+
+import httpx
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient, DefaultHttpxClient, OpenAI
+
+# Load environment variables from .env file
+load_dotenv()
+
+# HTTP connections kept open to the OpenAI API, shared by every game and the world generator
+MAX_CONNECTIONS = 50
+
+_client = None
+_async_client = None
+_lock = threading.Lock()
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(max_connections=MAX_CONNECTIONS, max_keepalive_connections=MAX_CONNECTIONS)
+
+
+def get_openai_client() -> OpenAI:
+    """
+    Return the shared OpenAI client, creating it on first use.
+    The client is thread-safe and pools HTTP connections, so every game
+    reuses the same one instead of opening its own.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                _client = OpenAI(http_client=DefaultHttpxClient(limits=_limits()))
+    return _client
+
+
+def get_async_openai_client() -> AsyncOpenAI:
+    """
+    Return the shared async OpenAI client, creating it on first use.
+    Used by the API handlers so a pending completion does not block the
+    event loop for other players.
+    """
+    global _async_client
+    if _async_client is None:
+        with _lock:
+            if _async_client is None:
+                _async_client = AsyncOpenAI(http_client=DefaultAsyncHttpxClient(limits=_limits()))
+    return _async_client
+
+
+def register_openai_client(client=None, async_client=None):
+    """Install clients, e.g. local stand-ins for offline runs"""
+    global _client, _async_client
+    with _lock:
+        if client is not None:
+            _client = client
+        if async_client is not None:
+            _async_client = async_client
+
+
+def reset_openai_client():
+    """Drop the shared clients so the next call creates fresh ones"""
+    global _client, _async_client
+    with _lock:
+        _client = None
+        _async_client = None
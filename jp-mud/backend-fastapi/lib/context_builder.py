@@ -0,0 +1,37 @@
+from typing import Dict, List
+
+# Inventory items, visited rooms and mastered words listed in full before older ones are summarized
+RECENT_ITEMS = 8
+RECENT_ROOMS = 5
+RECENT_WORDS = 10
+
+# Prompt budget (system context plus player prompt) in estimated tokens
+MAX_PROMPT_TOKENS = 1200
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate: one token per CJK character, four characters per token otherwise"""
+    cjk = sum(1 for c in text if '\u3040' <= c <= '\u30ff' or '\u4e00' <= c <= '\u9fff')
+    return cjk + (len(text) - cjk) // 4
+
+
+def summarize(items: List[str], recent: int) -> str:
+    """List the most recent items in full and count the older ones"""
+    if len(items) <= recent:
+        return ', '.join(items)
+    return f"{', '.join(items[-recent:])} (and {len(items) - recent} earlier)"
+
+
+def fit_world_context(parts: Dict[str, str], budget: int) -> str:
+    """
+    Join world context parts within a token budget, dropping NPCs and then
+    connections before truncating the room section itself.
+    """
+    for drop in ((), ('npcs',), ('npcs', 'connections')):
+        text = "\n\n".join(value for key, value in parts.items() if value and key not in drop)
+        if estimate_tokens(text) <= budget:
+            return text
+    room = parts.get('room', '')
+    while room and estimate_tokens(room) > budget:
+        room = room[:int(len(room) * 0.8)]
+    return room
@@ -0,0 +1,71 @@
+import asyncio
+import time
+from types import SimpleNamespace
+from typing import Callable, Dict, List
+
+# Canned game response in the format AdventureText asks for
+SAMPLE_RESPONSE = (
+    "You step into the entrance. A ドア (doa / door) stands behind you and a "
+    "メニュー (menyuu / menu) hangs on the wall next to the 看板 (kanban / sign)."
+)
+
+
+def default_responder(messages: List[Dict[str, str]]) -> str:
+    return SAMPLE_RESPONSE
+
+
+class FakeOpenAIClient:
+    """
+    Local stand-in for the OpenAI client with a fixed completion latency,
+    for benchmarks and load tests that should not call the API.
+    Only chat.completions.create is implemented.
+    """
+
+    def __init__(self, responder: Callable[[List[Dict[str, str]]], str] = default_responder, latency: float = 0.0):
+        self.responder = responder
+        self.latency = latency
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _create(self, model: str, messages: List[Dict[str, str]], **kwargs):
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        content = self.responder(messages)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+class FakeAsyncOpenAIClient:
+    """
+    Async counterpart of FakeOpenAIClient; waits without blocking the event loop.
+    With stream=True the response arrives in chunk_size-character chunks:
+    the first after latency, the rest chunk_delay apart. Without streaming
+    the whole response arrives once every chunk would have.
+    """
+
+    def __init__(self, responder: Callable[[List[Dict[str, str]]], str] = default_responder, latency: float = 0.0,
+                 chunk_size: int = 4, chunk_delay: float = 0.0):
+        self.responder = responder
+        self.latency = latency
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.calls = 0
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+
+    def _chunks(self, content: str) -> List[str]:
+        return [content[i:i + self.chunk_size] for i in range(0, len(content), self.chunk_size)]
+
+    async def _create(self, model: str, messages: List[Dict[str, str]], stream: bool = False, **kwargs):
+        self.calls += 1
+        content = self.responder(messages)
+        if stream:
+            return self._stream(content)
+        await asyncio.sleep(self.latency + self.chunk_delay * max(len(self._chunks(content)) - 1, 0))
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+    async def _stream(self, content: str):
+        await asyncio.sleep(self.latency)
+        for i, text in enumerate(self._chunks(content)):
+            if i and self.chunk_delay:
+                await asyncio.sleep(self.chunk_delay)
+            yield SimpleNamespace(choices=[SimpleNamespace(delta=SimpleNamespace(content=text))])
@@ -1,9 +1,180 @@
+import asyncio
+import re
+import statistics
+import threading
+import time
 import uuid
+from collections import deque
 from datetime import datetime
 from typing import Dict, List, Optional
 
 from lib.adventure_text import AdventureText
 from lib.session_manager import SessionManager, GameState, GameSession
+from lib.world_model import Room, Word, WorldModel
+
+# Commands answered from the world model without the LLM, English and Japanese forms
+LOOK_COMMAND = re.compile(r'^(?:l|look|look around|見る|見ます|(?:周り|まわり)を見(?:る|ます))$', re.I)
+INVENTORY_COMMAND = re.compile(r'^(?:i|inv|inventory|持ち物|もちもの|持ち物を見(?:る|ます))$', re.I)
+EXITS_COMMAND = re.compile(r'^(?:exits|where|出口|どこ)$', re.I)
+GO_COMMANDS = (
+    re.compile(r'^(?:go|move|walk|enter)(?:\s+to)?(?:\s+the)?\s+(.+)$', re.I),
+    re.compile(r'^(.+?)\s*[にへ]\s*(?:行きます|行く|いきます|いく|移動します|移動する)$'),
+)
+TAKE_COMMANDS = (
+    re.compile(r'^(?:take|get|pick up)(?:\s+the)?\s+(.+)$', re.I),
+    re.compile(r'^(.+?)\s*を\s*(?:取ります|取る|とります|とる)$'),
+)
+# Worlds have named exits rather than compass directions
+DIRECTIONS = {'north', 'south', 'east', 'west', 'up', 'down', '北', '南', '東', '西'}
+
+
+def word_text(word: Word) -> str:
+    return f"{word.japanese} ({word.romaji} / {word.english})"
+
+
+def room_text(room: Room) -> str:
+    return f"{room.japanese} ({room.romaji} / {room.name})" if room.japanese else room.name
+
+
+class CommandInterpreter:
+    """
+    Deterministic handling of common commands (look, inventory, exits, go,
+    take) against the world model and game state. Anything else, or any
+    command in a world without parsed rooms, is left to the LLM.
+    """
+
+    def __init__(self, world: WorldModel):
+        self.world = world
+
+    def _current_room(self, game_state: GameState) -> Room:
+        return self.world.find_room(game_state.room) or self.world.start_room
+
+    def interpret(self, command: str, game_state: GameState) -> Optional[str]:
+        """
+        Answer a command locally, updating the game state
+
+        Args:
+            command: User command
+            game_state: State of the game, updated in place
+
+        Returns:
+            The response, or None if the command needs the LLM
+        """
+        if not self.world.rooms:
+            return None
+        command = command.strip().rstrip('.。!！')
+        room = self._current_room(game_state)
+
+        if LOOK_COMMAND.match(command):
+            return self.describe(room)
+        if INVENTORY_COMMAND.match(command):
+            return self.inventory(game_state)
+        if EXITS_COMMAND.match(command):
+            return self.exits(room)
+        for pattern in GO_COMMANDS:
+            match = pattern.match(command)
+            if match:
+                return self.go(match.group(1), room, game_state)
+        for pattern in TAKE_COMMANDS:
+            match = pattern.match(command)
+            if match:
+                return self.take(match.group(1), room, game_state)
+        return None
+
+    def describe(self, room: Room) -> str:
+        lines = [f"{room_text(room)}", room.description]
+        if room.objects:
+            lines.append(f"You see: {', '.join(word_text(word) for word in room.objects)}")
+        npcs = self.world.npcs_in(room.key)
+        if npcs:
+            lines.append("People here: " + ", ".join(
+                f"{npc.name} ({npc.romaji})" if npc.romaji else npc.name for npc in npcs))
+        lines.append(self.exits(room))
+        return "\n".join(line for line in lines if line)
+
+    def exits(self, room: Room) -> str:
+        exits = self.world.exits(room.key)
+        return f"Exits: {', '.join(room_text(target) for target in exits)}" if exits else "There are no exits."
+
+    def inventory(self, game_state: GameState) -> str:
+        if not game_state.inventory:
+            return "You are not carrying anything. 持ち物はありません (mochimono wa arimasen / I have nothing)."
+        return f"You are carrying: {', '.join(game_state.inventory)}"
+
+    def go(self, destination: str, room: Room, game_state: GameState) -> Optional[str]:
+        destination = destination.strip()
+        if destination.lower() in DIRECTIONS:
+            return f"There are no compass directions here; go to a room by name. {self.exits(room)}"
+        target = self.world.find_room(destination)
+        if target is None:
+            # Not a room ("walk around", "go talk to tanaka"): let the LLM handle it
+            return None
+        if target.key == room.key:
+            return f"You are already in {room_text(room)}."
+        if target.key not in room.exits:
+            return f"You can't get to {room_text(target)} from here. {self.exits(room)}"
+
+        game_state.room = target.key
+        if target.key not in game_state.visited_rooms:
+            game_state.visited_rooms.append(target.key)
+        return f"You walk to {room_text(target)}.\n{self.describe(target)}"
+
+    def take(self, name: str, room: Room, game_state: GameState) -> Optional[str]:
+        word = self.world.find_object(room.key, name)
+        if word is None:
+            # Not an object of this room: let the LLM handle it
+            return None
+        if word.japanese in game_state.inventory:
+            return f"You already have the {word_text(word)}."
+        game_state.inventory.append(word.japanese)
+        response = f"You take the {word_text(word)}."
+        # Naming the object in Japanese counts as using the word, as with LLM turns
+        if name.strip() == word.japanese and word.japanese not in game_state.vocabulary:
+            game_state.vocabulary[word.japanese] = True
+            game_state.score += 5
+            response += f" You've learned a new word: {word_text(word)}!"
+        return response
+
+
+class CommandStats:
+    """Counts and recent latencies of commands answered locally and by the LLM"""
+
+    def __init__(self, window: int = 1000):
+        self._lock = threading.Lock()
+        self._counts = {'local': 0, 'llm': 0}
+        self._latencies = {path: deque(maxlen=window) for path in self._counts}
+
+    def record(self, path: str, seconds: float):
+        with self._lock:
+            self._counts[path] += 1
+            self._latencies[path].append(seconds)
+
+    def reset(self):
+        with self._lock:
+            for path in self._counts:
+                self._counts[path] = 0
+                self._latencies[path].clear()
+
+    def metrics(self) -> Dict:
+        """Fraction of commands served locally and latency percentiles (ms) per path"""
+        with self._lock:
+            counts = dict(self._counts)
+            latencies = {path: sorted(values) for path, values in self._latencies.items()}
+        total = sum(counts.values())
+        metrics = {'commands': total, 'local_fraction': counts['local'] / total if total else 0.0}
+        for path, values in latencies.items():
+            metrics[path] = {
+                'count': counts[path],
+                'mean_ms': statistics.mean(values) * 1000 if values else 0.0,
+                'p50_ms': statistics.median(values) * 1000 if values else 0.0,
+                'p95_ms': values[min(len(values) - 1, int(len(values) * 0.95))] * 1000 if values else 0.0,
+            }
+        return metrics
+
+
+# Shared by all games
+command_stats = CommandStats()
+
 
 class Game:
     """Game logic class that interacts with the session manager"""
@@ -19,6 +190,8 @@ class Game:
         """
         self.session_id = session_id or str(uuid.uuid4())
         self.session_manager = session_manager
+        # Serializes aprocess_command calls for this game
+        self._turn_lock = asyncio.Lock()
         
         # Check if session exists
         session = None
@@ -27,43 +200,60 @@ class Game:
             
         if session:
             # Load existing session
-            self.state = session.state
-            self.history = session.history
-            self.created_at = session.created_at
-            self.updated_at = session.updated_at
+            self.session = session
             # Create adventure text with the theme from the saved state
-            self.adventure_text = AdventureText(theme=self.state.theme, world_content=world_content)
+            self.adventure_text = AdventureText(theme=session.state.theme, world_content=world_content)
         else:
             # Create new session with the specified theme
-            self.state = GameState(
-                room="entrance",
-                inventory=[],
-                visited_rooms=["entrance"],
-                npc_interactions={},
-                vocabulary={},
-                conversation_vocabulary={},
-                score=0,
-                theme=theme
+            now = datetime.now()
+            self.session = GameSession(
+                id=self.session_id,
+                state=GameState(
+                    room="entrance",
+                    inventory=[],
+                    visited_rooms=["entrance"],
+                    npc_interactions={},
+                    vocabulary={},
+                    conversation_vocabulary={},
+                    score=0,
+                    theme=theme
+                ),
+                history=[],
+                created_at=now,
+                last_active=now
             )
-            self.history = []
-            self.created_at = datetime.now().isoformat()
-            self.updated_at = self.created_at
             # Create adventure text with the specified theme and world content
             self.adventure_text = AdventureText(theme=theme, world_content=world_content)
             
             # Save new session
-            session = GameSession(
-                id=self.session_id,
-                state=self.state,
-                history=self.history,
-                created_at=self.created_at,
-                updated_at=self.updated_at
-            )
-            self.session_manager.save_session(self.session_id, session)
+            self.session_manager.save_session(self.session_id, self.session)
+
+        self.interpreter = CommandInterpreter(self.world)
+        # How the latest command was answered: 'local' or 'llm'
+        self.last_path = None
+
+    @property
+    def world(self) -> WorldModel:
+        """The parsed world; lives as long as the game, so once per cached session"""
+        return self.adventure_text.world
+
+    @property
+    def prompt_tokens(self) -> Optional[int]:
+        """Estimated prompt tokens of the latest command; None if it was answered locally"""
+        return self.adventure_text.last_prompt_tokens if self.last_path == 'llm' else None
+
+    @property
+    def state(self) -> GameState:
+        return self.session.state
+
+    @property
+    def history(self) -> List[Dict[str, str]]:
+        return self.session.history
 
     def process_command(self, command: str) -> str:
         """
-        Process a command and return the response
+        Process a command and return the response. Common commands are
+        answered by the command interpreter; the rest go to the LLM.
         
         Args:
             command: User command to process
@@ -71,26 +261,74 @@ class Game:
         Returns:
             Text response to the command
         """
-        # Update the game state based on the command
-        response = self.adventure_text.process_command(command, self.state)
-        
+        start = time.perf_counter()
+        response = self.interpreter.interpret(command, self.state)
+        path = 'local'
+        if response is None:
+            # Update the game state based on the command
+            response = self.adventure_text.process_command(command, self.state)
+            path = 'llm'
+        self._record_turn(command, response)
+        self._finish_turn(path, start)
+        return response
+
+    async def aprocess_command(self, command: str) -> str:
+        """
+        Process a command like process_command without blocking the event
+        loop: the LLM call is awaited and persistence runs in a worker
+        thread. Commands for the same game are handled one at a time.
+        """
+        async with self._turn_lock:
+            start = time.perf_counter()
+            response = self.interpreter.interpret(command, self.state)
+            path = 'local'
+            if response is None:
+                response = await self.adventure_text.aprocess_command(command, self.state)
+                path = 'llm'
+            await asyncio.to_thread(self._record_turn, command, response)
+            self._finish_turn(path, start)
+            return response
+
+    async def astream_command(self, command: str):
+        """
+        Process a command like aprocess_command, yielding the response text
+        as it is generated. Vocabulary detection and persistence run on the
+        completed response; a stream abandoned part-way records no turn.
+        """
+        async with self._turn_lock:
+            start = time.perf_counter()
+            response = self.interpreter.interpret(command, self.state)
+            path = 'local'
+            if response is None:
+                prompt = self.adventure_text.build_prompt(command, self.state)
+                parts = []
+                async for text in self.adventure_text.astream_text(prompt, self.state.room):
+                    parts.append(text)
+                    yield text
+                response = "".join(parts)
+                self.adventure_text.apply_response(command, response, self.state)
+                path = 'llm'
+            else:
+                yield response
+            await asyncio.to_thread(self._record_turn, command, response)
+            self._finish_turn(path, start)
+
+    def _finish_turn(self, path: str, start: float):
+        self.last_path = path
+        command_stats.record(path, time.perf_counter() - start)
+
+    def _record_turn(self, command: str, response: str):
+        """Add a turn to the history and persist it"""
         # Update the history
-        self.history.append({
+        history_entry = {
             "command": command,
             "response": response
-        })
+        }
+        self.session.history.append(history_entry)
         
         # Update the timestamp
-        self.updated_at = datetime.now().isoformat()
-        
-        # Save the updated session
-        session = GameSession(
-            id=self.session_id,
-            state=self.state,
-            history=self.history,
-            created_at=self.created_at,
-            updated_at=self.updated_at
-        )
-        self.session_manager.save_session(self.session_id, session)
+        self.session.last_active = datetime.now()
         
-        return response
+        # Append the turn to the session's history log; the session object is
+        # updated in place so nothing proportional to the history is rebuilt
+        self.session_manager.append_history(self.session_id, self.session, history_entry)
@@ -0,0 +1,122 @@
+import threading
+import time
+import weakref
+from collections import OrderedDict
+from typing import Dict, Optional, Tuple
+
+from lib.game import Game
+from lib.session_manager import SessionManager
+
+
+class GameCache:
+    """
+    Live Game objects (and their AdventureText) by session id, so a message
+    for an active session does not reload its world or rebuild the game.
+
+    Games write every turn through to the session store, so evicting one
+    loses nothing. Entries are evicted least recently used first beyond
+    max_games, and after idle_timeout seconds without a message.
+    """
+
+    def __init__(self, session_manager: SessionManager, max_games: int = 256, idle_timeout: float = 30 * 60):
+        self.session_manager = session_manager
+        self.max_games = max_games
+        self.idle_timeout = idle_timeout
+        # session id -> (game, last used), least recently used first
+        self._games: "OrderedDict[str, Tuple[Game, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        # session id -> lock held while its game is built; entries vanish once no build holds them
+        self._build_locks: "weakref.WeakValueDictionary[str, threading.Lock]" = weakref.WeakValueDictionary()
+        self._stats = {'hits': 0, 'misses': 0, 'evictions': 0}
+
+    def _expire_idle(self, now: float):
+        """Drop games idle for longer than idle_timeout; the oldest are first in line"""
+        while self._games:
+            session_id, (_, last_used) = next(iter(self._games.items()))
+            if now - last_used <= self.idle_timeout:
+                break
+            del self._games[session_id]
+            self._stats['evictions'] += 1
+
+    def get(self, session_id: str) -> Optional[Game]:
+        """Return the cached game for a session, or None"""
+        now = time.monotonic()
+        with self._lock:
+            self._expire_idle(now)
+            entry = self._games.get(session_id)
+            if entry is None:
+                self._stats['misses'] += 1
+                return None
+            self._games[session_id] = (entry[0], now)
+            self._games.move_to_end(session_id)
+            self._stats['hits'] += 1
+            return entry[0]
+
+    def put(self, game: Game):
+        """Cache a game, evicting the least recently used ones beyond max_games"""
+        with self._lock:
+            self._games[game.session_id] = (game, time.monotonic())
+            self._games.move_to_end(game.session_id)
+            while len(self._games) > self.max_games:
+                self._games.popitem(last=False)
+                self._stats['evictions'] += 1
+
+    def discard(self, session_id: str):
+        """Forget the game for a session, e.g. after the session is deleted"""
+        with self._lock:
+            self._games.pop(session_id, None)
+
+    def clear(self):
+        with self._lock:
+            self._games.clear()
+
+    def get_game(self, session_id: Optional[str], theme: Optional[str] = None,
+                 world_content: Optional[str] = None) -> Game:
+        """
+        Return the live game for a session, building it on a cache miss.
+        The session's world is loaded from the store only when the game has
+        to be built and no world_content is given.
+        """
+        if not session_id:
+            # A new session: nothing to share with other requests
+            game = Game(self.session_manager, None, theme or "cafe", world_content)
+            self.put(game)
+            return game
+
+        game = self.get(session_id)
+        if game:
+            return game
+
+        # Build each session's game once so concurrent requests for it share one
+        # game; builds for different sessions run in parallel
+        with self._lock:
+            build_lock = self._build_locks.get(session_id)
+            if build_lock is None:
+                build_lock = threading.Lock()
+                self._build_locks[session_id] = build_lock
+        with build_lock:
+            # Another request may have built it while this one waited
+            with self._lock:
+                entry = self._games.get(session_id)
+            if entry:
+                return entry[0]
+            if world_content is None:
+                world_content = self.session_manager.get_world(session_id)
+
+            game = Game(self.session_manager, session_id, theme or "cafe", world_content)
+            self.put(game)
+            return game
+
+    def metrics(self) -> Dict:
+        """Hit-rate and size of the cache"""
+        with self._lock:
+            stats = dict(self._stats)
+            size = len(self._games)
+        lookups = stats['hits'] + stats['misses']
+        return {
+            'size': size,
+            'hits': stats['hits'],
+            'misses': stats['misses'],
+            'hit_rate': stats['hits'] / lookups if lookups else 0.0,
+            'evictions': stats['evictions'],
+        }
@@ -1,8 +1,8 @@
-import os
-import json
+import threading
+from collections import OrderedDict
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional
-from pydantic import BaseModel
+from pydantic import BaseModel, Field
 
 # Define the data models
 class GameState(BaseModel):
@@ -19,145 +19,124 @@ class GameSession(BaseModel):
     id: str
     state: GameState
     history: List[Dict[str, str]] = []
-    created_at: datetime = datetime.now()
-    last_active: datetime = datetime.now()
+    created_at: datetime = Field(default_factory=datetime.now)
+    last_active: datetime = Field(default_factory=datetime.now)
 
 class SessionManager:
-    """Manages game sessions with file-based storage"""
+    """
+    Manages game sessions on top of a pluggable storage engine (a
+    SessionStore: JSON files by default, or SQLite).
+
+    Sessions are loaded lazily: only recently used sessions are kept in
+    memory (a bounded LRU), and listing or cleanup goes to the store's
+    session summaries instead of loading sessions.
+    """
     
-    def __init__(self, sessions_dir: str):
+    def __init__(self, sessions_dir: Optional[str] = None, max_cached_sessions: int = 256,
+                 compact_every: int = 100, store: Optional["session_store.SessionStore"] = None):
         """
         Initialize the session manager
         
         Args:
-            sessions_dir: Directory to store session files
+            sessions_dir: Directory to store session files when no store is given
+            max_cached_sessions: Number of sessions kept in memory
+            compact_every: Turns appended to a history log before it is compacted (file store)
+            store: Storage engine to use instead of session files in sessions_dir
         """
-        self.sessions_dir = sessions_dir
-        # Ensure the sessions directory exists
-        os.makedirs(self.sessions_dir, exist_ok=True)
-        # Dictionary to store active sessions
-        self.sessions: Dict[str, GameSession] = {}
-        # Load existing sessions
-        self.load_sessions()
-    
-    def get_session_file_path(self, session_id: str) -> str:
-        """Get the file path for a session"""
-        return os.path.join(self.sessions_dir, f"{session_id}.json")
-    
-    def load_sessions(self) -> Dict[str, GameSession]:
-        """Load all sessions from files"""
-        try:
-            # List all session files in the directory
-            if os.path.exists(self.sessions_dir):
-                for filename in os.listdir(self.sessions_dir):
-                    if filename.endswith('.json'):
-                        session_id = filename[:-5]  # Remove .json extension
-                        self.load_session(session_id)
-            
-            print(f"Loaded {len(self.sessions)} sessions from {self.sessions_dir}")
-            return self.sessions
-        except Exception as e:
-            print(f"Error loading sessions: {e}")
-            return {}
+        if store is None:
+            store = session_store.FileSessionStore(sessions_dir, compact_every=compact_every)
+        self.store = store
+        self.max_cached_sessions = max_cached_sessions
+        # Recently used sessions, least recently used first
+        self.sessions: "OrderedDict[str, GameSession]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _cache_session(self, session_id: str, session: GameSession):
+        """Keep a session in memory, evicting the least recently used ones"""
+        with self._lock:
+            self.sessions[session_id] = session
+            self.sessions.move_to_end(session_id)
+            while len(self.sessions) > self.max_cached_sessions:
+                self.sessions.popitem(last=False)
     
     def load_session(self, session_id: str) -> Optional[GameSession]:
-        """Load a specific session from file"""
+        """Load a specific session from the store"""
         try:
-            session_path = self.get_session_file_path(session_id)
-            
-            if not os.path.exists(session_path):
-                return None
-                
-            with open(session_path, 'r') as f:
-                session_data = json.load(f)
-                
-                state_data = session_data.get('state', {})
-                state = GameState(
-                    room=state_data.get('room', 'entrance'),
-                    inventory=state_data.get('inventory', []),
-                    visited_rooms=state_data.get('visited_rooms', []),
-                    npc_interactions=state_data.get('npc_interactions', {}),
-                    vocabulary=state_data.get('vocabulary', {}),
-                    conversation_vocabulary=state_data.get('conversation_vocabulary', {}),
-                    score=state_data.get('score', 0),
-                    theme=state_data.get('theme', "cafe")
-                )
-                
-                session = GameSession(
-                    id=session_id,
-                    state=state,
-                    history=session_data.get('history', []),
-                    created_at=datetime.fromisoformat(session_data.get('created_at', datetime.now().isoformat())),
-                    last_active=datetime.fromisoformat(session_data.get('last_active', datetime.now().isoformat()))
-                )
-                
+            session = self.store.load(session_id)
+            if session:
                 # Store in memory
-                self.sessions[session_id] = session
-                return session
-                
+                self._cache_session(session_id, session)
+            return session
         except Exception as e:
             print(f"Error loading session {session_id}: {e}")
             return None
     
     def save_session(self, session_id: str, session: GameSession) -> bool:
-        """Save a session to file"""
+        """
+        Save a whole session, including its full history. Per-turn updates
+        should use append_history, whose cost does not grow with the history.
+        """
         try:
-            # Convert session to a serializable format
-            session_data = {
-                'id': session.id,
-                'state': {
-                    'room': session.state.room,
-                    'inventory': session.state.inventory,
-                    'visited_rooms': session.state.visited_rooms,
-                    'npc_interactions': session.state.npc_interactions,
-                    'vocabulary': session.state.vocabulary,
-                    'conversation_vocabulary': session.state.conversation_vocabulary,
-                    'score': session.state.score,
-                    'theme': session.state.theme
-                },
-                'history': session.history,
-                'created_at': session.created_at,
-                'updated_at': session.updated_at
-            }
-            
-            # Save to individual file
-            file_path = self.get_session_file_path(session_id)
-            with open(file_path, 'w') as f:
-                json.dump(session_data, f, indent=2)
-            
+            self.store.save(session)
             # Store in memory
-            self.sessions[session_id] = session
+            self._cache_session(session_id, session)
             return True
-                
         except Exception as e:
             print(f"Error saving session {session_id}: {e}")
             return False
+
+    def append_history(self, session_id: str, session: GameSession, history_entry: Dict[str, str]) -> bool:
+        """
+        Persist one turn: history_entry, already appended to session.history,
+        and the session state after it.
+        """
+        try:
+            self.store.append_history(session, history_entry)
+            self._cache_session(session_id, session)
+            return True
+        except Exception as e:
+            print(f"Error appending history for session {session_id}: {e}")
+            return False
     
     def delete_session(self, session_id: str) -> bool:
-        """Delete a session and its file"""
+        """Delete a session, its history and its world"""
         try:
-            # Remove from memory
-            if session_id in self.sessions:
-                del self.sessions[session_id]
-            
-            # Remove file
-            file_path = self.get_session_file_path(session_id)
-            if os.path.exists(file_path):
-                os.remove(file_path)
-                print(f"Deleted session file: {file_path}")
-            
+            with self._lock:
+                # Remove from memory
+                self.sessions.pop(session_id, None)
+            self.store.delete(session_id)
             return True
         except Exception as e:
             print(f"Error deleting session {session_id}: {e}")
             return False
     
     def get_session(self, session_id: str) -> Optional[GameSession]:
-        """Get a session by ID, loading from file if necessary"""
-        if session_id in self.sessions:
-            return self.sessions[session_id]
+        """Get a session by ID, loading it from the store if necessary"""
+        with self._lock:
+            session = self.sessions.get(session_id)
+            if session is not None:
+                self.sessions.move_to_end(session_id)
+                return session
         
-        # Try to load from file
+        # Try to load from the store
         return self.load_session(session_id)
+
+    def get_world(self, session_id: str) -> Optional[str]:
+        """Get the world content generated for a session"""
+        try:
+            return self.store.load_world(session_id)
+        except Exception as e:
+            print(f"Error loading world for session {session_id}: {e}")
+            return None
+
+    def save_world(self, session_id: str, world_content: str) -> bool:
+        """Store the world content generated for a session"""
+        try:
+            self.store.save_world(session_id, world_content)
+            return True
+        except Exception as e:
+            print(f"Error saving world for session {session_id}: {e}")
+            return False
     
     def create_session(self, session_id: Optional[str] = None, initial_state: Optional[GameState] = None) -> GameSession:
         """Create a new session"""
@@ -178,16 +157,16 @@ class SessionManager:
             )
         
         # Create session
-        now = datetime.now().isoformat()
+        now = datetime.now()
         session = GameSession(
             id=session_id,
             state=initial_state,
             history=[],
             created_at=now,
-            updated_at=now
+            last_active=now
         )
         
-        # Save to file
+        # Save to the store
         self.save_session(session_id, session)
         
         return session
@@ -204,52 +183,50 @@ class SessionManager:
         if state:
             session.state = state
         
-        # Add history entry if provided
-        if history_entry:
-            session.history.append(history_entry)
-        
         # Update timestamp
-        session.updated_at = datetime.now().isoformat()
+        session.last_active = datetime.now()
         
-        # Save to file
-        self.save_session(session_id, session)
+        # Add history entry if provided, appending it to the history log
+        if history_entry:
+            session.history.append(history_entry)
+            self.append_history(session_id, session, history_entry)
+        else:
+            self.save_session(session_id, session)
         
         return session
     
     def cleanup_old_sessions(self, max_age_days: int = 7) -> int:
-        """Remove sessions older than max_age_days days"""
+        """Remove sessions inactive for more than max_age_days days"""
         try:
-            now = datetime.now()
-            sessions_to_remove = []
-            
-            for session_id, session in self.sessions.items():
-                # Parse the updated_at timestamp
-                try:
-                    last_updated = datetime.fromisoformat(session.updated_at)
-                    age = now - last_updated
-                    
-                    # If session is older than max_age_days, mark for removal
-                    if age > timedelta(days=max_age_days):
-                        sessions_to_remove.append(session_id)
-                except Exception as e:
-                    print(f"Error parsing timestamp for session {session_id}: {e}")
+            cutoff = datetime.now() - timedelta(days=max_age_days)
+            removed_count = self.store.delete_inactive(cutoff)
             
-            # Remove old sessions
-            for session_id in sessions_to_remove:
-                self.delete_session(session_id)
+            # Drop removed sessions from memory
+            with self._lock:
+                for session_id in [sid for sid, session in self.sessions.items() if session.last_active < cutoff]:
+                    del self.sessions[session_id]
             
-            if sessions_to_remove:
-                print(f"Removed {len(sessions_to_remove)} old sessions")
+            if removed_count:
+                print(f"Removed {removed_count} old sessions")
             
-            return len(sessions_to_remove)
+            return removed_count
         except Exception as e:
             print(f"Error cleaning up old sessions: {e}")
             return 0
     
     def list_sessions(self) -> List[str]:
         """List all session IDs"""
-        return list(self.sessions.keys())
+        return [entry['id'] for entry in self.store.list_summaries()]
+
+    def list_session_summaries(self) -> List[Dict[str, str]]:
+        """List id, theme, created_at and last_active of every session, most recently active first"""
+        return self.store.list_summaries()
+
+    def count_sessions(self) -> int:
+        """Number of stored sessions"""
+        return self.store.count()
 
 
 # Import at the end to avoid circular imports
 import uuid
+from lib import session_store
@@ -0,0 +1,552 @@
+import abc
+import os
+import json
+import sqlite3
+import threading
+from collections import OrderedDict
+from datetime import datetime
+from typing import Dict, List, Optional
+
+from lib.session_manager import GameState, GameSession
+
+# Sessions whose history log position is remembered by FileSessionStore;
+# a session not tracked here is compacted on its next append
+MAX_TRACKED_LOGS = 4096
+
+
+def state_from_data(state_data: Dict) -> GameState:
+    """Build a GameState from stored data, filling in defaults for missing fields"""
+    return GameState(
+        room=state_data.get('room', 'entrance'),
+        inventory=state_data.get('inventory', []),
+        visited_rooms=state_data.get('visited_rooms', []),
+        npc_interactions=state_data.get('npc_interactions', {}),
+        vocabulary=state_data.get('vocabulary', {}),
+        conversation_vocabulary=state_data.get('conversation_vocabulary', {}),
+        score=state_data.get('score', 0),
+        theme=state_data.get('theme', "cafe")
+    )
+
+
+def session_summary(session: GameSession) -> Dict[str, str]:
+    """The fields listed for a session without loading its history"""
+    return {
+        'id': session.id,
+        'theme': session.state.theme,
+        'created_at': session.created_at.isoformat(),
+        'last_active': session.last_active.isoformat()
+    }
+
+
+class SessionStore(abc.ABC):
+    """
+    Storage engine behind SessionManager.
+    Stores sessions (state plus history) and the generated world of each session.
+    """
+
+    @abc.abstractmethod
+    def load(self, session_id: str) -> Optional[GameSession]:
+        """Load a session, or None if it does not exist"""
+
+    @abc.abstractmethod
+    def save(self, session: GameSession):
+        """Write a whole session, replacing any stored history"""
+
+    @abc.abstractmethod
+    def append_history(self, session: GameSession, history_entry: Dict[str, str]):
+        """Persist one turn: history_entry, the last entry of session.history, and the state after it"""
+
+    @abc.abstractmethod
+    def delete(self, session_id: str):
+        """Delete a session, its history and its world"""
+
+    @abc.abstractmethod
+    def delete_inactive(self, cutoff: datetime) -> int:
+        """Delete every session last active before cutoff and return how many were removed"""
+
+    @abc.abstractmethod
+    def list_summaries(self) -> List[Dict[str, str]]:
+        """id, theme, created_at and last_active of every session, most recently active first"""
+
+    @abc.abstractmethod
+    def count(self) -> int:
+        """Number of stored sessions"""
+
+    @abc.abstractmethod
+    def load_world(self, session_id: str) -> Optional[str]:
+        """Load the world content generated for a session"""
+
+    @abc.abstractmethod
+    def save_world(self, session_id: str, world_content: str):
+        """Store the world content generated for a session"""
+
+    @abc.abstractmethod
+    def delete_world(self, session_id: str):
+        """Delete the world content of a session"""
+
+
+class FileSessionStore(SessionStore):
+    """
+    Stores each session as a small JSON snapshot of its state plus an
+    append-only JSONL history log, so a turn appends one line instead of
+    rewriting the whole history. Worlds are plain text files.
+
+    Listing and cleanup read a lightweight index of id, theme, created_at
+    and last_active instead of every session file.
+    """
+
+    # Append-only index of session summaries; not .json so it is never taken for a session
+    INDEX_FILE = "index.jsonl"
+
+    def __init__(self, sessions_dir: str, worlds_dir: Optional[str] = None, compact_every: int = 100):
+        """
+        Args:
+            sessions_dir: Directory to store session files
+            worlds_dir: Directory to store world files (default: sessions_dir)
+            compact_every: Turns appended to a history log before it is compacted
+        """
+        self.sessions_dir = sessions_dir
+        self.worlds_dir = worlds_dir or sessions_dir
+        self.compact_every = compact_every
+        os.makedirs(self.sessions_dir, exist_ok=True)
+        os.makedirs(self.worlds_dir, exist_ok=True)
+        # Session summaries by id, read from the index on first use
+        self._index: Optional[Dict[str, Dict[str, str]]] = None
+        self._index_lines = 0
+        # History log entries written since each session's last snapshot
+        self._pending_entries: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def get_session_file_path(self, session_id: str) -> str:
+        """Get the file path for a session"""
+        return os.path.join(self.sessions_dir, f"{session_id}.json")
+
+    def get_history_file_path(self, session_id: str) -> str:
+        """Get the file path for a session's append-only history log"""
+        return os.path.join(self.sessions_dir, f"{session_id}.history.jsonl")
+
+    def get_index_file_path(self) -> str:
+        """Get the file path for the session index"""
+        return os.path.join(self.sessions_dir, self.INDEX_FILE)
+
+    def get_world_file_path(self, session_id: str) -> str:
+        """Get the file path for a session's world"""
+        return os.path.join(self.worlds_dir, f"{session_id}.txt")
+
+    def _track_pending(self, session_id: str, pending: int):
+        self._pending_entries[session_id] = pending
+        self._pending_entries.move_to_end(session_id)
+        while len(self._pending_entries) > MAX_TRACKED_LOGS:
+            self._pending_entries.popitem(last=False)
+
+    def _load_index(self) -> Dict[str, Dict[str, str]]:
+        """
+        Load the session index, rebuilding it from the session files if it
+        does not exist yet (a one-off pass for directories written before
+        the index was introduced).
+        """
+        with self._lock:
+            if self._index is not None:
+                return self._index
+
+            index_path = self.get_index_file_path()
+            if not os.path.exists(index_path):
+                self._rebuild_index()
+                return self._index
+
+            index = {}
+            lines = 0
+            with open(index_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    lines += 1
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from an interrupted write
+                        continue
+                    if entry.get('deleted'):
+                        index.pop(entry['id'], None)
+                    else:
+                        index[entry['id']] = entry
+            self._index = index
+            self._index_lines = lines
+            self._compact_index_if_stale()
+            return self._index
+
+    def _compact_index_if_stale(self):
+        """Later entries supersede earlier ones; compact once most lines are stale"""
+        if self._index_lines > 2 * len(self._index) + 100:
+            self._write_index()
+
+    def _rebuild_index(self):
+        """Build the index by reading every session file"""
+        index = {}
+        for filename in os.listdir(self.sessions_dir):
+            if filename.endswith('.json'):
+                session = self.load(filename[:-5])
+                if session:
+                    index[session.id] = session_summary(session)
+        self._index = index
+        self._write_index()
+        if index:
+            print(f"Indexed {len(index)} sessions in {self.sessions_dir}")
+
+    def _write_index(self):
+        """Rewrite the index with one line per session"""
+        index_path = self.get_index_file_path()
+        temp_path = f"{index_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for entry in self._index.values():
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(temp_path, index_path)
+        self._index_lines = len(self._index)
+
+    def _append_index(self, entry: Dict):
+        """Record a changed or deleted session in the index"""
+        index = self._load_index()
+        if entry.get('deleted'):
+            index.pop(entry['id'], None)
+        else:
+            index[entry['id']] = entry
+        with open(self.get_index_file_path(), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        self._index_lines += 1
+        self._compact_index_if_stale()
+
+    def load(self, session_id: str) -> Optional[GameSession]:
+        """
+        Load a session from its snapshot and history log.
+        Log entries written since the last compaction carry the state after
+        their turn, so the newest one supersedes the snapshot state.
+        """
+        session_path = self.get_session_file_path(session_id)
+        if not os.path.exists(session_path):
+            return None
+
+        with open(session_path, 'r') as f:
+            session_data = json.load(f)
+
+        state_data = session_data.get('state', {})
+        last_active = session_data.get('last_active', datetime.now().isoformat())
+        # Sessions written before the history log keep their history inline
+        history = session_data.get('history', [])
+        pending = 0
+
+        history_path = self.get_history_file_path(session_id)
+        if os.path.exists(history_path):
+            with open(history_path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                    except json.JSONDecodeError:
+                        # A torn final line from an interrupted write
+                        continue
+                    if 'state' in entry:
+                        state_data = entry.pop('state')
+                        last_active = entry.pop('last_active', last_active)
+                        pending += 1
+                    history.append(entry)
+
+        with self._lock:
+            self._track_pending(session_id, pending)
+
+        return GameSession(
+            id=session_id,
+            state=state_from_data(state_data),
+            history=history,
+            created_at=datetime.fromisoformat(session_data.get('created_at', datetime.now().isoformat())),
+            last_active=datetime.fromisoformat(last_active)
+        )
+
+    def save(self, session: GameSession):
+        """
+        Write a snapshot of the session state plus its full history log.
+        This rewrites the whole history, so append_history calls it only to
+        compact the log.
+        """
+        session_data = {
+            'id': session.id,
+            'state': session.state.model_dump(),
+            'created_at': session.created_at.isoformat(),
+            'last_active': session.last_active.isoformat()
+        }
+        # Make sure the index exists before adding files it would be rebuilt from
+        self._load_index()
+
+        # Write the snapshot first: until the log is replaced, its newest
+        # entry still carries this same state
+        file_path = self.get_session_file_path(session.id)
+        temp_path = f"{file_path}.tmp"
+        with open(temp_path, 'w') as f:
+            json.dump(session_data, f, indent=2)
+        os.replace(temp_path, file_path)
+
+        history_path = self.get_history_file_path(session.id)
+        temp_path = f"{history_path}.tmp"
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            for entry in session.history:
+                f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+        os.replace(temp_path, history_path)
+
+        with self._lock:
+            self._track_pending(session.id, 0)
+            self._append_index(session_summary(session))
+
+    def append_history(self, session: GameSession, history_entry: Dict[str, str]):
+        """
+        Append the turn to the history log together with the session state,
+        so the cost does not grow with the length of the history. Every
+        compact_every turns the log is compacted into a fresh snapshot.
+        """
+        with self._lock:
+            pending = self._pending_entries.get(session.id)
+        if pending is None or pending + 1 >= self.compact_every:
+            # Log position unknown (the session was not read or written here recently) or the log is long
+            self.save(session)
+            return
+
+        line = dict(history_entry, state=session.state.model_dump(), last_active=session.last_active.isoformat())
+        with open(self.get_history_file_path(session.id), 'a', encoding='utf-8') as f:
+            f.write(json.dumps(line, ensure_ascii=False) + "\n")
+
+        with self._lock:
+            self._track_pending(session.id, pending + 1)
+            self._append_index(session_summary(session))
+
+    def delete(self, session_id: str):
+        with self._lock:
+            self._pending_entries.pop(session_id, None)
+
+            for file_path in (self.get_session_file_path(session_id), self.get_history_file_path(session_id)):
+                if os.path.exists(file_path):
+                    os.remove(file_path)
+                    print(f"Deleted session file: {file_path}")
+            self.delete_world(session_id)
+
+            if session_id in self._load_index():
+                self._append_index({'id': session_id, 'deleted': True})
+
+    def delete_inactive(self, cutoff: datetime) -> int:
+        cutoff = cutoff.isoformat()
+        with self._lock:
+            session_ids = [
+                session_id for session_id, entry in self._load_index().items()
+                if entry['last_active'] < cutoff
+            ]
+            for session_id in session_ids:
+                self.delete(session_id)
+        return len(session_ids)
+
+    def list_summaries(self) -> List[Dict[str, str]]:
+        with self._lock:
+            entries = list(self._load_index().values())
+        return sorted(entries, key=lambda entry: entry['last_active'], reverse=True)
+
+    def count(self) -> int:
+        with self._lock:
+            return len(self._load_index())
+
+    def load_world(self, session_id: str) -> Optional[str]:
+        world_file_path = self.get_world_file_path(session_id)
+        if not os.path.exists(world_file_path):
+            return None
+        with open(world_file_path, 'r', encoding='utf-8') as f:
+            return f.read()
+
+    def save_world(self, session_id: str, world_content: str):
+        with open(self.get_world_file_path(session_id), 'w', encoding='utf-8') as f:
+            f.write(world_content)
+
+    def delete_world(self, session_id: str):
+        world_file_path = self.get_world_file_path(session_id)
+        if os.path.exists(world_file_path):
+            os.remove(world_file_path)
+
+
+class SQLiteSessionStore(SessionStore):
+    """
+    Stores sessions, their history and their worlds in one SQLite database.
+    Each write is a single transaction; sessions are indexed on last_active
+    so listing and cleanup are single indexed queries.
+    """
+
+    def __init__(self, db_file: str):
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute("PRAGMA foreign_keys=ON")
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS sessions (
+                    id TEXT PRIMARY KEY,
+                    theme TEXT NOT NULL,
+                    state TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    last_active TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS sessions_last_active ON sessions (last_active);
+
+                CREATE TABLE IF NOT EXISTS history (
+                    session_id TEXT NOT NULL REFERENCES sessions (id) ON DELETE CASCADE,
+                    turn INTEGER NOT NULL,
+                    entry TEXT NOT NULL,
+                    PRIMARY KEY (session_id, turn)
+                ) WITHOUT ROWID;
+
+                CREATE TABLE IF NOT EXISTS worlds (
+                    session_id TEXT PRIMARY KEY,
+                    content TEXT NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL
+                );
+            """)
+
+    def migrate_from_files(self, file_store: FileSessionStore) -> int:
+        """
+        Import sessions and worlds from a FileSessionStore once, so data kept
+        by the file engine survives the switch to SQLite; returns sessions imported.
+        Sessions and worlds already in the database are left as they are.
+        """
+        with self._lock:
+            migrated = self.conn.execute(
+                "SELECT value FROM meta WHERE key = 'migrated_files'"
+            ).fetchone()
+        if migrated:
+            return 0
+
+        sessions = []
+        for summary in file_store.list_summaries():
+            session = file_store.load(summary['id'])
+            if session:
+                sessions.append(session)
+        worlds = []
+        for file_name in os.listdir(file_store.worlds_dir):
+            if file_name.endswith('.txt'):
+                world_content = file_store.load_world(file_name[:-len('.txt')])
+                if world_content is not None:
+                    worlds.append((file_name[:-len('.txt')], world_content))
+
+        with self._lock, self.conn:
+            imported = 0
+            for session in sessions:
+                exists = self.conn.execute("SELECT 1 FROM sessions WHERE id = ?", (session.id,)).fetchone()
+                if exists:
+                    continue
+                self._upsert_session(session)
+                self.conn.executemany(
+                    "INSERT INTO history (session_id, turn, entry) VALUES (?, ?, ?)",
+                    [
+                        (session.id, turn, json.dumps(entry, ensure_ascii=False))
+                        for turn, entry in enumerate(session.history)
+                    ]
+                )
+                imported += 1
+            self.conn.executemany(
+                "INSERT OR IGNORE INTO worlds (session_id, content) VALUES (?, ?)", worlds
+            )
+            self.conn.execute(
+                "INSERT INTO meta (key, value) VALUES ('migrated_files', ?)", (datetime.now().isoformat(),)
+            )
+        print(f"Migrated {imported} sessions and {len(worlds)} worlds from {file_store.sessions_dir}")
+        return imported
+
+    def _upsert_session(self, session: GameSession):
+        self.conn.execute(
+            """
+            INSERT INTO sessions (id, theme, state, created_at, last_active) VALUES (?, ?, ?, ?, ?)
+            ON CONFLICT (id) DO UPDATE SET
+                theme = excluded.theme, state = excluded.state, last_active = excluded.last_active
+            """,
+            (
+                session.id,
+                session.state.theme,
+                json.dumps(session.state.model_dump(), ensure_ascii=False),
+                session.created_at.isoformat(),
+                session.last_active.isoformat()
+            )
+        )
+
+    def load(self, session_id: str) -> Optional[GameSession]:
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT state, created_at, last_active FROM sessions WHERE id = ?", (session_id,)
+            ).fetchone()
+            if row is None:
+                return None
+            history = self.conn.execute(
+                "SELECT entry FROM history WHERE session_id = ? ORDER BY turn", (session_id,)
+            ).fetchall()
+        return GameSession(
+            id=session_id,
+            state=state_from_data(json.loads(row[0])),
+            history=[json.loads(entry) for (entry,) in history],
+            created_at=datetime.fromisoformat(row[1]),
+            last_active=datetime.fromisoformat(row[2])
+        )
+
+    def save(self, session: GameSession):
+        with self._lock, self.conn:
+            self._upsert_session(session)
+            self.conn.execute("DELETE FROM history WHERE session_id = ?", (session.id,))
+            self.conn.executemany(
+                "INSERT INTO history (session_id, turn, entry) VALUES (?, ?, ?)",
+                [
+                    (session.id, turn, json.dumps(entry, ensure_ascii=False))
+                    for turn, entry in enumerate(session.history)
+                ]
+            )
+
+    def append_history(self, session: GameSession, history_entry: Dict[str, str]):
+        with self._lock, self.conn:
+            self._upsert_session(session)
+            self.conn.execute(
+                "INSERT OR REPLACE INTO history (session_id, turn, entry) VALUES (?, ?, ?)",
+                (session.id, len(session.history) - 1, json.dumps(history_entry, ensure_ascii=False))
+            )
+
+    def delete(self, session_id: str):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM worlds WHERE session_id = ?", (session_id,))
+            self.conn.execute("DELETE FROM sessions WHERE id = ?", (session_id,))
+
+    def delete_inactive(self, cutoff: datetime) -> int:
+        cutoff = cutoff.isoformat()
+        with self._lock, self.conn:
+            self.conn.execute(
+                "DELETE FROM worlds WHERE session_id IN (SELECT id FROM sessions WHERE last_active < ?)",
+                (cutoff,)
+            )
+            return self.conn.execute("DELETE FROM sessions WHERE last_active < ?", (cutoff,)).rowcount
+
+    def list_summaries(self) -> List[Dict[str, str]]:
+        with self._lock:
+            rows = self.conn.execute(
+                "SELECT id, theme, created_at, last_active FROM sessions ORDER BY last_active DESC"
+            ).fetchall()
+        return [
+            {'id': row[0], 'theme': row[1], 'created_at': row[2], 'last_active': row[3]}
+            for row in rows
+        ]
+
+    def count(self) -> int:
+        with self._lock:
+            return self.conn.execute("SELECT COUNT(*) FROM sessions").fetchone()[0]
+
+    def load_world(self, session_id: str) -> Optional[str]:
+        with self._lock:
+            row = self.conn.execute("SELECT content FROM worlds WHERE session_id = ?", (session_id,)).fetchone()
+        return row[0] if row else None
+
+    def save_world(self, session_id: str, world_content: str):
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO worlds (session_id, content) VALUES (?, ?)", (session_id, world_content)
+            )
+
+    def delete_world(self, session_id: str):
+        with self._lock, self.conn:
+            self.conn.execute("DELETE FROM worlds WHERE session_id = ?", (session_id,))
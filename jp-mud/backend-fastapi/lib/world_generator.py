@@ -1,11 +1,21 @@
-from openai import OpenAI
 import os
 import pathlib
 
+from lib.clients import get_async_openai_client, get_openai_client
+
 class WorldGenerator:
     def __init__(self):
-        self.client = OpenAI()
         self.prompt_file = self._load_prompt_file()
+
+    @property
+    def client(self):
+        """Shared, connection-pooled OpenAI client"""
+        return get_openai_client()
+
+    @property
+    def async_client(self):
+        """Shared, connection-pooled async OpenAI client"""
+        return get_async_openai_client()
         
     def _load_prompt_file(self):
         """Load the world generator prompt file"""
@@ -32,6 +42,33 @@ class WorldGenerator:
         print(f"Warning: Could not find {prompt_file_name} file")
         return ""
     
+    def _messages(self, theme: str):
+        # Create the complete prompt by combining the base prompt with the theme
+        prompt = f"""
+        Using the following prompt template, generate a complete world for the theme: {theme}
+        
+        {self.prompt_file}
+        """
+        return [
+            {"role": "system", "content": "You are a world generator for a Japanese language learning text adventure game. Generate detailed, thematic worlds that help users learn Japanese vocabulary in context."},
+            {"role": "user", "content": prompt}
+        ]
+
+    def _fallback_world(self, theme: str) -> str:
+        """A basic world structure used when generation fails"""
+        return f"""
+## World: {theme} Theme
+
+### Room 1: Entrance (入口/iriguchi)
+A simple entrance area.
+- Vocabulary:
+  - ドア (doa) - door
+  - 椅子 (isu) - chair
+  - 机 (tsukue) - desk
+
+[Error: Failed to generate complete world. Please try again.]
+"""
+
     def generate_world(self, theme: str) -> str:
         """
         Generate a new world based on the given theme
@@ -42,36 +79,28 @@ class WorldGenerator:
         Returns:
             Generated world content as a string
         """
-        # Create the complete prompt by combining the base prompt with the theme
-        prompt = f"""
-        Using the following prompt template, generate a complete world for the theme: {theme}
-        
-        {self.prompt_file}
-        """
-        
         try:
             response = self.client.chat.completions.create(
                 model="gpt-4",
-                messages=[
-                    {"role": "system", "content": "You are a world generator for a Japanese language learning text adventure game. Generate detailed, thematic worlds that help users learn Japanese vocabulary in context."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._messages(theme),
                 temperature=0.7,
                 max_tokens=2000  # Increased token limit for detailed world generation
             )
             return response.choices[0].message.content
         except Exception as e:
             print(f"Error generating world: {str(e)}")
-            # Return a basic world structure as fallback
-            return f"""
-## World: {theme} Theme
-
-### Room 1: Entrance (入口/iriguchi)
-A simple entrance area.
-- Vocabulary:
-  - ドア (doa) - door
-  - 椅子 (isu) - chair
-  - 机 (tsukue) - desk
+            return self._fallback_world(theme)
 
-[Error: Failed to generate complete world. Please try again.]
-"""
+    async def agenerate_world(self, theme: str) -> str:
+        """Generate a new world like generate_world, without blocking the event loop"""
+        try:
+            response = await self.async_client.chat.completions.create(
+                model="gpt-4",
+                messages=self._messages(theme),
+                temperature=0.7,
+                max_tokens=2000  # Increased token limit for detailed world generation
+            )
+            return response.choices[0].message.content
+        except Exception as e:
+            print(f"Error generating world: {str(e)}")
+            return self._fallback_world(theme)
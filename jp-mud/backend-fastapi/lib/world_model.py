@@ -0,0 +1,232 @@
+import re
+from functools import lru_cache
+from typing import Dict, List, Optional
+from pydantic import BaseModel
+
+# "## World: Cafe Theme" or "### Room 2: Counter Area (カウンター/kauntaa)"
+SECTION_HEADING = re.compile(r'^#{2,3}[ \t]+(.+?)[ \t]*$', re.M)
+ROOM_HEADING = re.compile(r'^Room\s*\d*\s*:\s*([^(]+?)\s*(?:\((.*?)\))?\s*$', re.I)
+# "  - ドア (doa) - door"
+WORD_LINE = re.compile(r'^\s*-\s*([^\s(][^(]*?)\s*\(([^)]*)\)\s*[-–:]\s*(.+?)\s*$')
+# "1. 田中さん (Tanaka-san) - Cafe Manager" starts an NPC block in the NPC section
+NPC_START = re.compile(r'^\s*\d+\.\s+', re.M)
+NPC_HEADING = re.compile(r'^\s*\d+\.\s+(.+?)(?:\s*\(([^)\n]*)\))?(?:\s+[-–]\s+(.+?))?\s*$', re.M)
+NPC_LOCATION = re.compile(r'Location:\s*(.+)', re.I)
+# "- Entrance connects to Counter Area and Seating Area"
+CONNECTION_LINE = re.compile(r'^\s*-?\s*(.+?)\s+connects?\s+to\s+(.+?)\.?\s*$', re.I)
+CONNECTION_SPLIT = re.compile(r'\s*,\s*(?:and\s+)?|\s+and\s+', re.I)
+
+
+def normalize_room(name: str) -> str:
+    return re.sub(r'[\s_\-]+', ' ', name).strip().lower()
+
+
+class Word(BaseModel):
+    japanese: str
+    romaji: str = ""
+    english: str = ""
+
+    def matches(self, text: str) -> bool:
+        """Whether text names this word in Japanese, romaji or English"""
+        text = text.strip().lower()
+        return bool(text) and text in (self.japanese.lower(), self.romaji.lower(), self.english.lower())
+
+
+class Room(BaseModel):
+    key: str
+    name: str
+    japanese: str = ""
+    romaji: str = ""
+    description: str = ""
+    # Objects in the room, which are also its vocabulary
+    objects: List[Word] = []
+    # Keys of the rooms reachable from this one
+    exits: List[str] = []
+    # Raw markdown section for prompts
+    text: str = ""
+
+
+class NPC(BaseModel):
+    name: str
+    romaji: str = ""
+    role: str = ""
+    # Key of the NPC's room, or "" when it does not match a room
+    location: str = ""
+    vocabulary: List[Word] = []
+    text: str = ""
+
+
+class WorldModel(BaseModel):
+    """
+    A generated world parsed into rooms, exits, objects and NPCs, so game
+    logic can look rooms up and prompts can carry only the current room.
+    """
+    title: str = ""
+    # Normalized English room name -> room, in world order
+    rooms: Dict[str, Room] = {}
+    npcs: List[NPC] = []
+    connections: List[str] = []
+
+    @property
+    def start_room(self) -> Optional[Room]:
+        return next(iter(self.rooms.values()), None)
+
+    def find_room(self, name: str) -> Optional[Room]:
+        """
+        Match a room by English name, Japanese name or romaji ("entrance",
+        "Counter Area", "カウンター", "kauntaa"), or None when no room or
+        more than one room matches
+        """
+        wanted = normalize_room(name)
+        if not wanted:
+            return None
+        if wanted in self.rooms:
+            return self.rooms[wanted]
+        for room in self.rooms.values():
+            if name.strip() == room.japanese or wanted == normalize_room(room.romaji):
+                return room
+        # Whole-word matches either way ("counter" for Counter Area, "the kitchen"
+        # for Kitchen), so short input like "in" or "a" matches nothing
+        words = set(wanted.split())
+        matches = [room for key, room in self.rooms.items()
+                   if words <= set(key.split()) or set(key.split()) <= words]
+        return matches[0] if len(matches) == 1 else None
+
+    def exits(self, name: str) -> List[Room]:
+        room = self.find_room(name)
+        return [self.rooms[key] for key in room.exits] if room else []
+
+    def npcs_in(self, name: str) -> List[NPC]:
+        room = self.find_room(name)
+        return [npc for npc in self.npcs if room and npc.location == room.key]
+
+    def find_object(self, name: str, text: str) -> Optional[Word]:
+        """An object in the room named by text in Japanese, romaji or English"""
+        room = self.find_room(name)
+        if room:
+            for word in room.objects:
+                if word.matches(text):
+                    return word
+        return None
+
+    @property
+    def vocabulary(self) -> List[Word]:
+        """Every object and conversation word in the world"""
+        words = [word for room in self.rooms.values() for word in room.objects]
+        return words + [word for npc in self.npcs for word in npc.vocabulary]
+
+    def room_context(self, name: str) -> Dict[str, str]:
+        """
+        The world sections relevant to a room, by part: the room itself, its
+        connections and its NPCs. Unknown rooms fall back to the start room.
+        """
+        room = self.find_room(name) or self.start_room
+        if room is None:
+            return {}
+        mentions = re.compile(rf'\b{re.escape(room.key)}\b')
+        connections = [line for line in self.connections if mentions.search(normalize_room(line))]
+        npcs = [npc.text for npc in self.npcs if npc.location == room.key]
+        return {
+            'room': room.text,
+            'connections': "\n".join(["Room Connections:"] + connections) if connections else "",
+            'npcs': "\n\n".join(["NPCs here:"] + npcs) if npcs else "",
+        }
+
+
+def _parse_words(body: str) -> List[Word]:
+    words = []
+    for line in body.splitlines():
+        match = WORD_LINE.match(line)
+        if match and not match.group(1).lower().startswith('vocabulary'):
+            words.append(Word(japanese=match.group(1), romaji=match.group(2).strip(), english=match.group(3)))
+    return words
+
+
+def _parse_room(heading: str, match: re.Match, body: str) -> Room:
+    names = (match.group(2) or "").split('/', 1)
+    description = next((line.strip() for line in body.splitlines()
+                        if line.strip() and not line.lstrip().startswith('-')), "")
+    return Room(
+        key=normalize_room(match.group(1)),
+        name=match.group(1).strip(),
+        japanese=names[0].strip(),
+        romaji=names[1].strip() if len(names) > 1 else "",
+        description=description,
+        objects=_parse_words(body),
+        text=f"{heading}\n{body}",
+    )
+
+
+def _parse_npcs(body: str) -> List[NPC]:
+    npcs = []
+    starts = [match.start() for match in NPC_START.finditer(body)]
+    for i, start in enumerate(starts):
+        block = body[start:starts[i + 1] if i + 1 < len(starts) else len(body)].strip()
+        heading = NPC_HEADING.match(block)
+        location = NPC_LOCATION.search(block)
+        npcs.append(NPC(
+            name=heading.group(1).strip() if heading else block.splitlines()[0],
+            romaji=(heading.group(2) or "").strip() if heading else "",
+            role=(heading.group(3) or "").strip() if heading else "",
+            location=location.group(1).strip() if location else "",
+            vocabulary=_parse_words(block),
+            text=block,
+        ))
+    return npcs
+
+
+def _connect(world: WorldModel):
+    """Resolve connection lines and NPC locations to room keys; exits go both ways"""
+    for line in world.connections:
+        match = CONNECTION_LINE.match(line)
+        source = world.find_room(match.group(1)) if match else None
+        if source is None:
+            continue
+        for name in CONNECTION_SPLIT.split(match.group(2)):
+            target = world.find_room(name)
+            if target is None or target.key == source.key:
+                continue
+            if target.key not in source.exits:
+                source.exits.append(target.key)
+            if source.key not in target.exits:
+                target.exits.append(source.key)
+
+    for npc in world.npcs:
+        room = world.find_room(npc.location)
+        npc.location = room.key if room else ""
+
+
+@lru_cache(maxsize=256)
+def parse_world(world_content: str) -> WorldModel:
+    """
+    Parse world markdown as written by WorldGenerator into a WorldModel.
+    Worlds are parsed once; games sharing the same world content share the
+    model, so it must be treated as read-only.
+
+    Args:
+        world_content: World markdown
+
+    Returns:
+        The parsed world; unstructured text gives a world without rooms
+    """
+    world = WorldModel()
+    headings = list(SECTION_HEADING.finditer(world_content))
+    for i, heading in enumerate(headings):
+        title = heading.group(1).rstrip(':').strip()
+        end = headings[i + 1].start() if i + 1 < len(headings) else len(world_content)
+        body = world_content[heading.end():end].strip()
+
+        room = ROOM_HEADING.match(title)
+        lowered = title.lower()
+        if lowered.startswith('room connection'):
+            world.connections = [line.strip() for line in body.splitlines() if line.strip()]
+        elif room:
+            parsed = _parse_room(heading.group(0).strip(), room, body)
+            world.rooms[parsed.key] = parsed
+        elif lowered.startswith('npc') and 'example' not in lowered:
+            world.npcs.extend(_parse_npcs(body))
+        elif not world.title and 'world' in lowered:
+            world.title = heading.group(0).strip()
+
+    _connect(world)
+    return world
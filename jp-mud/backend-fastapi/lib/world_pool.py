@@ -0,0 +1,240 @@
+import os
+import random
+import re
+import threading
+import time
+import uuid
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Deque, Dict, Iterable, Optional, Tuple
+
+from lib.world_generator import WorldGenerator
+from lib.world_model import parse_world
+
+
+def theme_key(theme: str) -> str:
+    return " ".join(theme.split()).lower()
+
+
+def usable_world(world_content: Optional[str]) -> bool:
+    """Whether a generated world is worth pooling or reusing; the fallback world has a single room"""
+    return bool(world_content) and len(parse_world(world_content).rooms) > 1
+
+
+class WorldPool:
+    """
+    Per-theme pool of pre-generated worlds for popular themes, so starting
+    a game does not wait for a 2000-token world generation.
+
+    Background workers keep the pool of each theme in themes filled to
+    target_depth; other themes are generated on demand only. A pooled world
+    is handed out once. With a pool_dir, pooled worlds are kept on disk so
+    they survive restarts instead of being generated again.
+
+    Every generated world is also kept in a per-theme cache of up to
+    max_cached_worlds. When the pool for a theme is empty while a world for
+    it is being generated, a cached world is reused rather than waiting;
+    otherwise a new world is generated, so players do not all get the same one.
+    """
+
+    def __init__(self, world_generator: WorldGenerator, themes: Iterable[str] = ("cafe",), target_depth: int = 2,
+                 max_workers: int = 2, max_cached_worlds: int = 8, reuse_worlds: bool = True,
+                 pool_dir: Optional[str] = None):
+        self.world_generator = world_generator
+        self.themes = {theme_key(theme) for theme in themes}
+        self.target_depth = target_depth
+        self.max_cached_worlds = max_cached_worlds
+        self.reuse_worlds = reuse_worlds
+        self.pool_dir = pool_dir
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="world-pool")
+        self._lock = threading.Lock()
+        # theme -> (world, file it is kept in or None), oldest first
+        self._pools: Dict[str, Deque[Tuple[str, Optional[str]]]] = {}
+        self._pending: Dict[str, int] = {}
+        # theme -> worlds being generated on the spot for a game
+        self._generating: Dict[str, int] = {}
+        # theme -> recently generated worlds, oldest first
+        self._cache: Dict[str, Deque[str]] = {}
+        self._stats = {'hits': 0, 'reuses': 0, 'misses': 0, 'refills': 0, 'refill_failures': 0,
+                       'refill_seconds': 0.0}
+        if pool_dir:
+            self._load_pools()
+
+    def _theme_dir(self, key: str) -> str:
+        return os.path.join(self.pool_dir, re.sub(r'[^\w-]+', '_', key))
+
+    def _load_pools(self):
+        """Read the worlds pooled on disk by an earlier process"""
+        for key in self.themes:
+            theme_dir = self._theme_dir(key)
+            if not os.path.isdir(theme_dir):
+                continue
+            pool = self._pools.setdefault(key, deque())
+            for file_name in sorted(os.listdir(theme_dir)):
+                file_path = os.path.join(theme_dir, file_name)
+                try:
+                    with open(file_path, 'r', encoding='utf-8') as f:
+                        world_content = f.read()
+                except Exception as e:
+                    print(f"Error loading pooled world {file_path}: {str(e)}")
+                    continue
+                pool.append((world_content, file_path))
+                self._remember(key, world_content)
+
+    def _persist(self, key: str, world_content: str) -> Optional[str]:
+        """Write a pooled world to disk; returns its file or None when the pool is in memory only"""
+        if not self.pool_dir:
+            return None
+        theme_dir = self._theme_dir(key)
+        os.makedirs(theme_dir, exist_ok=True)
+        # Time-ordered names, so worlds are handed out oldest first after a restart
+        file_path = os.path.join(theme_dir, f"{time.time_ns()}-{uuid.uuid4().hex[:8]}.txt")
+        try:
+            with open(file_path, 'w', encoding='utf-8') as f:
+                f.write(world_content)
+        except Exception as e:
+            print(f"Error saving pooled world {file_path}: {str(e)}")
+            return None
+        return file_path
+
+    @staticmethod
+    def _discard_file(file_path: Optional[str]):
+        if file_path and os.path.exists(file_path):
+            os.remove(file_path)
+
+    def _remember(self, key: str, world_content: str):
+        """Add a generated world to the theme's cache; caller holds the lock"""
+        cache = self._cache.setdefault(key, deque(maxlen=self.max_cached_worlds))
+        if world_content not in cache:
+            cache.append(world_content)
+
+    def prefetch(self, theme: str):
+        """
+        Queue background generation until the theme's pool reaches
+        target_depth; only themes in themes are pre-generated.
+        """
+        key = theme_key(theme)
+        if key not in self.themes:
+            return
+        with self._lock:
+            pool = self._pools.setdefault(key, deque())
+            missing = self.target_depth - len(pool) - self._pending.get(key, 0)
+            if missing <= 0:
+                return
+            self._pending[key] = self._pending.get(key, 0) + missing
+        for _ in range(missing):
+            self.executor.submit(self._refill_one, key, theme)
+
+    def _refill_one(self, key: str, theme: str):
+        """Worker: generate one world for a theme's pool"""
+        start = time.perf_counter()
+        try:
+            world_content = self.world_generator.generate_world(theme)
+        except Exception as e:
+            print(f"Error pre-generating world for {theme}: {str(e)}")
+            world_content = None
+        elapsed = time.perf_counter() - start
+        usable = usable_world(world_content)
+        file_path = self._persist(key, world_content) if usable else None
+
+        with self._lock:
+            self._pending[key] -= 1
+            if usable:
+                self._pools[key].append((world_content, file_path))
+                self._remember(key, world_content)
+                self._stats['refills'] += 1
+                self._stats['refill_seconds'] += elapsed
+            else:
+                self._stats['refill_failures'] += 1
+
+    def take(self, theme: str) -> Optional[str]:
+        """
+        Return a world for the theme without generating one: a pooled world,
+        else a cached one when reuse is enabled and a world for the theme is
+        being generated, else None. Either way a pooled theme is topped up in
+        the background.
+        """
+        key = theme_key(theme)
+        with self._lock:
+            pool = self._pools.get(key)
+            world_content, file_path = pool.popleft() if pool else (None, None)
+            if world_content:
+                self._stats['hits'] += 1
+
+        self._discard_file(file_path)
+        self.prefetch(theme)
+        if world_content:
+            return world_content
+
+        with self._lock:
+            in_flight = self._pending.get(key, 0) + self._generating.get(key, 0)
+            if self.reuse_worlds and in_flight and self._cache.get(key):
+                world_content = random.choice(self._cache[key])
+                self._stats['reuses'] += 1
+            else:
+                self._stats['misses'] += 1
+        return world_content
+
+    def _start_generating(self, theme: str):
+        key = theme_key(theme)
+        with self._lock:
+            self._generating[key] = self._generating.get(key, 0) + 1
+
+    def _finish_generating(self, theme: str, world_content: Optional[str]):
+        key = theme_key(theme)
+        usable = usable_world(world_content)
+        with self._lock:
+            self._generating[key] -= 1
+            if usable:
+                self._remember(key, world_content)
+
+    def get(self, theme: str) -> str:
+        """
+        Return a world for the theme, from the pool or cache when one is
+        ready or generated on the spot otherwise, then top the pool up.
+        """
+        world_content = self.take(theme)
+        if world_content is None:
+            self._start_generating(theme)
+            try:
+                world_content = self.world_generator.generate_world(theme)
+            finally:
+                self._finish_generating(theme, world_content)
+        return world_content
+
+    async def aget(self, theme: str) -> str:
+        """Return a world for the theme like get, without blocking the event loop"""
+        world_content = self.take(theme)
+        if world_content is None:
+            self._start_generating(theme)
+            try:
+                world_content = await self.world_generator.agenerate_world(theme)
+            finally:
+                self._finish_generating(theme, world_content)
+        return world_content
+
+    def depth(self, theme: str) -> int:
+        """Number of fresh worlds ready for the theme"""
+        with self._lock:
+            return len(self._pools.get(theme_key(theme), ()))
+
+    def metrics(self) -> Dict:
+        """Pool hit-rate, depth per theme and refill latency"""
+        with self._lock:
+            stats = dict(self._stats)
+            depths = {key: len(pool) for key, pool in self._pools.items()}
+            pending = {key: count for key, count in self._pending.items() if count}
+            cached = {key: len(cache) for key, cache in self._cache.items()}
+        requests = stats['hits'] + stats['reuses'] + stats['misses']
+        return {
+            'hits': stats['hits'],
+            'reuses': stats['reuses'],
+            'misses': stats['misses'],
+            'hit_rate': (stats['hits'] + stats['reuses']) / requests if requests else 0.0,
+            'refills': stats['refills'],
+            'refill_failures': stats['refill_failures'],
+            'avg_refill_seconds': stats['refill_seconds'] / stats['refills'] if stats['refills'] else None,
+            'depths': depths,
+            'pending': pending,
+            'cached_worlds': cached,
+        }
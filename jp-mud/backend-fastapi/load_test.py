@@ -0,0 +1,104 @@
+import argparse
+import asyncio
+import os
+import statistics
+import tempfile
+import time
+
+import httpx
+from fastapi import FastAPI
+
+from lib.clients import register_openai_client, reset_openai_client
+from lib.fakes import FakeAsyncOpenAIClient, FakeOpenAIClient, SAMPLE_RESPONSE
+
+WORLD_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "worlds", "cafe-world.txt")
+
+
+def make_responder(world_content: str):
+    """Answer world-generation requests with a stored world and game commands with a canned response"""
+    def responder(messages):
+        return world_content if "world generator" in messages[0]["content"] else SAMPLE_RESPONSE
+    return responder
+
+
+def blocking_app(api) -> FastAPI:
+    """The message handler as it used to be: a synchronous LLM call inside an async handler"""
+    app = FastAPI()
+
+    @app.post("/api/game/message")
+    async def process_message(request: api.MessageRequest):
+        game = api.get_game(request.session_id, request.theme)
+        response = game.process_command(request.message)
+        return {"session_id": game.session_id, "message": response}
+
+    return app
+
+
+async def play(client: httpx.AsyncClient, session_id: str, messages: int, latencies: list):
+    for i in range(messages):
+        start = time.perf_counter()
+        response = await client.post("/api/game/message", json={"session_id": session_id, "message": f"メニューを見ます {i}"})
+        response.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+
+
+async def run_level(app, session_ids: list, messages: int) -> tuple:
+    """Every player sends messages one after another; players run concurrently"""
+    latencies = []
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://mud") as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(play(client, session_id, messages, latencies) for session_id in session_ids))
+        elapsed = time.perf_counter() - start
+    return elapsed, latencies
+
+
+async def main_async(args):
+    import api
+
+    with open(WORLD_FILE, 'r', encoding='utf-8') as f:
+        responder = make_responder(f.read())
+    register_openai_client(
+        FakeOpenAIClient(responder, latency=args.llm_latency),
+        FakeAsyncOpenAIClient(responder, latency=args.llm_latency)
+    )
+
+    # Start one game per player through the real endpoint
+    max_players = max(args.players)
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=api.app), base_url="http://mud") as client:
+        responses = await asyncio.gather(*(
+            client.post("/api/game/new", json={"theme": "cafe"}) for _ in range(max_players)
+        ))
+    session_ids = [response.json()["session_id"] for response in responses]
+
+    apps = {"async": api.app}
+    if not args.skip_blocking:
+        apps["blocking"] = blocking_app(api)
+
+    print(f"LLM latency {args.llm_latency * 1000:.0f} ms, {args.messages} messages per player")
+    for name, app in apps.items():
+        for players in args.players:
+            elapsed, latencies = await run_level(app, session_ids[:players], args.messages)
+            latencies.sort()
+            print(f"{name:<9} {players:>4} players  {len(latencies) / elapsed:8.1f} msg/s  "
+                  f"p50 {statistics.median(latencies) * 1000:8.1f} ms  "
+                  f"p95 {latencies[int(len(latencies) * 0.95)] * 1000:8.1f} ms")
+
+    reset_openai_client()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Concurrent-player load test against the API with a fake LLM")
+    parser.add_argument("--players", type=int, nargs="+", default=[1, 10, 50], help="Concurrency levels")
+    parser.add_argument("--messages", type=int, default=5, help="Messages per player")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Simulated completion latency (s)")
+    parser.add_argument("--skip-blocking", action="store_true", help="Skip the blocking-handler baseline")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        # Keep the load test's sessions out of data/
+        os.environ["MUD_DATA_DIR"] = data_dir
+        asyncio.run(main_async(args))
+
+
+if __name__ == "__main__":
+    main()
@@ -131,15 +131,20 @@ export function App() {
         return; // Return early as startNewGame will add the welcome message
       }
       
-      const response = await api.sendMessage(content, theme);
+      // Add an empty bot message and fill it in as the response streams
+      setMessages(prev => [...prev, { content: '', sender: 'bot' }]);
+      const appendToReply = (text: string) => {
+        setMessages(prev => [
+          ...prev.slice(0, -1),
+          { ...prev[prev.length - 1], content: prev[prev.length - 1].content + text }
+        ]);
+      };
+
+      const response = await api.sendMessageStream(content, appendToReply, theme);
       
-      // Add bot response to chat
-      if (response.message) {
-        setMessages(prev => [...prev, { 
-          content: response.message, 
-          sender: 'bot' 
-        }]);
-      } else if (response.error) {
+      if (response.error) {
+        // Drop the unfinished reply and show the error instead
+        setMessages(prev => prev.slice(0, -1));
         setError(response.error);
       }
     } catch (err) {
@@ -62,6 +62,91 @@ export const sendMessage = async (message: string, theme: string = "cafe"): Prom
   }
 };
 
+/**
+ * Send a message to the game, streaming the response as it is generated.
+ * onText receives each new piece of text; the returned promise resolves
+ * with the complete response once the game state has been saved, or with
+ * an error if the turn failed before it finished.
+ */
+export const sendMessageStream = async (
+  message: string,
+  onText: (text: string) => void,
+  theme: string = "cafe"
+): Promise<GameResponse> => {
+  try {
+    if (!currentSessionId) {
+      return {
+        success: false,
+        error: 'No active session',
+        message: 'You need to start a new game first.',
+      };
+    }
+
+    const response = await fetch(`${API_BASE_URL}/game/message/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({
+        message,
+        session_id: currentSessionId,
+        theme,
+      }),
+    });
+
+    if (!response.ok || !response.body) {
+      throw new Error(`Server responded with status: ${response.status}`);
+    }
+
+    // Server-Sent Events: "data: {...}" lines separated by blank lines
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+    let result: GameResponse = { message: '' };
+    let finished = false;
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+      buffer += decoder.decode(value, { stream: true });
+
+      const events = buffer.split('\n\n');
+      buffer = events.pop() ?? '';
+      for (const event of events) {
+        if (!event.startsWith('data: ')) continue;
+        const data = JSON.parse(event.slice('data: '.length));
+        if (data.type === 'token') {
+          result.message += data.text;
+          onText(data.text);
+        } else if (data.type === 'done') {
+          result = data;
+          finished = true;
+        } else if (data.type === 'error') {
+          throw new Error(data.detail || 'The reply could not be generated');
+        }
+      }
+    }
+
+    if (!finished) {
+      throw new Error('The connection closed before the reply finished');
+    }
+
+    // Store the session ID for future requests
+    if (result.session_id) {
+      currentSessionId = result.session_id;
+    }
+
+    return result;
+  } catch (error) {
+    console.error('Error sending message:', error);
+    return {
+      success: false,
+      error: error instanceof Error ? error.message : String(error),
+      message: '',
+    };
+  }
+};
+
 /**
  * Start a new game session
  */
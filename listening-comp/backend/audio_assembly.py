@@ -0,0 +1,84 @@
+from typing import Dict, List, Optional
+
+# MPEG-2 Layer III sample rates by header index, and the matching index for silence frames
+_MPEG2_SAMPLE_RATES = {0: 22050, 1: 24000, 2: 16000}
+_SILENCE_SAMPLE_RATE_INDEX = {24000: 1, 16000: 2}
+
+# Silence is encoded at 48 kbps mono; each MPEG-2 Layer III frame holds 576 samples
+_SILENCE_BITRATE = 48000
+_SAMPLES_PER_FRAME = 576
+
+
+def strip_id3(data: bytes) -> bytes:
+    """Remove ID3v2 headers and an ID3v1 trailer so only MP3 frames remain"""
+    while data[:3] == b'ID3' and len(data) >= 10:
+        size = (data[6] << 21) | (data[7] << 14) | (data[8] << 7) | data[9]
+        footer = 10 if data[5] & 0x10 else 0
+        data = data[10 + size + footer:]
+    if len(data) >= 128 and data[-128:-125] == b'TAG':
+        data = data[:-128]
+    return data
+
+
+def mp3_sample_rate(data: bytes) -> Optional[int]:
+    """Sample rate of the first MPEG-2 Layer III frame, or None if it is not one"""
+    for idx in range(len(data) - 3):
+        if data[idx] == 0xFF and (data[idx + 1] & 0xE0) == 0xE0:
+            version = (data[idx + 1] >> 3) & 0x03
+            layer = (data[idx + 1] >> 1) & 0x03
+            if version != 0b10 or layer != 0b01:
+                return None
+            return _MPEG2_SAMPLE_RATES.get((data[idx + 2] >> 2) & 0x03)
+    return None
+
+
+def silent_mp3(duration_ms: int, sample_rate: int = 24000) -> bytes:
+    """Return MP3 frames containing duration_ms of silence at the given sample rate"""
+    if sample_rate not in _SILENCE_SAMPLE_RATE_INDEX:
+        raise ValueError(f"Unsupported sample rate for silence: {sample_rate}")
+    # Header: MPEG-2 Layer III, no CRC, 48 kbps, mono; zeroed side info decodes as silence
+    header = bytes([0xFF, 0xF3, 0x60 | (_SILENCE_SAMPLE_RATE_INDEX[sample_rate] << 2), 0xC0])
+    frame_size = 72 * _SILENCE_BITRATE // sample_rate
+    frame = header + bytes(frame_size - len(header))
+    frame_ms = _SAMPLES_PER_FRAME * 1000 / sample_rate
+    frames = max(1, int(-(-duration_ms // frame_ms)))
+    return frame * frames
+
+
+class AudioAssembler:
+    """
+    Assembles a question's audio in memory by concatenating MP3 frames.
+    Clips must share one sample rate, which holds for a single TTS voice family
+    (Polly neural returns 24 kHz MP3); silence is generated as matching frames,
+    so no decoding, re-encoding, temp files or ffmpeg processes are needed.
+    """
+    def __init__(self):
+        self._silence: Dict[tuple, bytes] = {}
+
+    def silence(self, duration_ms: int, sample_rate: int) -> bytes:
+        """Silence frames, generated once per (duration, sample rate)"""
+        key = (duration_ms, sample_rate)
+        if key not in self._silence:
+            self._silence[key] = silent_mp3(duration_ms, sample_rate)
+        return self._silence[key]
+
+    def assemble(self, segments: List) -> bytes:
+        """
+        Concatenate segments into one MP3 stream.
+        Each segment is either clip bytes or an int duration of silence in milliseconds.
+        Raises ValueError if clips cannot be joined frame-wise.
+        """
+        clips = [strip_id3(segment) for segment in segments if isinstance(segment, (bytes, bytearray))]
+        sample_rates = {mp3_sample_rate(clip) for clip in clips}
+        if len(sample_rates) > 1 or None in sample_rates:
+            raise ValueError(f"Clips cannot be joined frame-wise (sample rates: {sample_rates})")
+        sample_rate = sample_rates.pop() if sample_rates else 24000
+
+        buffer = bytearray()
+        clip_iter = iter(clips)
+        for segment in segments:
+            if isinstance(segment, int):
+                buffer += self.silence(segment, sample_rate)
+            else:
+                buffer += next(clip_iter)
+        return bytes(buffer)
@@ -0,0 +1,100 @@
+import hashlib
+import os
+import threading
+from typing import Dict, Optional
+
+# Default on-disk location for synthesized clips
+AUDIO_CACHE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "cache", "audio")
+
+# Default size bound for the cache (200 MB)
+DEFAULT_MAX_BYTES = 200 * 1024 * 1024
+
+
+class AudioCache:
+    """
+    Content-addressed cache of synthesized speech clips.
+    Clips are keyed by (engine, voice, text) and evicted least-recently-used
+    first once the cache grows past max_bytes.
+    """
+    def __init__(self, cache_dir: str = AUDIO_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES, extension: str = "mp3"):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.extension = extension
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.total_bytes = sum(
+            entry.stat().st_size for entry in os.scandir(self.cache_dir)
+            if entry.is_file() and entry.name.endswith(f".{self.extension}")
+        )
+
+    def key(self, engine: str, voice: str, text: str) -> str:
+        """Content hash for a clip"""
+        return hashlib.sha256(f"{engine}\0{voice}\0{text}".encode('utf-8')).hexdigest()
+
+    def path_for(self, engine: str, voice: str, text: str) -> str:
+        """Path where the clip for (engine, voice, text) is stored"""
+        return os.path.join(self.cache_dir, f"{self.key(engine, voice, text)}.{self.extension}")
+
+    def get(self, engine: str, voice: str, text: str) -> Optional[str]:
+        """Return the cached clip path, or None on a miss"""
+        path = self.path_for(engine, voice, text)
+        with self._lock:
+            if os.path.exists(path):
+                self.hits += 1
+                # Refresh mtime so eviction is least-recently-used
+                try:
+                    os.utime(path)
+                except OSError:
+                    pass
+                return path
+            self.misses += 1
+            return None
+
+    def put(self, engine: str, voice: str, text: str, data: bytes) -> str:
+        """Store a clip and return its path, evicting old clips if over the size bound"""
+        path = self.path_for(engine, voice, text)
+        tmp_path = f"{path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, 'wb') as f:
+            f.write(data)
+
+        with self._lock:
+            previous_size = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+            self.total_bytes += len(data) - previous_size
+            if self.total_bytes > self.max_bytes:
+                self._evict(keep=path)
+        return path
+
+    def _evict(self, keep: str):
+        """Remove least-recently-used clips until under max_bytes (lock must be held)"""
+        entries = sorted(
+            (entry for entry in os.scandir(self.cache_dir)
+             if entry.is_file() and entry.name.endswith(f".{self.extension}") and entry.path != keep),
+            key=lambda entry: entry.stat().st_mtime
+        )
+        for entry in entries:
+            if self.total_bytes <= self.max_bytes:
+                break
+            try:
+                size = entry.stat().st_size
+                os.unlink(entry.path)
+                self.total_bytes -= size
+                self.evictions += 1
+            except OSError as e:
+                print(f"Error evicting {entry.path}: {str(e)}")
+
+    def stats(self) -> Dict:
+        """Hit-rate and size metrics"""
+        lookups = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / lookups if lookups else 0.0,
+            "evictions": self.evictions,
+            "bytes": self.total_bytes,
+            "max_bytes": self.max_bytes,
+        }
@@ -1,29 +1,29 @@
-import boto3
 import json
 import os
 from typing import Dict, List, Tuple
 import tempfile
 import subprocess
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from google.cloud import texttospeech
-from azure.cognitiveservices.speech import SpeechConfig, SpeechSynthesizer
-from azure.cognitiveservices.speech.audio import AudioOutputConfig
+from backend.audio_assembly import AudioAssembler
+from backend.audio_cache import AudioCache
+from backend.clients import get_bedrock_client
+from backend.conversation_parser import parse_conversation_local
+from backend.tts import PollyTTS
 
 class AudioGenerator:
-    def __init__(self):
-        # AWS clients
-        self.bedrock = boto3.client('bedrock-runtime', region_name="us-east-1")
-        self.polly = boto3.client('polly')
+    def __init__(self, audio_cache: AudioCache = None, tts=None, max_workers: int = 4):
         self.model_id = "amazon.nova-micro-v1:0"
         
-        # Google Cloud TTS client
-        self.google_client = texttospeech.TextToSpeechClient()
+        # Speech synthesis backend (Polly; tests pass PollyTTS over fakes.FakePollyClient)
+        self.tts = tts or PollyTTS()
+        self.max_workers = max_workers
         
-        # Azure TTS client
-        self.azure_speech_config = SpeechConfig(
-            subscription=os.getenv('AZURE_SPEECH_KEY'),
-            region=os.getenv('AZURE_SPEECH_REGION')
-        )
+        # Google and Azure clients (and their SDK imports) are deferred to first use
+        self._google_client = None
+        self._azure_speech_config = None
         
         # Define Japanese neural voices by gender and service
         self.voices = {
@@ -55,6 +55,40 @@ class AudioGenerator:
         )
         os.makedirs(self.audio_dir, exist_ok=True)
 
+        # Synthesized clips are reused across questions (e.g. the announcer intro)
+        self.audio_cache = audio_cache or AudioCache()
+        
+        # Joins clips and pauses in memory instead of via temp files and ffmpeg
+        self.assembler = AudioAssembler()
+        
+        # Conversation parsing metrics (local rule-based parser vs LLM fallback)
+        self.parse_stats = {'local': 0, 'llm': 0, 'local_seconds': 0.0, 'llm_seconds': 0.0}
+        self._parse_stats_lock = threading.Lock()
+
+    @property
+    def bedrock(self):
+        """Shared Bedrock runtime client, created on first use"""
+        return get_bedrock_client()
+
+    @property
+    def google_client(self):
+        """Google Cloud TTS client"""
+        if self._google_client is None:
+            from google.cloud import texttospeech
+            self._google_client = texttospeech.TextToSpeechClient()
+        return self._google_client
+
+    @property
+    def azure_speech_config(self):
+        """Azure TTS config"""
+        if self._azure_speech_config is None:
+            from azure.cognitiveservices.speech import SpeechConfig
+            self._azure_speech_config = SpeechConfig(
+                subscription=os.getenv('AZURE_SPEECH_KEY'),
+                region=os.getenv('AZURE_SPEECH_REGION')
+            )
+        return self._azure_speech_config
+
     def _invoke_bedrock(self, prompt: str) -> str:
         """Invoke Bedrock with the given prompt using converse API"""
         messages = [{
@@ -120,6 +154,48 @@ class AudioGenerator:
     def parse_conversation(self, question: Dict) -> List[Tuple[str, str, str]]:
         """
         Convert question into a format for audio generation.
+        Speaker-prefixed questions are parsed locally; the LLM is only used
+        for input the rule-based parser cannot handle.
+        Returns a list of (speaker, text, gender) tuples.
+        """
+        start = time.perf_counter()
+        parts = parse_conversation_local(question)
+        if parts and self.validate_conversation_parts(parts):
+            self._record_parse('local', time.perf_counter() - start)
+            return parts
+
+        start = time.perf_counter()
+        parts = self._parse_conversation_llm(question)
+        self._record_parse('llm', time.perf_counter() - start)
+        return parts
+
+    def _record_parse(self, method: str, seconds: float):
+        """Record which parser handled a question and how long it took"""
+        with self._parse_stats_lock:
+            self.parse_stats[method] += 1
+            self.parse_stats[f'{method}_seconds'] += seconds
+
+    def parse_metrics(self) -> Dict:
+        """LLM fallback rate and estimated latency saved by local parsing"""
+        with self._parse_stats_lock:
+            stats = dict(self.parse_stats)
+        total = stats['local'] + stats['llm']
+        avg_llm = stats['llm_seconds'] / stats['llm'] if stats['llm'] else None
+        avg_local = stats['local_seconds'] / stats['local'] if stats['local'] else 0.0
+        return {
+            'parsed': total,
+            'local': stats['local'],
+            'llm_fallbacks': stats['llm'],
+            'fallback_rate': stats['llm'] / total if total else 0.0,
+            'avg_local_seconds': avg_local,
+            'avg_llm_seconds': avg_llm,
+            # Only estimable once at least one LLM parse has been timed
+            'estimated_seconds_saved': (avg_llm - avg_local) * stats['local'] if avg_llm is not None else None,
+        }
+
+    def _parse_conversation_llm(self, question: Dict) -> List[Tuple[str, str, str]]:
+        """
+        Ask the LLM to split the question into speaker parts.
         Returns a list of (speaker, text, gender) tuples.
         """
         max_retries = 3
@@ -246,22 +322,31 @@ class AudioGenerator:
             return 'Kazuha'  # Female voice
 
     def generate_audio_part(self, text: str, voice_name: str) -> str:
-        """Generate audio for a single part using Amazon Polly"""
-        response = self.polly.synthesize_speech(
-            Text=text,
-            OutputFormat='mp3',
-            VoiceId=voice_name,
-            Engine='neural',
-            LanguageCode='ja-JP'
-        )
-        
-        # Save to temporary file
-        with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as temp_file:
-            temp_file.write(response['AudioStream'].read())
-            return temp_file.name
+        """Generate audio for a single part, reusing cached clips"""
+        cached = self.audio_cache.get(self.tts.engine, voice_name, text)
+        if cached:
+            return cached
+
+        return self.audio_cache.put(self.tts.engine, voice_name, text, self.tts.synthesize(text, voice_name))
+
+    def generate_audio_parts(self, parts: List[Tuple[str, str, str]]) -> List[str]:
+        """
+        Synthesize all parts concurrently with a bounded pool.
+        Returns clip paths in the same order as parts.
+        """
+        texts = [text for _, text, _ in parts]
+        voices = [self.get_voice_for_gender(gender) for _, _, gender in parts]
+        for (speaker, _, gender), voice in zip(parts, voices):
+            print(f"Using voice {voice} for {speaker} ({gender})")
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            return list(executor.map(self.generate_audio_part, texts, voices))
 
     def combine_audio_files(self, audio_files: List[str], output_file: str):
-        """Combine multiple audio files using ffmpeg"""
+        """
+        Combine multiple audio files using ffmpeg.
+        Input files are left in place: they are cached clips and shared silence files.
+        """
         file_list = None
         try:
             # Create file list for ffmpeg
@@ -285,15 +370,41 @@ class AudioGenerator:
                 os.unlink(output_file)
             return False
         finally:
-            # Clean up temporary files
+            # Clean up the temporary file list
             if file_list and os.path.exists(file_list):
                 os.unlink(file_list)
-            for audio_file in audio_files:
-                if os.path.exists(audio_file):
-                    try:
-                        os.unlink(audio_file)
-                    except Exception as e:
-                        print(f"Error cleaning up {audio_file}: {str(e)}")
+
+    def assemble_audio(self, segments: List, output_file: str) -> bool:
+        """
+        Assemble clip paths and pauses (int milliseconds) into output_file.
+        Joins MP3 frames in memory and writes the result once; falls back to
+        ffmpeg concat only for clips that cannot be joined frame-wise.
+        """
+        clip_data = {}
+        for segment in segments:
+            if isinstance(segment, str) and segment not in clip_data:
+                with open(segment, 'rb') as f:
+                    clip_data[segment] = f.read()
+
+        try:
+            audio = self.assembler.assemble([
+                clip_data[segment] if isinstance(segment, str) else segment
+                for segment in segments
+            ])
+        except ValueError as e:
+            print(f"In-memory assembly not possible, using ffmpeg: {str(e)}")
+            return self.combine_audio_files([
+                segment if isinstance(segment, str) else self.generate_silence(segment)
+                for segment in segments
+            ], output_file)
+
+        try:
+            with open(output_file, 'wb') as f:
+                f.write(audio)
+            return True
+        except Exception as e:
+            print(f"Error writing audio file: {str(e)}")
+            return False
 
     def generate_silence(self, duration_ms: int) -> str:
         """Generate a silent audio file of specified duration"""
@@ -312,22 +423,34 @@ class AudioGenerator:
         Generate audio for the entire question.
         Returns the path to the generated audio file.
         """
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        output_file = os.path.join(self.audio_dir, f"question_{timestamp}.mp3")
-        
         try:
             # Parse conversation into parts
             parts = self.parse_conversation(question)
+        except Exception as e:
+            raise Exception(f"Audio generation failed: {str(e)}")
+        return self.generate_audio_from_parts(parts)
+
+    def generate_audio_from_parts(self, parts: List[Tuple[str, str, str]], output_file: str = None) -> str:
+        """
+        Generate audio for already-parsed (speaker, text, gender) parts.
+        Returns the path to the generated audio file.
+        """
+        if output_file is None:
+            timestamp = datetime.now().strftime("%Y%m%d_%H%M%S_%f")
+            output_file = os.path.join(self.audio_dir, f"question_{timestamp}.mp3")
+        
+        try:
+            # Generate audio for all parts concurrently; order is preserved
+            part_files = self.generate_audio_parts(parts)
             
-            # Generate audio for each part
             audio_parts = []
             current_section = None
             
-            # Generate silence files for pauses
-            long_pause = self.generate_silence(2000)  # 2 second pause
-            short_pause = self.generate_silence(500)  # 0.5 second pause
+            # Pauses are inserted as silence durations in milliseconds
+            long_pause = 2000  # 2 second pause
+            short_pause = 500  # 0.5 second pause
             
-            for speaker, text, gender in parts:
+            for (speaker, text, gender), audio_file in zip(parts, part_files):
                 # Detect section changes and add appropriate pauses
                 if speaker.lower() == 'announcer':
                     if '次の会話' in text:  # Introduction
@@ -341,12 +464,6 @@ class AudioGenerator:
                     audio_parts.append(long_pause)
                     current_section = 'conversation'
                 
-                # Get appropriate voice for this speaker
-                voice = self.get_voice_for_gender(gender)
-                print(f"Using voice {voice} for {speaker} ({gender})")
-                
-                # Generate audio for this part
-                audio_file = self.generate_audio_part(text, voice)
                 if not audio_file:
                     raise Exception("Failed to generate audio part")
                 audio_parts.append(audio_file)
@@ -356,9 +473,12 @@ class AudioGenerator:
                     audio_parts.append(short_pause)
             
             # Combine all parts into final audio
-            if not self.combine_audio_files(audio_parts, output_file):
+            if not self.assemble_audio(audio_parts, output_file):
                 raise Exception("Failed to combine audio files")
             
+            stats = self.audio_cache.stats()
+            print(f"Audio cache: {stats['hits']} hits, {stats['misses']} misses "
+                  f"({stats['hit_rate']:.0%} hit rate, {stats['bytes'] / 1024:.0f} KB)")
             return output_file
             
         except Exception as e:
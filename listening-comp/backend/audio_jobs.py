@@ -0,0 +1,219 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import Callable, Dict, Optional
+
+from backend.question_store import DB_FILE
+
+# Jobs were recorded here before they moved to the database; imported once on first start
+LEGACY_JOBS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "audio_jobs.json")
+
+QUEUED = 'queued'
+RUNNING = 'running'
+DONE = 'done'
+FAILED = 'failed'
+
+# Finished jobs kept on disk before the oldest are pruned
+MAX_FINISHED_JOBS = 500
+
+JOB_FIELDS = ('id', 'question_id', 'question', 'status', 'audio_file', 'error', 'created_at', 'finished_at')
+
+
+class AudioJobQueue:
+    """
+    Background audio generation.
+    Jobs run on a worker pool; callers get a job id back immediately and
+    poll status() until the job is done or failed.
+
+    Job records are rows in the question database, so they survive restarts
+    and a status change updates one row. The question body is only kept
+    until the job finishes.
+    """
+    def __init__(
+        self,
+        audio_generator,
+        db_file: str = DB_FILE,
+        max_workers: int = 2,
+        on_complete: Optional[Callable[[Dict], None]] = None,
+        legacy_jobs_file: Optional[str] = LEGACY_JOBS_FILE
+    ):
+        self.audio_generator = audio_generator
+        self.on_complete = on_complete
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="audio-job")
+        os.makedirs(os.path.dirname(db_file), exist_ok=True)
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS audio_jobs (
+                    id TEXT PRIMARY KEY,
+                    question_id TEXT,
+                    question TEXT,
+                    status TEXT NOT NULL,
+                    audio_file TEXT,
+                    error TEXT,
+                    created_at TEXT NOT NULL,
+                    finished_at TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_audio_jobs_question ON audio_jobs(question_id, created_at);
+                CREATE INDEX IF NOT EXISTS idx_audio_jobs_status ON audio_jobs(status, created_at);
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+
+        if legacy_jobs_file:
+            self.migrate_from_json(legacy_jobs_file)
+
+        # Requeue jobs that were interrupted by a restart
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE audio_jobs SET status = ? WHERE status IN (?, ?)", (QUEUED, QUEUED, RUNNING)
+            )
+            interrupted = self.conn.execute(
+                "SELECT id FROM audio_jobs WHERE status = ? ORDER BY created_at", (QUEUED,)
+            ).fetchall()
+        for row in interrupted:
+            self.executor.submit(self._run, row['id'])
+
+    def migrate_from_json(self, json_file: str) -> int:
+        """Import job records from the legacy audio_jobs.json once; returns rows imported"""
+        if not os.path.exists(json_file):
+            return 0
+
+        with self._lock:
+            migrated = self.conn.execute(
+                "SELECT value FROM meta WHERE key = 'migrated_audio_jobs'"
+            ).fetchone()
+            if migrated:
+                return 0
+
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    jobs = json.load(f)
+            except Exception as e:
+                print(f"Error reading {json_file}: {str(e)}")
+                return 0
+
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO audio_jobs (id, question_id, question, status, audio_file, error, "
+                    "created_at, finished_at) VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            job['id'],
+                            job.get('question_id'),
+                            # Finished jobs no longer need their question
+                            json.dumps(job['question'], ensure_ascii=False)
+                            if job['status'] in (QUEUED, RUNNING) else None,
+                            job['status'],
+                            job.get('audio_file'),
+                            job.get('error'),
+                            job['created_at'],
+                            job.get('finished_at')
+                        )
+                        for job in jobs.values()
+                    ]
+                )
+                self.conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('migrated_audio_jobs', ?)",
+                    (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),)
+                )
+            print(f"Migrated {len(jobs)} audio jobs from {json_file}")
+            return len(jobs)
+
+    @staticmethod
+    def _job(row) -> Dict:
+        job = dict(row)
+        job['question'] = json.loads(job['question']) if job['question'] else None
+        return job
+
+    def _get(self, job_id: str) -> Optional[Dict]:
+        """Load a job record (lock must be held)"""
+        row = self.conn.execute(
+            f"SELECT {', '.join(JOB_FIELDS)} FROM audio_jobs WHERE id = ?", (job_id,)
+        ).fetchone()
+        return self._job(row) if row else None
+
+    def _prune(self):
+        """Delete the oldest finished jobs beyond MAX_FINISHED_JOBS (lock must be held)"""
+        self.conn.execute(
+            "DELETE FROM audio_jobs WHERE id IN ("
+            "SELECT id FROM audio_jobs WHERE status IN (?, ?) ORDER BY created_at DESC LIMIT -1 OFFSET ?)",
+            (DONE, FAILED, MAX_FINISHED_JOBS)
+        )
+
+    def _update(self, job_id: str, **fields) -> Dict:
+        """Update and persist a job record, returning it"""
+        if fields.get('status') in (DONE, FAILED):
+            fields['question'] = None
+            fields['finished_at'] = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock, self.conn:
+            self.conn.execute(
+                f"UPDATE audio_jobs SET {', '.join(f'{name} = ?' for name in fields)} WHERE id = ?",
+                (*fields.values(), job_id)
+            )
+            if 'finished_at' in fields:
+                self._prune()
+            return self._get(job_id)
+
+    def submit(self, question: Dict, question_id: Optional[str] = None) -> str:
+        """Queue audio generation for a question and return the job id"""
+        job_id = uuid.uuid4().hex
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO audio_jobs (id, question_id, question, status, created_at) VALUES (?, ?, ?, ?, ?)",
+                (
+                    job_id,
+                    question_id,
+                    json.dumps(question, ensure_ascii=False),
+                    QUEUED,
+                    datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+                )
+            )
+        self.executor.submit(self._run, job_id)
+        return job_id
+
+    def _run(self, job_id: str):
+        """Worker: generate audio for one job"""
+        with self._lock:
+            job = self._get(job_id)
+        if job is None or not job['question']:
+            return
+        self._update(job_id, status=RUNNING)
+
+        try:
+            audio_file = self.audio_generator.generate_audio(job['question'])
+            job = self._update(job_id, status=DONE, audio_file=audio_file)
+        except Exception as e:
+            print(f"Audio job {job_id} failed: {str(e)}")
+            job = self._update(job_id, status=FAILED, error=str(e))
+
+        if job and job['status'] == DONE and self.on_complete:
+            try:
+                self.on_complete(job)
+            except Exception as e:
+                print(f"Error in audio job callback: {str(e)}")
+
+    def status(self, job_id: str) -> Optional[Dict]:
+        """Return the job record, or None for an unknown id"""
+        with self._lock:
+            return self._get(job_id)
+
+    def job_for_question(self, question_id: str) -> Optional[Dict]:
+        """Most recent job for a stored question, if any"""
+        with self._lock:
+            row = self.conn.execute(
+                f"SELECT {', '.join(JOB_FIELDS)} FROM audio_jobs WHERE question_id = ? "
+                "ORDER BY created_at DESC LIMIT 1",
+                (question_id,)
+            ).fetchone()
+        return self._job(row) if row else None
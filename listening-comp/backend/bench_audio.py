@@ -0,0 +1,102 @@
+import sys
+import os
+import argparse
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.audio_cache import AudioCache
+from backend.audio_generator import AudioGenerator
+from backend.fakes import FakePollyClient
+from backend.tts import PollyTTS
+
+# Pre-parsed parts of a typical 10-turn dialogue question
+SAMPLE_PARTS = [
+    ("Announcer", "次の会話を聞いて、質問に答えてください。", "male"),
+    ("Man", "すみません、この電車は新宿駅に止まりますか。", "male"),
+    ("Woman", "はい、次の駅が新宿です。", "female"),
+    ("Man", "ありがとうございます。何分くらいかかりますか。", "male"),
+    ("Woman", "そうですね、5分くらいです。", "female"),
+    ("Man", "新宿駅で降りたら、どの出口が近いですか。", "male"),
+    ("Woman", "東口が一番近いですよ。", "female"),
+    ("Man", "東口から歩いて何分ですか。", "male"),
+    ("Woman", "3分くらいだと思います。", "female"),
+    ("Man", "わかりました。助かりました。", "male"),
+    ("Woman", "いいえ、どういたしまして。", "female"),
+    ("Announcer", "質問：新宿駅まで何分かかりますか。", "male"),
+]
+
+
+def run(questions: int, workers: int, latency: float) -> float:
+    """Generate audio for the sample question repeatedly and return seconds per question"""
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = AudioGenerator(
+            audio_cache=AudioCache(os.path.join(tmp, "cache")),
+            tts=PollyTTS(polly_client=FakePollyClient(latency=latency)),
+            max_workers=workers
+        )
+        start = time.perf_counter()
+        for idx in range(questions):
+            # Vary the text so every question pays for synthesis, like new questions do
+            parts = [(speaker, f"{text}{idx}", gender) for speaker, text, gender in SAMPLE_PARTS]
+            generator.generate_audio_from_parts(parts, os.path.join(tmp, f"question_{idx}.mp3"))
+        return (time.perf_counter() - start) / questions
+
+
+def run_assembly(questions: int) -> tuple:
+    """
+    Time final-audio assembly alone over many generated questions.
+    Returns seconds per question for (in-memory assembly, ffmpeg concat).
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        generator = AudioGenerator(
+            audio_cache=AudioCache(os.path.join(tmp, "cache")),
+            tts=PollyTTS(polly_client=FakePollyClient())
+        )
+        generator.audio_dir = tmp
+        question_segments = []
+        for idx in range(questions):
+            parts = [(speaker, f"{text}{idx}", gender) for speaker, text, gender in SAMPLE_PARTS]
+            segments = [2000]
+            for clip in generator.generate_audio_parts(parts):
+                segments.extend([clip, 500])
+            question_segments.append(segments)
+
+        start = time.perf_counter()
+        for idx, segments in enumerate(question_segments):
+            generator.assemble_audio(segments, os.path.join(tmp, f"memory_{idx}.mp3"))
+        in_memory = (time.perf_counter() - start) / questions
+
+        start = time.perf_counter()
+        for idx, segments in enumerate(question_segments):
+            files = [s if isinstance(s, str) else generator.generate_silence(s) for s in segments]
+            generator.combine_audio_files(files, os.path.join(tmp, f"ffmpeg_{idx}.mp3"))
+        ffmpeg = (time.perf_counter() - start) / questions
+        return in_memory, ffmpeg
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark audio generation with a local TTS stand-in")
+    parser.add_argument("--questions", type=int, default=5)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--latency", type=float, default=0.3, help="Simulated TTS round-trip in seconds")
+    parser.add_argument("--assembly", action="store_true",
+                        help="Compare in-memory assembly with ffmpeg concat (use with --questions 100)")
+    args = parser.parse_args()
+
+    if args.assembly:
+        in_memory, ffmpeg = run_assembly(args.questions)
+        print(f"\nAssembly over {args.questions} questions")
+        print(f"In-memory:     {in_memory * 1000:.1f} ms/question")
+        print(f"ffmpeg concat: {ffmpeg * 1000:.1f} ms/question ({ffmpeg / in_memory:.0f}x)")
+        return
+
+    sequential = run(args.questions, 1, args.latency)
+    concurrent = run(args.questions, args.workers, args.latency)
+    print(f"\n{len(SAMPLE_PARTS)} parts per question, {args.latency * 1000:.0f} ms simulated TTS latency")
+    print(f"Sequential:           {sequential * 1000:.0f} ms/question")
+    print(f"Concurrent ({args.workers} workers): {concurrent * 1000:.0f} ms/question ({sequential / concurrent:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
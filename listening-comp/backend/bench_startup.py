@@ -0,0 +1,43 @@
+import sys
+import os
+import argparse
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def timed(label: str, fn):
+    """Run fn, print how long it took and return its result"""
+    start = time.perf_counter()
+    result = fn()
+    print(f"{label:<40} {(time.perf_counter() - start) * 1000:8.1f} ms")
+    return result
+
+
+def construct_session():
+    """Build the backend objects a Streamlit session creates"""
+    from backend.question_generator import QuestionGenerator
+    from backend.audio_generator import AudioGenerator
+    from backend.structured_data import TranscriptStructurer
+    from backend.chat import BedrockChat
+    return QuestionGenerator(), AudioGenerator(), TranscriptStructurer(), BedrockChat()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark backend startup time")
+    parser.add_argument("--sessions", type=int, default=3, help="Number of sessions to construct")
+    args = parser.parse_args()
+
+    timed("import backend modules", lambda: __import__("backend.question_generator") and
+          __import__("backend.audio_generator") and __import__("backend.structured_data") and
+          __import__("backend.chat"))
+    for idx in range(args.sessions):
+        timed(f"session {idx + 1}: construct objects", construct_session)
+
+    from backend.clients import get_bedrock_client, get_client
+    timed("first Bedrock client (shared)", get_bedrock_client)
+    timed("Bedrock client again", get_bedrock_client)
+    timed("first Polly client (shared)", lambda: get_client('polly'))
+
+
+if __name__ == "__main__":
+    main()
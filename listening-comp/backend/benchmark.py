@@ -0,0 +1,121 @@
+import sys
+import os
+import argparse
+import statistics
+import tempfile
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.clients import BEDROCK_REGION, register_client, reset_clients
+from backend.fakes import FakeBedrockClient, FakePollyClient
+from backend.audio_cache import AudioCache
+from backend.audio_generator import AudioGenerator
+from backend.question_generator import QuestionGenerator
+from backend.question_parser import parse_questions
+from backend.structured_data import TranscriptStructurer
+from backend.vector_store import QuestionVectorStore
+
+TRANSCRIPT_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data", "transcripts", "sY7L5cfCWno.txt")
+
+TOPICS = {
+    2: ["Daily Conversation", "Shopping", "Restaurant", "Travel", "School/Work"],
+    3: ["Announcements", "Instructions", "Weather Reports", "News Updates"],
+}
+
+
+class StageTimer:
+    """Collects per-operation latencies for one pipeline stage"""
+    def __init__(self, name: str):
+        self.name = name
+        self.latencies = []
+
+    def time(self, fn, *args, **kwargs):
+        start = time.perf_counter()
+        result = fn(*args, **kwargs)
+        self.latencies.append(time.perf_counter() - start)
+        return result
+
+    def report(self) -> str:
+        if not self.latencies:
+            return f"{self.name:<10} (no operations)"
+        latencies = sorted(self.latencies)
+        total = sum(latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return (
+            f"{self.name:<10} {len(latencies):>5} ops  "
+            f"mean {statistics.mean(latencies) * 1000:8.1f} ms  "
+            f"p50 {statistics.median(latencies) * 1000:8.1f} ms  "
+            f"p95 {p95 * 1000:8.1f} ms  "
+            f"{len(latencies) / total if total else float('inf'):8.1f} ops/s"
+        )
+
+
+def run(args) -> list:
+    """Drive transcript -> structure -> index -> generate -> audio against local stand-ins"""
+    bedrock = FakeBedrockClient(latency=args.llm_latency, embedding_latency=args.embedding_latency)
+    polly = FakePollyClient(latency=args.tts_latency)
+    reset_clients()
+    register_client('bedrock-runtime', bedrock, BEDROCK_REGION)
+    register_client('polly', polly)
+
+    with open(TRANSCRIPT_FILE, 'r', encoding='utf-8') as f:
+        transcript = f.read()
+
+    stages = {name: StageTimer(name) for name in ("structure", "index", "generate", "audio")}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        structurer = TranscriptStructurer(cache_dir=None)
+        vector_store = QuestionVectorStore(
+            os.path.join(tmp, "vectorstore"), corpus_file=os.path.join(tmp, "corpus.sqlite3")
+        )
+        generator = QuestionGenerator(explanation_cache_dir=None, vector_store=vector_store)
+        audio_generator = AudioGenerator(audio_cache=AudioCache(os.path.join(tmp, "audio_cache")))
+        audio_generator.audio_dir = os.path.join(tmp, "audio")
+        os.makedirs(audio_generator.audio_dir)
+
+        for video_idx in range(args.videos):
+            # Vary the transcript so every video is a distinct input
+            sections = stages["structure"].time(structurer.structure_transcript, f"{transcript}\n{video_idx}")
+            for section_num, content in sections.items():
+                stages["index"].time(
+                    vector_store.add_questions, section_num, parse_questions(content), f"video{video_idx}"
+                )
+
+        questions = []
+        for idx in range(args.questions):
+            section_num = 2 if idx % 2 == 0 else 3
+            topic = TOPICS[section_num][idx % len(TOPICS[section_num])]
+            question = stages["generate"].time(generator.generate_similar_question, section_num, topic)
+            if question:
+                questions.append(question)
+
+        for idx, question in enumerate(questions):
+            # Vary the text so synthesis is not served entirely from the clip cache
+            question = dict(question, Question=f"{question['Question']}（{idx}）")
+            stages["audio"].time(audio_generator.generate_audio, question)
+
+        print(f"\nAudio cache: {audio_generator.audio_cache.stats()}")
+        print(f"Conversation parsing: {audio_generator.parse_metrics()}")
+
+    reset_clients()
+    return list(stages.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end listening-comp pipeline benchmark with local stand-ins")
+    parser.add_argument("--videos", type=int, default=5, help="Transcripts to structure and index")
+    parser.add_argument("--questions", type=int, default=20, help="Questions to generate and voice")
+    parser.add_argument("--llm-latency", type=float, default=0.5, help="Simulated Bedrock converse latency (s)")
+    parser.add_argument("--embedding-latency", type=float, default=0.05, help="Simulated Titan embedding latency (s)")
+    parser.add_argument("--tts-latency", type=float, default=0.2, help="Simulated Polly latency (s)")
+    args = parser.parse_args()
+
+    stages = run(args)
+    print(f"\nLLM {args.llm_latency * 1000:.0f} ms, embeddings {args.embedding_latency * 1000:.0f} ms, "
+          f"TTS {args.tts_latency * 1000:.0f} ms simulated latency")
+    for stage in stages:
+        print(stage.report())
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,8 @@
 # Create BedrockChat
 # bedrock_chat.py
-import boto3
 import streamlit as st
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, Iterator
+from backend.clients import get_bedrock_client
 
 
 # Model ID
@@ -13,9 +13,13 @@ MODEL_ID = "amazon.nova-micro-v1:0"
 class BedrockChat:
     def __init__(self, model_id: str = MODEL_ID):
         """Initialize Bedrock chat client"""
-        self.bedrock_client = boto3.client('bedrock-runtime', region_name="us-east-1")
         self.model_id = model_id
 
+    @property
+    def bedrock_client(self):
+        """Shared Bedrock runtime client, created on first use"""
+        return get_bedrock_client()
+
     def generate_response(self, message: str, inference_config: Optional[Dict[str, Any]] = None) -> Optional[str]:
         """Generate a response using Amazon Bedrock"""
         if inference_config is None:
@@ -38,6 +42,29 @@ class BedrockChat:
             st.error(f"Error generating response: {str(e)}")
             return None
 
+    def generate_response_stream(self, message: str, inference_config: Optional[Dict[str, Any]] = None) -> Iterator[str]:
+        """Generate a response using Amazon Bedrock, yielding text as it is generated"""
+        if inference_config is None:
+            inference_config = {"temperature": 0.7}
+
+        messages = [{
+            "role": "user",
+            "content": [{"text": message}]
+        }]
+
+        try:
+            response = self.bedrock_client.converse_stream(
+                modelId=self.model_id,
+                messages=messages,
+                inferenceConfig=inference_config
+            )
+            for event in response['stream']:
+                if 'contentBlockDelta' in event:
+                    yield event['contentBlockDelta']['delta'].get('text', '')
+                    
+        except Exception as e:
+            st.error(f"Error generating response: {str(e)}")
+
 
 if __name__ == "__main__":
     chat = BedrockChat()
@@ -45,5 +72,7 @@ if __name__ == "__main__":
         user_input = input("You: ")
         if user_input.lower() == '/exit':
             break
-        response = chat.generate_response(user_input)
-        print("Bot:", response)
+        print("Bot: ", end="", flush=True)
+        for chunk in chat.generate_response_stream(user_input):
+            print(chunk, end="", flush=True)
+        print()
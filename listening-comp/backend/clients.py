@@ -0,0 +1,61 @@
+import threading
+from typing import Any, Dict, Optional, Tuple
+
+import boto3
+from botocore.config import Config
+
+# Region used for Bedrock across the backend
+BEDROCK_REGION = "us-east-1"
+
+# HTTP connections kept per client; boto3's default of 10 is too small once
+# structuring, TTS and question pools run requests concurrently
+MAX_POOL_CONNECTIONS = 50
+
+_clients: Dict[Tuple[str, Optional[str]], Any] = {}
+_session = None
+_lock = threading.Lock()
+
+
+def get_client(service_name: str, region_name: Optional[str] = None):
+    """
+    Return the shared boto3 client for a service and region, creating it on first use.
+    Clients are thread-safe and pool HTTP connections, so every module and
+    Streamlit session shares the same ones.
+    """
+    key = (service_name, region_name)
+    client = _clients.get(key)
+    if client is not None:
+        return client
+
+    global _session
+    with _lock:
+        if key not in _clients:
+            # boto3's default session is not thread-safe; create clients from one session under the lock
+            if _session is None:
+                _session = boto3.session.Session()
+            _clients[key] = _session.client(
+                service_name,
+                region_name=region_name,
+                config=Config(
+                    max_pool_connections=MAX_POOL_CONNECTIONS,
+                    retries={"max_attempts": 3, "mode": "adaptive"}
+                )
+            )
+        return _clients[key]
+
+
+def get_bedrock_client():
+    """Shared Bedrock runtime client"""
+    return get_client('bedrock-runtime', BEDROCK_REGION)
+
+
+def register_client(service_name: str, client: Any, region_name: Optional[str] = None):
+    """Install a client for a service, e.g. a local stand-in for offline runs"""
+    with _lock:
+        _clients[(service_name, region_name)] = client
+
+
+def reset_clients():
+    """Drop all shared clients so the next call creates fresh ones"""
+    with _lock:
+        _clients.clear()
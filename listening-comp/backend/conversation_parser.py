@@ -0,0 +1,90 @@
+import re
+from typing import Dict, List, Optional, Tuple
+
+# Fixed announcer lines; identical across questions so their audio is always cached
+INTRO_PHRASE = "次の会話を聞いて、質問に答えてください。"
+QUESTION_PREFIX = "質問："
+
+# A speaker label such as 男性: / 女の人： / 店員: at the start of the text, after whitespace
+# or right after a sentence end (男性：...です。女性：...)
+# (digit-only labels are skipped so times like 10:30 are not mistaken for speakers)
+SPEAKER_LABEL = re.compile(r'(?:^|(?<=[\s。！？!?」]))(?![0-9０-９]+\s*[:：])([^\s:：、。！？!?「」()（）]{1,8})\s*[:：]\s*')
+
+# The standard announcer sentence in an Introduction ("次の会話を聞いて、質問に答えてください。"),
+# already read as INTRO_PHRASE
+STANDARD_INTRO = re.compile(r'[^。！？!?]*次の会話[^。！？!?]*[。！？!?]?')
+
+MALE_MARKERS = ('男', 'male', 'man', 'boy')
+FEMALE_MARKERS = ('女', 'female', 'woman', 'girl')
+
+
+def speaker_gender(label: str) -> Optional[str]:
+    """Gender implied by a speaker label (男/女 markers), or None if it has none"""
+    lowered = label.lower()
+    # Check female first: 'female'/'woman' contain 'male'/'man'
+    if any(marker in lowered for marker in FEMALE_MARKERS):
+        return 'female'
+    if any(marker in lowered for marker in MALE_MARKERS):
+        return 'male'
+    return None
+
+
+def split_conversation(conversation: str) -> Optional[List[Tuple[str, str]]]:
+    """
+    Split speaker-prefixed dialogue into (speaker, text) turns.
+    Returns None when the conversation has no speaker labels to split on.
+    """
+    matches = list(SPEAKER_LABEL.finditer(conversation))
+    if not matches or conversation[:matches[0].start()].strip():
+        return None
+
+    turns = []
+    for idx, match in enumerate(matches):
+        end = matches[idx + 1].start() if idx + 1 < len(matches) else len(conversation)
+        text = conversation[match.end():end].strip()
+        if not text:
+            return None
+        turns.append((match.group(1), text))
+    return turns
+
+
+def parse_conversation_local(question: Dict) -> Optional[List[Tuple[str, str, str]]]:
+    """
+    Convert a question into (speaker, text, gender) parts without an LLM.
+    Handles dialogue questions whose conversation uses speaker prefixes
+    (男性: / 女の人： ...) and situation questions; returns None otherwise.
+    """
+    parts = [('Announcer', INTRO_PHRASE, 'male')]
+
+    if 'Conversation' in question:
+        turns = split_conversation(question.get('Conversation', ''))
+        if not turns:
+            return None
+
+        # Keep any scene-setting text, but not the standard announcer line again
+        introduction = STANDARD_INTRO.sub('', question.get('Introduction') or '').strip()
+        if introduction:
+            parts.append(('Announcer', introduction, 'male'))
+
+        genders = {label: speaker_gender(label) for label, _ in turns}
+        counts = {'male': 0, 'female': 0}
+        for gender in genders.values():
+            if gender:
+                counts[gender] += 1
+        for label, gender in genders.items():
+            if gender is None:
+                # Unmarked speakers (店員, 先生, A...) take the voice used least so far, in order
+                gender = 'female' if counts['female'] < counts['male'] else 'male'
+                genders[label] = gender
+                counts[gender] += 1
+
+        parts.extend((label, text, genders[label]) for label, text in turns)
+    elif question.get('Situation'):
+        parts.append(('Announcer', question['Situation'].strip(), 'male'))
+    else:
+        return None
+
+    if not question.get('Question'):
+        return None
+    parts.append(('Announcer', f"{QUESTION_PREFIX}{question['Question'].strip()}", 'male'))
+    return parts
@@ -0,0 +1,211 @@
+import hashlib
+import io
+import json
+import time
+from typing import Callable, Dict, Iterator, List, Optional
+
+from backend.audio_assembly import silent_mp3
+
+# Canned model output in the format QuestionGenerator asks for
+SAMPLE_QUESTION_RESPONSE = """Introduction:
+駅で男の人と女の人が話しています。男の人は何時の電車に乗りますか。
+
+Conversation:
+男性: すみません、大阪行きの電車は何時に出ますか。
+女性: 次は10時15分です。その後は10時45分ですね。
+男性: 10時15分のは混んでいますか。
+女性: はい、とても混んでいますよ。
+男性: じゃあ、次のにします。
+
+Question:
+男の人は何時の電車に乗りますか。
+
+Options:
+1. 10時
+2. 10時15分
+3. 10時30分
+4. 10時45分
+
+Answer: 4
+"""
+
+
+SAMPLE_SITUATION_RESPONSE = """Situation:
+友達の家で晩ご飯を食べました。帰るときに何と言いますか。
+
+Question:
+何と言いますか
+
+Options:
+1. いただきます。
+2. ごちそうさまでした。
+3. おかえりなさい。
+4. いってきます。
+
+Answer: 2
+"""
+
+SAMPLE_SECTION_RESPONSES = {
+    2: """<question>
+Introduction:
+男の人と女の人が話しています。女の人の誕生日はいつですか。
+
+Conversation:
+きれいな花ですね。ええ、誕生日に友達にもらいました。いつですか。昨日です。
+
+Question:
+女の人の誕生日はいつですか。
+</question>
+
+<question>
+Introduction:
+大学で男の学生と女の学生が話しています。二人はどこで食べますか。
+
+Conversation:
+お昼一緒に食べませんか。いいですよ。今日は天気がいいから外で食べたいです。じゃあ公園へ行きましょう。
+
+Question:
+二人はどこで食べますか。
+</question>
+""",
+    3: """<question>
+Situation:
+寝ます。家族に何と言いますか。
+
+Question:
+何と言いますか
+</question>
+
+<question>
+Situation:
+学校へ出かけます。家族に何と言いますか。
+
+Question:
+何と言いますか
+</question>
+""",
+}
+
+SAMPLE_AUDIO_SCRIPT_RESPONSE = """Speaker: Announcer (Gender: male)
+Text: 次の会話を聞いて、質問に答えてください。
+---
+Speaker: Student (Gender: female)
+Text: すみません、この電車は新宿駅に止まりますか。
+---
+Speaker: Staff (Gender: male)
+Text: はい、次の駅です。
+---
+Speaker: Announcer (Gender: male)
+Text: 質問：電車は新宿駅に止まりますか。
+---
+"""
+
+
+def default_responder(prompt: str) -> str:
+    """Deterministic model output for each kind of prompt the backend sends"""
+    if "Extract" in prompt and "問題2" in prompt:
+        return SAMPLE_SECTION_RESPONSES[2]
+    if "Extract" in prompt and "問題3" in prompt:
+        return SAMPLE_SECTION_RESPONSES[3]
+    if "Reply with ONLY the number" in prompt:
+        return "2"
+    if "audio script generator" in prompt:
+        return SAMPLE_AUDIO_SCRIPT_RESPONSE
+    if "explain briefly why" in prompt:
+        return "The speaker says this directly in the conversation."
+    if "create a new question" in prompt and "Situation:" in prompt:
+        return SAMPLE_SITUATION_RESPONSE
+    return SAMPLE_QUESTION_RESPONSE
+
+
+class FakeBedrockClient:
+    """
+    Local stand-in for the bedrock-runtime client.
+    Returns deterministic text from a responder (prompt -> text) after a
+    configurable latency; converse_stream splits the same text into chunks.
+    invoke_model returns Titan-shaped embeddings derived from the input text.
+    Install it with backend.clients.register_client for offline runs.
+    """
+    def __init__(
+        self,
+        responder: Optional[Callable[[str], str]] = None,
+        latency: float = 0.0,
+        chunk_size: int = 8,
+        chunk_delay: float = 0.0,
+        embedding_latency: float = 0.0,
+        embedding_dimensions: int = 1536
+    ):
+        self.responder = responder or default_responder
+        self.latency = latency
+        self.chunk_size = chunk_size
+        self.chunk_delay = chunk_delay
+        self.embedding_latency = embedding_latency
+        self.embedding_dimensions = embedding_dimensions
+        self.calls = 0
+
+    def _prompt(self, messages) -> str:
+        return "\n".join(
+            block.get('text', '')
+            for message in messages
+            for block in message['content']
+        )
+
+    def converse(self, modelId: str, messages, inferenceConfig: Dict = None, **kwargs) -> Dict:
+        """Same response shape as bedrock-runtime converse"""
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        text = self.responder(self._prompt(messages))
+        return {'output': {'message': {'role': 'assistant', 'content': [{'text': text}]}}}
+
+    def converse_stream(self, modelId: str, messages, inferenceConfig: Dict = None, **kwargs) -> Dict:
+        """Same response shape as bedrock-runtime converse_stream"""
+        self.calls += 1
+        text = self.responder(self._prompt(messages))
+        return {'stream': self._events(text)}
+
+    def _events(self, text: str) -> Iterator[Dict]:
+        # Time to first token is the configured latency; later chunks follow chunk_delay
+        if self.latency:
+            time.sleep(self.latency)
+        yield {'messageStart': {'role': 'assistant'}}
+        for start in range(0, len(text), self.chunk_size):
+            if start and self.chunk_delay:
+                time.sleep(self.chunk_delay)
+            yield {'contentBlockDelta': {'contentBlockIndex': 0, 'delta': {'text': text[start:start + self.chunk_size]}}}
+        yield {'contentBlockStop': {'contentBlockIndex': 0}}
+        yield {'messageStop': {'stopReason': 'end_turn'}}
+
+    def _embedding(self, text: str) -> List[float]:
+        digest = hashlib.sha256(text.encode('utf-8')).digest()
+        return [digest[idx % len(digest)] / 255.0 for idx in range(self.embedding_dimensions)]
+
+    def invoke_model(self, modelId: str, body: str, **kwargs) -> Dict:
+        """Same response shape as a Titan embeddings invoke_model call"""
+        self.calls += 1
+        if self.embedding_latency:
+            time.sleep(self.embedding_latency)
+        text = json.loads(body)['inputText']
+        payload = json.dumps({'embedding': self._embedding(text), 'inputTextTokenCount': len(text)})
+        return {'body': io.BytesIO(payload.encode('utf-8'))}
+
+
+class FakePollyClient:
+    """
+    Local stand-in for the Polly client.
+    synthesize_speech sleeps for a configurable latency and returns silent
+    24 kHz MP3 roughly as long as the text would take to speak.
+    """
+    def __init__(self, latency: float = 0.0, ms_per_char: int = 125):
+        self.latency = latency
+        self.ms_per_char = ms_per_char
+        self.calls = 0
+
+    def synthesize_speech(self, Text: str, OutputFormat: str = 'mp3', VoiceId: str = None, **kwargs) -> Dict:
+        self.calls += 1
+        if self.latency:
+            time.sleep(self.latency)
+        return {
+            'AudioStream': io.BytesIO(silent_mp3(len(Text) * self.ms_per_char)),
+            'ContentType': 'audio/mpeg'
+        }
@@ -1,18 +1,71 @@
 from youtube_transcript_api import YouTubeTranscriptApi
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterable, Iterator, Tuple, Callable
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import json
+import os
+import time
+
+# Plain-text transcripts consumed by the structuring stage
+TRANSCRIPTS_DIR = "backend/data/transcripts"
+
+# Raw transcript JSON (with timings) keyed by video id + language
+RAW_CACHE_DIR = "backend/data/cache/transcripts"
+
+DEFAULT_VIDEO_URL = "https://www.youtube.com/watch?v=sY7L5cfCWno&list=PLkGU7DnOLgRMl-h4NxxrGbK-UdZHIXzKQ"
+
+
+class LocalTranscriptFetcher:
+    """
+    Offline stand-in for YouTubeTranscriptApi.get_transcript.
+    Serves transcripts from a directory of <video_id>.json (raw entries)
+    or <video_id>.txt (one line per entry) files.
+    """
+    def __init__(self, directory: str, latency: float = 0.0):
+        self.directory = directory
+        self.latency = latency
+
+    def __call__(self, video_id: str, languages: List[str] = None) -> List[Dict]:
+        if self.latency:
+            time.sleep(self.latency)
+
+        json_path = os.path.join(self.directory, f"{video_id}.json")
+        if os.path.exists(json_path):
+            with open(json_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+
+        txt_path = os.path.join(self.directory, f"{video_id}.txt")
+        if os.path.exists(txt_path):
+            with open(txt_path, 'r', encoding='utf-8') as f:
+                lines = [line.rstrip('\n') for line in f if line.strip()]
+            return [
+                {"text": line, "start": float(idx), "duration": 1.0}
+                for idx, line in enumerate(lines)
+            ]
+
+        raise FileNotFoundError(f"No local transcript for {video_id}")
 
 
 class YouTubeTranscriptDownloader:
-    def __init__(self, languages: List[str] = ["ja", "en"]):
+    def __init__(
+        self,
+        languages: List[str] = ["ja", "en"],
+        output_dir: str = TRANSCRIPTS_DIR,
+        cache_dir: Optional[str] = RAW_CACHE_DIR,
+        fetcher: Optional[Callable[..., List[Dict]]] = None
+    ):
         self.languages = languages
+        self.output_dir = output_dir
+        self.cache_dir = cache_dir
+        self.fetcher = fetcher or YouTubeTranscriptApi.get_transcript
 
     def extract_video_id(self, url: str) -> Optional[str]:
         """
         Extract video ID from YouTube URL
-        
+
         Args:
             url (str): YouTube URL
-            
+
         Returns:
             Optional[str]: Video ID if found, None otherwise
         """
@@ -22,46 +75,108 @@ class YouTubeTranscriptDownloader:
             return url.split("youtu.be/")[1][:11]
         return None
 
+    def normalize_video_id(self, video_id: str) -> Optional[str]:
+        """
+        Accept either a video ID or a YouTube URL
+
+        Args:
+            video_id (str): YouTube video ID or URL
+
+        Returns:
+            Optional[str]: Video ID if valid, None otherwise
+        """
+        if "youtube.com" in video_id or "youtu.be" in video_id:
+            return self.extract_video_id(video_id)
+        return video_id.strip() or None
+
+    def _cache_path(self, video_id: str) -> Optional[str]:
+        """Raw transcript cache file for a video id + language preference"""
+        if not self.cache_dir:
+            return None
+        return os.path.join(self.cache_dir, f"{video_id}_{'-'.join(self.languages)}.json")
+
+    def load_cached_transcript(self, video_id: str) -> Optional[List[Dict]]:
+        """
+        Load a previously downloaded raw transcript
+
+        Args:
+            video_id (str): YouTube video ID
+
+        Returns:
+            Optional[List[Dict]]: Cached transcript if present, None otherwise
+        """
+        cache_path = self._cache_path(video_id)
+        if not cache_path or not os.path.exists(cache_path):
+            return None
+        try:
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except Exception as e:
+            print(f"Error reading cached transcript {cache_path}: {str(e)}")
+            return None
+
+    def cache_transcript(self, video_id: str, transcript: List[Dict]) -> None:
+        """Write a raw transcript (with timings) to the cache"""
+        cache_path = self._cache_path(video_id)
+        if not cache_path:
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            # Write to a temp file first so an interrupted run never leaves a partial entry
+            tmp_path = f"{cache_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(transcript, f, ensure_ascii=False)
+            os.replace(tmp_path, cache_path)
+        except Exception as e:
+            print(f"Error caching transcript {cache_path}: {str(e)}")
+
     def get_transcript(self, video_id: str) -> Optional[List[Dict]]:
         """
         Download YouTube Transcript
-        
+
         Args:
             video_id (str): YouTube video ID or URL
-            
+
         Returns:
             Optional[List[Dict]]: Transcript if successful, None otherwise
         """
         # Extract video ID if full URL is provided
-        if "youtube.com" in video_id or "youtu.be" in video_id:
-            video_id = self.extract_video_id(video_id)
-            
+        video_id = self.normalize_video_id(video_id)
+
         if not video_id:
             print("Invalid video ID or URL")
             return None
 
+        cached = self.load_cached_transcript(video_id)
+        if cached is not None:
+            return cached
+
         print(f"Downloading transcript for video ID: {video_id}")
-        
+
         try:
-            return YouTubeTranscriptApi.get_transcript(video_id, languages=self.languages)
+            transcript = self.fetcher(video_id, languages=self.languages)
         except Exception as e:
             print(f"An error occurred: {str(e)}")
             return None
 
+        self.cache_transcript(video_id, transcript)
+        return transcript
+
     def save_transcript(self, transcript: List[Dict], filename: str) -> bool:
         """
         Save transcript to file
-        
+
         Args:
             transcript (List[Dict]): Transcript data
             filename (str): Output filename
-            
+
         Returns:
             bool: True if successful, False otherwise
         """
-        filename = f"./transcripts/{filename}.txt"
-        
+        filename = os.path.join(self.output_dir, f"{filename}.txt")
+
         try:
+            os.makedirs(self.output_dir, exist_ok=True)
             with open(filename, 'w', encoding='utf-8') as f:
                 for entry in transcript:
                     f.write(f"{entry['text']}\n")
@@ -70,16 +185,83 @@ class YouTubeTranscriptDownloader:
             print(f"Error saving transcript: {str(e)}")
             return False
 
+    def download_batch(self, video_ids: Iterable[str], max_workers: int = 4) -> Iterator[Tuple[str, Optional[List[Dict]]]]:
+        """
+        Download many transcripts with a bounded worker pool.
+        Already-cached videos are served from disk, so an interrupted run resumes
+        where it stopped. Yields (video_id, transcript) as each download completes.
+
+        Args:
+            video_ids (Iterable[str]): YouTube video IDs or URLs
+            max_workers (int): Maximum concurrent downloads
+
+        Yields:
+            Tuple[str, Optional[List[Dict]]]: Video ID and transcript (None on failure)
+        """
+        normalized = []
+        for video_id in video_ids:
+            video_id = self.normalize_video_id(video_id)
+            if video_id and video_id not in normalized:
+                normalized.append(video_id)
+
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {executor.submit(self.get_transcript, video_id): video_id for video_id in normalized}
+            for future in as_completed(futures):
+                video_id = futures[future]
+                transcript = future.result()
+                if transcript and not os.path.exists(os.path.join(self.output_dir, f"{video_id}.txt")):
+                    self.save_transcript(transcript, video_id)
+                yield video_id, transcript
+
+
+def read_video_ids(filename: str) -> List[str]:
+    """Read video IDs or URLs from a file, one per line ('#' starts a comment)"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        return [
+            line.split('#')[0].strip()
+            for line in f
+            if line.split('#')[0].strip()
+        ]
+
+
+def download_and_structure(downloader: YouTubeTranscriptDownloader, video_ids: Iterable[str],
+                           questions_dir: str, max_workers: int = 4) -> Dict[str, bool]:
+    """
+    Stream downloaded transcripts straight into the structuring pipeline,
+    structuring each video as soon as its transcript is available.
+    """
+    from backend.structured_data import TranscriptStructurer
+
+    structurer = TranscriptStructurer()
+    results = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {}
+        for video_id, transcript in downloader.download_batch(video_ids, max_workers=max_workers):
+            if not transcript:
+                results[video_id] = False
+                continue
+            transcript_file = os.path.join(downloader.output_dir, f"{video_id}.txt")
+            futures[executor.submit(structurer.structure_file, transcript_file, questions_dir)] = video_id
+
+        for future in as_completed(futures):
+            video_id = futures[future]
+            try:
+                results[video_id] = future.result()
+            except Exception as e:
+                print(f"Error structuring {video_id}: {str(e)}")
+                results[video_id] = False
+    return results
+
+
 def main(video_url, print_transcript=False):
     # Initialize downloader
     downloader = YouTubeTranscriptDownloader()
-    
+
     # Get transcript
     transcript = downloader.get_transcript(video_url)
-    downloader.save_transcript(transcript, video_url)
     if transcript:
         # Save transcript
-        video_id = downloader.extract_video_id(video_url)
+        video_id = downloader.normalize_video_id(video_url)
         if downloader.save_transcript(transcript, video_id):
             print(f"Transcript saved successfully to {video_id}.txt")
             #Print transcript if True
@@ -89,10 +271,39 @@ def main(video_url, print_transcript=False):
                     print(f"{entry['text']}")
         else:
             print("Failed to save transcript")
-        
+
     else:
         print("Failed to get transcript")
 
+def batch_main():
+    parser = argparse.ArgumentParser(description="Download YouTube transcripts")
+    parser.add_argument("videos", nargs="*", help="Video IDs or URLs")
+    parser.add_argument("--file", help="File with one video ID or URL per line")
+    parser.add_argument("--workers", type=int, default=4, help="Maximum concurrent downloads")
+    parser.add_argument("--out", default=TRANSCRIPTS_DIR, help="Directory for plain-text transcripts")
+    parser.add_argument("--local", help="Serve transcripts from this directory instead of YouTube")
+    parser.add_argument("--structure", metavar="QUESTIONS_DIR",
+                        help="Structure each transcript into question files as soon as it downloads")
+    args = parser.parse_args()
+
+    video_ids = list(args.videos)
+    if args.file:
+        video_ids.extend(read_video_ids(args.file))
+    if not video_ids:
+        main(DEFAULT_VIDEO_URL, print_transcript=True)
+        return
+
+    fetcher = LocalTranscriptFetcher(args.local) if args.local else None
+    downloader = YouTubeTranscriptDownloader(output_dir=args.out, fetcher=fetcher)
+
+    if args.structure:
+        results = download_and_structure(downloader, video_ids, args.structure, max_workers=args.workers)
+    else:
+        results = {
+            video_id: transcript is not None
+            for video_id, transcript in downloader.download_batch(video_ids, max_workers=args.workers)
+        }
+    print(f"Processed {sum(results.values())}/{len(results)} videos")
+
 if __name__ == "__main__":
-    video_id = "https://www.youtube.com/watch?v=sY7L5cfCWno&list=PLkGU7DnOLgRMl-h4NxxrGbK-UdZHIXzKQ"  # Extract from URL: XXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXXX
-    transcript = main(video_id, print_transcript=True)
\ No newline at end of file
+    batch_main()
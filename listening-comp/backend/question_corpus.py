@@ -0,0 +1,88 @@
+import os
+import sqlite3
+import threading
+from typing import Dict, List
+
+from backend.question_store import DATA_DIR
+
+# App data, kept apart from the vector store's directory so rebuilding the index leaves it intact
+CORPUS_FILE = os.path.join(DATA_DIR, "corpus.sqlite3")
+
+# Question fields stored as columns (options get one column each)
+TEXT_COLUMNS = ('Introduction', 'Conversation', 'Situation', 'Question')
+OPTION_COLUMNS = ('option_1', 'option_2', 'option_3', 'option_4')
+
+
+class QuestionCorpus:
+    """
+    Structured store of indexed source questions, keyed by question id.
+    The vector store keeps only ids and search hits are hydrated from here,
+    so no per-hit JSON decoding is needed.
+    """
+    def __init__(self, db_file: str = CORPUS_FILE):
+        os.makedirs(os.path.dirname(db_file) or ".", exist_ok=True)
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self._lock = threading.Lock()
+        with self._lock, self.conn:
+            self.conn.execute("""
+                CREATE TABLE IF NOT EXISTS corpus_questions (
+                    id TEXT PRIMARY KEY,
+                    video_id TEXT NOT NULL,
+                    section INTEGER NOT NULL,
+                    question_index INTEGER NOT NULL,
+                    introduction TEXT,
+                    conversation TEXT,
+                    situation TEXT,
+                    question TEXT,
+                    option_1 TEXT,
+                    option_2 TEXT,
+                    option_3 TEXT,
+                    option_4 TEXT,
+                    correct_answer INTEGER
+                )
+            """)
+
+    def add_questions(self, section_num: int, questions: List[Dict], video_id: str) -> List[str]:
+        """Insert or replace questions and return their ids"""
+        rows = []
+        for idx, question in enumerate(questions):
+            options = list(question.get('Options', []))[:4]
+            options += [None] * (4 - len(options))
+            rows.append((
+                f"{video_id}_{section_num}_{idx}", video_id, section_num, idx,
+                *(question.get(column) for column in TEXT_COLUMNS),
+                *options,
+                question.get('CorrectAnswer')
+            ))
+        with self._lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO corpus_questions VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                rows
+            )
+        return [row[0] for row in rows]
+
+    @staticmethod
+    def _hydrate(row) -> Dict:
+        question = {
+            column: value
+            for column, value in zip(TEXT_COLUMNS, row[4:8])
+            if value is not None
+        }
+        options = [option for option in row[8:12] if option is not None]
+        if options:
+            question['Options'] = options
+        if row[12] is not None:
+            question['CorrectAnswer'] = row[12]
+        return question
+
+    def get_questions(self, question_ids: List[str]) -> Dict[str, Dict]:
+        """Load questions by id; ids that are not stored are left out"""
+        if not question_ids:
+            return {}
+        placeholders = ", ".join("?" for _ in question_ids)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT * FROM corpus_questions WHERE id IN ({placeholders})",
+                list(question_ids)
+            ).fetchall()
+        return {row[0]: self._hydrate(row) for row in rows}
@@ -1,16 +1,36 @@
-import boto3
+import hashlib
 import json
-from typing import Dict, List, Optional
+import os
+import re
+from typing import Dict, Iterator, List, Optional
+from backend.clients import get_bedrock_client
+from backend.question_parser import StreamingQuestionParser
 from backend.vector_store import QuestionVectorStore
 
+# Explanations are cached per (question hash, selected option)
+EXPLANATION_CACHE_DIR = "backend/data/cache/explanations"
+
+# Fields that make up a question's content (for hashing)
+QUESTION_FIELDS = ('Introduction', 'Conversation', 'Situation', 'Question', 'Options')
+
+def question_hash(question: Dict) -> str:
+    """Stable hash of a question's content"""
+    content = {key: question[key] for key in QUESTION_FIELDS if key in question}
+    return hashlib.sha256(json.dumps(content, ensure_ascii=False, sort_keys=True).encode('utf-8')).hexdigest()
+
 class QuestionGenerator:
-    def __init__(self):
-        """Initialize Bedrock client and vector store"""
-        self.bedrock_client = boto3.client('bedrock-runtime', region_name="us-east-1")
-        self.vector_store = QuestionVectorStore()
+    def __init__(self, explanation_cache_dir: Optional[str] = EXPLANATION_CACHE_DIR, vector_store: QuestionVectorStore = None):
+        """Initialize vector store (the Bedrock client is shared and created on first use)"""
+        self.vector_store = vector_store or QuestionVectorStore()
         self.model_id = "amazon.nova-lite-v1:0"
+        self.explanation_cache_dir = explanation_cache_dir
 
-    def _invoke_bedrock(self, prompt: str) -> Optional[str]:
+    @property
+    def bedrock_client(self):
+        """Shared Bedrock runtime client, created on first use"""
+        return get_bedrock_client()
+
+    def _invoke_bedrock(self, prompt: str, temperature: float = 0.7) -> Optional[str]:
         """Invoke Bedrock with the given prompt"""
         try:
             messages = [{
@@ -23,7 +43,7 @@ class QuestionGenerator:
             response = self.bedrock_client.converse(
                 modelId=self.model_id,
                 messages=messages,
-                inferenceConfig={"temperature": 0.7}
+                inferenceConfig={"temperature": temperature}
             )
             
             return response['output']['message']['content'][0]['text']
@@ -31,8 +51,30 @@ class QuestionGenerator:
             print(f"Error invoking Bedrock: {str(e)}")
             return None
 
-    def generate_similar_question(self, section_num: int, topic: str) -> Dict:
-        """Generate a new question similar to existing ones on a given topic"""
+    def _invoke_bedrock_stream(self, prompt: str) -> Iterator[str]:
+        """Invoke Bedrock with the given prompt, yielding text as it is generated"""
+        try:
+            messages = [{
+                "role": "user",
+                "content": [{
+                    "text": prompt
+                }]
+            }]
+            
+            response = self.bedrock_client.converse_stream(
+                modelId=self.model_id,
+                messages=messages,
+                inferenceConfig={"temperature": 0.7}
+            )
+            
+            for event in response['stream']:
+                if 'contentBlockDelta' in event:
+                    yield event['contentBlockDelta']['delta'].get('text', '')
+        except Exception as e:
+            print(f"Error invoking Bedrock: {str(e)}")
+
+    def _generation_prompt(self, section_num: int, topic: str) -> Optional[str]:
+        """Build the prompt for a new question from similar stored questions"""
         # Get similar questions for context
         similar_questions = self.vector_store.search_similar_questions(section_num, topic, n_results=3)
         
@@ -70,10 +112,39 @@ class QuestionGenerator:
         
         Generate a new question following the exact same format as above. Include all components (Introduction/Situation, 
         Conversation/Question, and Options). Make sure the question is challenging but fair, and the options are plausible 
-        but with only one clearly correct answer. Return ONLY the question without any additional text.
+        but with only one clearly correct answer. After the options, add a line "Answer: N" where N is the number (1-4)
+        of the correct option. Return ONLY the question without any additional text.
         
         New Question:
         """
+        return prompt
+
+    def _finalize_question(self, question: Dict) -> Dict:
+        """Fill in defaults and the correct answer for a parsed question"""
+        # Ensure we have exactly 4 options
+        if 'Options' not in question or len(question.get('Options', [])) != 4:
+            # Use default options if we don't have exactly 4
+            question['Options'] = [
+                "ピザを食べる",
+                "ハンバーガーを食べる",
+                "サラダを食べる",
+                "パスタを食べる"
+            ]
+            question.pop('CorrectAnswer', None)
+        
+        # Determine the correct answer once, so grading is a local comparison
+        if 'CorrectAnswer' not in question:
+            correct_answer = self.determine_correct_answer(question)
+            if correct_answer:
+                question['CorrectAnswer'] = correct_answer
+        
+        return question
+
+    def generate_similar_question(self, section_num: int, topic: str) -> Dict:
+        """Generate a new question similar to existing ones on a given topic"""
+        prompt = self._generation_prompt(section_num, topic)
+        if not prompt:
+            return None
 
         # Generate new question
         response = self._invoke_bedrock(prompt)
@@ -82,77 +153,42 @@ class QuestionGenerator:
 
         # Parse the generated question
         try:
-            lines = response.strip().split('\n')
-            question = {}
-            current_key = None
-            current_value = []
-            
-            for line in lines:
-                line = line.strip()
-                if not line:
-                    continue
-                    
-                if line.startswith("Introduction:"):
-                    if current_key:
-                        question[current_key] = ' '.join(current_value)
-                    current_key = 'Introduction'
-                    current_value = [line.replace("Introduction:", "").strip()]
-                elif line.startswith("Conversation:"):
-                    if current_key:
-                        question[current_key] = ' '.join(current_value)
-                    current_key = 'Conversation'
-                    current_value = [line.replace("Conversation:", "").strip()]
-                elif line.startswith("Situation:"):
-                    if current_key:
-                        question[current_key] = ' '.join(current_value)
-                    current_key = 'Situation'
-                    current_value = [line.replace("Situation:", "").strip()]
-                elif line.startswith("Question:"):
-                    if current_key:
-                        question[current_key] = ' '.join(current_value)
-                    current_key = 'Question'
-                    current_value = [line.replace("Question:", "").strip()]
-                elif line.startswith("Options:"):
-                    if current_key:
-                        question[current_key] = ' '.join(current_value)
-                    current_key = 'Options'
-                    current_value = []
-                elif line[0].isdigit() and line[1] == "." and current_key == 'Options':
-                    current_value.append(line[2:].strip())
-                elif current_key:
-                    current_value.append(line)
-            
-            if current_key:
-                if current_key == 'Options':
-                    question[current_key] = current_value
-                else:
-                    question[current_key] = ' '.join(current_value)
-            
-            # Ensure we have exactly 4 options
-            if 'Options' not in question or len(question.get('Options', [])) != 4:
-                # Use default options if we don't have exactly 4
-                question['Options'] = [
-                    "ピザを食べる",
-                    "ハンバーガーを食べる",
-                    "サラダを食べる",
-                    "パスタを食べる"
-                ]
-            
-            return question
+            parser = StreamingQuestionParser()
+            parser.feed(response)
+            return self._finalize_question(parser.close())
         except Exception as e:
             print(f"Error parsing generated question: {str(e)}")
             return None
 
-    def get_feedback(self, question: Dict, selected_answer: int) -> Dict:
-        """Generate feedback for the selected answer"""
-        if not question or 'Options' not in question:
-            return None
-
-        # Create prompt for generating feedback
-        prompt = f"""Given this JLPT listening question and the selected answer, provide feedback explaining if it's correct 
-        and why. Keep the explanation clear and concise.
-        
+    def generate_similar_question_stream(self, section_num: int, topic: str) -> Iterator[Optional[Dict]]:
         """
+        Stream a new question as it is generated.
+        Yields the partially parsed question after each chunk; the last item
+        yielded is the finished question, or None if generation failed.
+        """
+        prompt = self._generation_prompt(section_num, topic)
+        if not prompt:
+            yield None
+            return
+
+        parser = StreamingQuestionParser()
+        received = False
+        for chunk in self._invoke_bedrock_stream(prompt):
+            received = True
+            yield parser.feed(chunk)
+        if not received:
+            yield None
+            return
+
+        try:
+            yield self._finalize_question(parser.close())
+        except Exception as e:
+            print(f"Error parsing generated question: {str(e)}")
+            yield None
+
+    def _question_prompt(self, question: Dict) -> str:
+        """Render a question's content for a prompt"""
+        prompt = ""
         if 'Introduction' in question:
             prompt += f"Introduction: {question['Introduction']}\n"
             prompt += f"Conversation: {question['Conversation']}\n"
@@ -163,26 +199,83 @@ class QuestionGenerator:
         prompt += "Options:\n"
         for i, opt in enumerate(question['Options'], 1):
             prompt += f"{i}. {opt}\n"
+        return prompt
+
+    def determine_correct_answer(self, question: Dict) -> Optional[int]:
+        """Ask the LLM for the number of the correct option (1-4)"""
+        if not question or 'Options' not in question:
+            return None
+
+        prompt = "Given this JLPT listening question, which option is correct?\n\n"
+        prompt += self._question_prompt(question)
+        prompt += "\nReply with ONLY the number of the correct option (1-4)."
+
+        # Deterministic, so the answer does not change between calls
+        response = self._invoke_bedrock(prompt, temperature=0)
+        if not response:
+            return None
+        answer = re.search(r'[1-4]', response)
+        return int(answer.group()) if answer else None
+
+    def get_feedback(self, question: Dict, selected_answer: int) -> Optional[Dict]:
+        """
+        Grade the selected answer against the question's stored correct answer.
+        Questions saved before answers were stored get theirs determined and
+        set on the question; callers save it (QuestionStore.update_correct_answer)
+        so it is determined once. The explanation is left empty; call
+        get_explanation when it is wanted.
+        """
+        if not question or 'Options' not in question:
+            return None
+
+        if 'CorrectAnswer' not in question:
+            correct_answer = self.determine_correct_answer(question)
+            if not correct_answer:
+                return None
+            question['CorrectAnswer'] = correct_answer
+
+        return {
+            "correct": selected_answer == question['CorrectAnswer'],
+            "correct_answer": question['CorrectAnswer'],
+            "explanation": None
+        }
+
+    def _explanation_cache_path(self, question: Dict, selected_answer: int) -> Optional[str]:
+        if not self.explanation_cache_dir:
+            return None
+        return os.path.join(self.explanation_cache_dir, f"{question_hash(question)}_{selected_answer}.txt")
+
+    def get_explanation(self, question: Dict, selected_answer: int) -> Optional[str]:
+        """Explain why the selected answer is correct or incorrect (cached per question and option)"""
+        feedback = self.get_feedback(question, selected_answer)
+        if not feedback:
+            return None
+
+        cache_path = self._explanation_cache_path(question, selected_answer)
+        if cache_path and os.path.exists(cache_path):
+            with open(cache_path, 'r', encoding='utf-8') as f:
+                return f.read()
+
+        # Create prompt for generating the explanation
+        prompt = """Given this JLPT listening question and the selected answer, explain briefly why the selected 
+        answer is correct or incorrect. Keep the explanation clear and concise.
         
+        """
+        prompt += self._question_prompt(question)
         prompt += f"\nSelected Answer: {selected_answer}\n"
-        prompt += "\nProvide feedback in JSON format with these fields:\n"
-        prompt += "- correct: true/false\n"
-        prompt += "- explanation: brief explanation of why the answer is correct/incorrect\n"
-        prompt += "- correct_answer: the number of the correct option (1-4)\n"
+        prompt += f"Correct Answer: {feedback['correct_answer']}\n"
+        prompt += "\nReturn ONLY the explanation."
 
-        # Get feedback
-        response = self._invoke_bedrock(prompt)
-        if not response:
+        explanation = self._invoke_bedrock(prompt)
+        if not explanation:
             return None
+        explanation = explanation.strip()
 
-        try:
-            # Parse the JSON response
-            feedback = json.loads(response.strip())
-            return feedback
-        except:
-            # If JSON parsing fails, return a basic response with a default correct answer
-            return {
-                "correct": False,
-                "explanation": "Unable to generate detailed feedback. Please try again.",
-                "correct_answer": 1  # Default to first option
-            }
+        if cache_path:
+            try:
+                os.makedirs(self.explanation_cache_dir, exist_ok=True)
+                with open(cache_path, 'w', encoding='utf-8') as f:
+                    f.write(explanation)
+            except Exception as e:
+                print(f"Error caching explanation: {str(e)}")
+        return explanation
@@ -0,0 +1,128 @@
+import re
+from typing import Dict, List
+
+# Keys a question field can start with, e.g. "Introduction:" or "Options:"
+FIELD_KEYS = ('Introduction', 'Conversation', 'Situation', 'Question', 'Options', 'Answer')
+
+QUESTION_BLOCK = re.compile(r'<question>(.*?)(?:</question>|\Z)', re.S)
+FIELD = re.compile(
+    r'^[ \t]*(' + '|'.join(FIELD_KEYS) + r')[ \t]*[:：][ \t]*(.*?)'
+    r'(?=^[ \t]*(?:' + '|'.join(FIELD_KEYS) + r')[ \t]*[:：]|</question>|\Z)',
+    re.S | re.M
+)
+# A line that starts a field, for parsing line by line
+FIELD_LINE = re.compile(r'^[ \t]*(' + '|'.join(FIELD_KEYS) + r')[ \t]*[:：][ \t]*(.*)$')
+OPTION = re.compile(r'^[ \t]*([1-4])[.．)）][ \t]*(.*?)[ \t]*$', re.M)
+ANSWER_NUMBER = re.compile(r'[1-4]')
+
+
+def parse_question_text(text: str, joiner: str = ' ') -> Dict:
+    """
+    Parse one question's fields from text.
+    Multi-line field values are joined with joiner; options become a list
+    and an "Answer: N" line becomes CorrectAnswer.
+    """
+    question = {}
+    for match in FIELD.finditer(text):
+        key, value = match.group(1), match.group(2)
+        if key == 'Options':
+            question['Options'] = [option.group(2) for option in OPTION.finditer(value)]
+        elif key == 'Answer':
+            answer = ANSWER_NUMBER.search(value)
+            if answer:
+                question['CorrectAnswer'] = int(answer.group())
+        else:
+            question[key] = joiner.join(line.strip() for line in value.splitlines() if line.strip())
+    return question
+
+
+def parse_questions(text: str, joiner: str = '') -> List[Dict]:
+    """
+    Parse every <question>...</question> block in structured question text.
+    Transcript-derived files break lines mid-phrase, so lines are joined
+    without a separator by default.
+    """
+    questions = []
+    for block in QUESTION_BLOCK.finditer(text):
+        question = parse_question_text(block.group(1), joiner=joiner)
+        if question:
+            questions.append(question)
+    return questions
+
+
+def parse_questions_file(filename: str) -> List[Dict]:
+    """Parse questions from a structured text file"""
+    with open(filename, 'r', encoding='utf-8') as f:
+        return parse_questions(f.read())
+
+
+class StreamingQuestionParser:
+    """
+    Parses a generated question from text that may arrive in chunks.
+    feed() returns the question parsed so far, so callers can render fields
+    while the model is still writing.
+
+    Text is parsed a line at a time as lines complete, so each chunk only
+    costs the lines it finishes; fields are read as in parse_question_text.
+    """
+    def __init__(self, joiner: str = ' '):
+        self.joiner = joiner
+        self._partial = ""
+        self._question = {}
+        # Field the next lines belong to, or None before the first field
+        self._key = None
+        self._answered = False
+        self._closed = False
+
+    def _add_line(self, line: str):
+        """Add one line of the current field's value"""
+        if self._key == 'Options':
+            option = OPTION.match(line)
+            if option:
+                self._question['Options'].append(option.group(2))
+        elif self._key == 'Answer':
+            answer = ANSWER_NUMBER.search(line)
+            if answer and not self._answered:
+                self._question['CorrectAnswer'] = int(answer.group())
+                self._answered = True
+        elif line.strip():
+            value = self._question[self._key]
+            self._question[self._key] = f"{value}{self.joiner}{line.strip()}" if value else line.strip()
+
+    def _parse_line(self, line: str):
+        if self._closed:
+            return
+        if '</question>' in line:
+            line = line.split('</question>', 1)[0]
+            self._closed = True
+        field = FIELD_LINE.match(line)
+        if field:
+            self._key = field.group(1)
+            self._answered = False
+            if self._key == 'Options':
+                self._question['Options'] = []
+            elif self._key != 'Answer':
+                self._question[self._key] = ""
+            self._add_line(field.group(2))
+        elif self._key:
+            self._add_line(line)
+
+    def _snapshot(self) -> Dict:
+        question = dict(self._question)
+        if 'Options' in question:
+            question['Options'] = list(question['Options'])
+        return question
+
+    def feed(self, chunk: str) -> Dict:
+        """Add generated text and return the question parsed from its complete lines so far"""
+        *lines, self._partial = (self._partial + chunk).split('\n')
+        for line in lines:
+            self._parse_line(line)
+        return self._snapshot()
+
+    def close(self) -> Dict:
+        """Return the complete question"""
+        if self._partial:
+            self._parse_line(self._partial)
+            self._partial = ""
+        return self._snapshot()
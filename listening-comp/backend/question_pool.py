@@ -0,0 +1,119 @@
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Tuple
+
+
+class QuestionPool:
+    """
+    Per-(section, topic) pool of pre-generated questions.
+    Background workers keep each pool filled to target_depth; get() serves a
+    pooled question instantly and queues a replacement.
+
+    A key whose refill fails (e.g. no similar questions for the topic) is not
+    refilled again until a backoff of retry_seconds has passed, doubling with
+    each consecutive failure up to max_retry_seconds.
+    """
+    def __init__(self, question_generator, target_depth: int = 3, max_workers: int = 2,
+                 retry_seconds: float = 5.0, max_retry_seconds: float = 300.0):
+        self.question_generator = question_generator
+        self.target_depth = target_depth
+        self.retry_seconds = retry_seconds
+        self.max_retry_seconds = max_retry_seconds
+        self.executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="question-pool")
+        self._lock = threading.Lock()
+        self._pools: Dict[Tuple[int, str], deque] = {}
+        self._pending: Dict[Tuple[int, str], int] = {}
+        # key -> consecutive refill failures, and the time refills may resume
+        self._failures: Dict[Tuple[int, str], int] = {}
+        self._retry_at: Dict[Tuple[int, str], float] = {}
+        self._stats = {'hits': 0, 'misses': 0, 'refills': 0, 'refill_failures': 0, 'refill_seconds': 0.0}
+
+    def prefetch(self, section_num: int, topic: str):
+        """Queue background generation until the pool reaches target_depth, unless the key is backing off"""
+        key = (section_num, topic)
+        with self._lock:
+            if time.monotonic() < self._retry_at.get(key, 0.0):
+                return
+            pool = self._pools.setdefault(key, deque())
+            missing = self.target_depth - len(pool) - self._pending.get(key, 0)
+            if missing <= 0:
+                return
+            self._pending[key] = self._pending.get(key, 0) + missing
+        for _ in range(missing):
+            self.executor.submit(self._refill_one, key)
+
+    def _refill_one(self, key: Tuple[int, str]):
+        """Worker: generate one question for a pool"""
+        start = time.perf_counter()
+        try:
+            question = self.question_generator.generate_similar_question(*key)
+        except Exception as e:
+            print(f"Error pre-generating question for {key}: {str(e)}")
+            question = None
+        elapsed = time.perf_counter() - start
+
+        with self._lock:
+            self._pending[key] -= 1
+            if question:
+                self._pools[key].append(question)
+                self._stats['refills'] += 1
+                self._stats['refill_seconds'] += elapsed
+                self._failures.pop(key, None)
+                self._retry_at.pop(key, None)
+            else:
+                self._stats['refill_failures'] += 1
+                failures = self._failures.get(key, 0) + 1
+                self._failures[key] = failures
+                backoff = min(self.retry_seconds * 2 ** (failures - 1), self.max_retry_seconds)
+                self._retry_at[key] = time.monotonic() + backoff
+
+    def take(self, section_num: int, topic: str) -> Optional[Dict]:
+        """
+        Return a pooled question for the section and topic, or None if none
+        is ready yet; either way the pool is topped up in the background.
+        """
+        key = (section_num, topic)
+        with self._lock:
+            pool = self._pools.setdefault(key, deque())
+            question = pool.popleft() if pool else None
+            self._stats['hits' if question else 'misses'] += 1
+
+        self.prefetch(section_num, topic)
+        return question
+
+    def get(self, section_num: int, topic: str) -> Optional[Dict]:
+        """
+        Return a question for the section and topic, from the pool when one
+        is ready or generated on the spot otherwise, then top the pool up.
+        """
+        question = self.take(section_num, topic)
+        if question is None:
+            question = self.question_generator.generate_similar_question(section_num, topic)
+        return question
+
+    def depth(self, section_num: int, topic: str) -> int:
+        """Number of questions ready for the section and topic"""
+        with self._lock:
+            return len(self._pools.get((section_num, topic), ()))
+
+    def metrics(self) -> Dict:
+        """Pool hit-rate and refill latency"""
+        with self._lock:
+            stats = dict(self._stats)
+            depths = {f"{section}:{topic}": len(pool) for (section, topic), pool in self._pools.items()}
+            now = time.monotonic()
+            backing_off = {f"{section}:{topic}": round(retry_at - now, 1)
+                           for (section, topic), retry_at in self._retry_at.items() if retry_at > now}
+        requests = stats['hits'] + stats['misses']
+        return {
+            'hits': stats['hits'],
+            'misses': stats['misses'],
+            'hit_rate': stats['hits'] / requests if requests else 0.0,
+            'refills': stats['refills'],
+            'refill_failures': stats['refill_failures'],
+            'avg_refill_seconds': stats['refill_seconds'] / stats['refills'] if stats['refills'] else None,
+            'depths': depths,
+            'backing_off': backing_off,
+        }
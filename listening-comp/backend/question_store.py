@@ -0,0 +1,181 @@
+import json
+import os
+import sqlite3
+import threading
+from datetime import datetime
+from typing import Dict, List, Optional
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "data")
+DB_FILE = os.path.join(DATA_DIR, "questions.sqlite3")
+
+# Questions were stored here before the SQLite store; imported once on first start
+LEGACY_JSON_FILE = os.path.join(DATA_DIR, "stored_questions.json")
+
+
+class QuestionStore:
+    """
+    SQLite-backed store for generated questions.
+    Saving inserts a single row and listing reads one indexed page, so neither
+    grows with the number of stored questions.
+    """
+    def __init__(self, db_file: str = DB_FILE, legacy_json_file: Optional[str] = LEGACY_JSON_FILE):
+        os.makedirs(os.path.dirname(db_file), exist_ok=True)
+        self.conn = sqlite3.connect(db_file, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self._lock = threading.Lock()
+
+        with self._lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.executescript("""
+                CREATE TABLE IF NOT EXISTS questions (
+                    id TEXT PRIMARY KEY,
+                    question TEXT NOT NULL,
+                    practice_type TEXT NOT NULL,
+                    topic TEXT NOT NULL,
+                    created_at TEXT NOT NULL,
+                    audio_file TEXT
+                );
+                CREATE INDEX IF NOT EXISTS idx_questions_practice_type ON questions(practice_type, created_at);
+                CREATE INDEX IF NOT EXISTS idx_questions_topic ON questions(topic, created_at);
+                CREATE INDEX IF NOT EXISTS idx_questions_created_at ON questions(created_at);
+                CREATE TABLE IF NOT EXISTS meta (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+            """)
+
+        if legacy_json_file:
+            self.migrate_from_json(legacy_json_file)
+
+    def migrate_from_json(self, json_file: str) -> int:
+        """Import questions from the legacy stored_questions.json once; returns rows imported"""
+        if not os.path.exists(json_file):
+            return 0
+
+        with self._lock:
+            migrated = self.conn.execute(
+                "SELECT value FROM meta WHERE key = 'migrated_json'"
+            ).fetchone()
+            if migrated:
+                return 0
+
+            try:
+                with open(json_file, 'r', encoding='utf-8') as f:
+                    stored_questions = json.load(f)
+            except Exception as e:
+                print(f"Error reading {json_file}: {str(e)}")
+                return 0
+
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT OR IGNORE INTO questions (id, question, practice_type, topic, created_at, audio_file) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    [
+                        (
+                            question_id,
+                            json.dumps(data['question'], ensure_ascii=False),
+                            data['practice_type'],
+                            data['topic'],
+                            data['created_at'],
+                            data.get('audio_file')
+                        )
+                        for question_id, data in stored_questions.items()
+                    ]
+                )
+                self.conn.execute(
+                    "INSERT INTO meta (key, value) VALUES ('migrated_json', ?)",
+                    (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),)
+                )
+            print(f"Migrated {len(stored_questions)} questions from {json_file}")
+            return len(stored_questions)
+
+    def save_question(self, question: Dict, practice_type: str, topic: str, audio_file: Optional[str] = None) -> str:
+        """Insert a generated question and return its id"""
+        now = datetime.now()
+        # Timestamp ids like the JSON store, with microseconds so quick saves never collide
+        question_id = now.strftime("%Y%m%d_%H%M%S_%f")
+        with self._lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO questions (id, question, practice_type, topic, created_at, audio_file) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (
+                    question_id,
+                    json.dumps(question, ensure_ascii=False),
+                    practice_type,
+                    topic,
+                    now.strftime("%Y-%m-%d %H:%M:%S"),
+                    audio_file
+                )
+            )
+        return question_id
+
+    def update_audio(self, question_id: str, audio_file: str):
+        """Attach a generated audio file to a stored question"""
+        with self._lock, self.conn:
+            self.conn.execute(
+                "UPDATE questions SET audio_file = ? WHERE id = ?",
+                (audio_file, question_id)
+            )
+
+    def update_correct_answer(self, question_id: str, correct_answer: int):
+        """Record the correct answer determined for a question saved without one"""
+        with self._lock, self.conn:
+            row = self.conn.execute(
+                "SELECT question FROM questions WHERE id = ?", (question_id,)
+            ).fetchone()
+            if not row:
+                return
+            question = json.loads(row['question'])
+            question['CorrectAnswer'] = correct_answer
+            self.conn.execute(
+                "UPDATE questions SET question = ? WHERE id = ?",
+                (json.dumps(question, ensure_ascii=False), question_id)
+            )
+
+    def get_question(self, question_id: str) -> Optional[Dict]:
+        """Load a stored question with its metadata"""
+        with self._lock:
+            row = self.conn.execute(
+                "SELECT * FROM questions WHERE id = ?", (question_id,)
+            ).fetchone()
+        if not row:
+            return None
+        data = dict(row)
+        data['question'] = json.loads(data['question'])
+        return data
+
+    def _filters(self, practice_type: Optional[str], topic: Optional[str]):
+        clauses, params = [], []
+        if practice_type:
+            clauses.append("practice_type = ?")
+            params.append(practice_type)
+        if topic:
+            clauses.append("topic = ?")
+            params.append(topic)
+        return (f"WHERE {' AND '.join(clauses)}" if clauses else ""), params
+
+    def list_questions(
+        self,
+        limit: int = 20,
+        offset: int = 0,
+        practice_type: Optional[str] = None,
+        topic: Optional[str] = None
+    ) -> List[Dict]:
+        """
+        One page of question summaries, newest first.
+        Question bodies are not decoded; use get_question to load one.
+        """
+        where, params = self._filters(practice_type, topic)
+        with self._lock:
+            rows = self.conn.execute(
+                f"SELECT id, practice_type, topic, created_at, audio_file FROM questions {where} "
+                "ORDER BY created_at DESC, id DESC LIMIT ? OFFSET ?",
+                params + [limit, offset]
+            ).fetchall()
+        return [dict(row) for row in rows]
+
+    def count_questions(self, practice_type: Optional[str] = None, topic: Optional[str] = None) -> int:
+        """Number of stored questions matching the filters"""
+        where, params = self._filters(practice_type, topic)
+        with self._lock:
+            return self.conn.execute(f"SELECT COUNT(*) FROM questions {where}", params).fetchone()[0]
@@ -1,16 +1,67 @@
-from typing import Optional, Dict, List
-import boto3
+from typing import Optional, Dict, List, Iterable, Tuple
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import hashlib
+import re
 import os
+import tempfile
+from backend.clients import get_bedrock_client
 
 # Model ID
 #MODEL_ID = "amazon.nova-micro-v1:0"
 MODEL_ID = "amazon.nova-lite-v1:0"
 
+# Sections extracted by default (section 1 is skipped for now)
+DEFAULT_SECTIONS = (2, 3)
+
+# Extraction results are cached here so re-running on the same video is free
+CACHE_DIR = "backend/data/cache/structured"
+
+# Section instructions start with e.g. 問題2では (auto-captions may split it across lines)
+SECTION_MARKER = re.compile(r'問\s*題\s*([1-4１-４])\s*で\s*は')
+
+# Characters of context kept on either side of a section slice
+SECTION_OVERLAP = 200
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token estimate: one token per CJK character, four characters per token otherwise"""
+    cjk = sum(1 for c in text if '\u3040' <= c <= '\u30ff' or '\u4e00' <= c <= '\u9fff')
+    return cjk + (len(text) - cjk) // 4
+
+
+def locate_sections(transcript: str) -> Dict[int, tuple]:
+    """
+    Find the (start, end) character offsets of each 問題N section in the transcript.
+    Sections whose marker cannot be found are left out.
+    """
+    starts = {}
+    for match in SECTION_MARKER.finditer(transcript):
+        section_num = int(match.group(1).translate(str.maketrans('１２３４', '1234')))
+        starts.setdefault(section_num, match.start())
+
+    ordered = sorted(starts.items(), key=lambda item: item[1])
+    sections = {}
+    for idx, (section_num, start) in enumerate(ordered):
+        end = ordered[idx + 1][1] if idx + 1 < len(ordered) else len(transcript)
+        sections[section_num] = (start, end)
+    return sections
+
+
+def slice_transcript(transcript: str, section_num: int, overlap: int = SECTION_OVERLAP) -> Optional[str]:
+    """Return the part of the transcript covering one section, or None if its marker is missing"""
+    bounds = locate_sections(transcript).get(section_num)
+    if not bounds:
+        return None
+    start, end = bounds
+    return transcript[max(0, start - overlap):min(len(transcript), end + overlap)]
+
 class TranscriptStructurer:
-    def __init__(self, model_id: str = MODEL_ID):
-        """Initialize Bedrock client"""
-        self.bedrock_client = boto3.client('bedrock-runtime', region_name="us-east-1")
+    def __init__(self, model_id: str = MODEL_ID, cache_dir: Optional[str] = CACHE_DIR, max_workers: int = 3):
+        """Initialize the structurer (the Bedrock client is shared and created on first use)"""
         self.model_id = model_id
+        self.cache_dir = cache_dir
+        self.max_workers = max_workers
         self.prompts = {
             1: """Extract questions from section 問題1 of this JLPT transcript where the answer can be determined solely from the conversation without needing visual aids.
             
@@ -120,6 +171,11 @@ class TranscriptStructurer:
             """
         }
 
+    @property
+    def bedrock_client(self):
+        """Shared Bedrock runtime client, created on first use"""
+        return get_bedrock_client()
+
     def _invoke_bedrock(self, prompt: str, transcript: str) -> Optional[str]:
         """Make a single call to Bedrock with the given prompt"""
         full_prompt = f"{prompt}\n\nHere's the transcript:\n{transcript}"
@@ -140,14 +196,132 @@ class TranscriptStructurer:
             print(f"Error invoking Bedrock: {str(e)}")
             return None
 
-    def structure_transcript(self, transcript: str) -> Dict[int, str]:
-        """Structure the transcript into three sections using separate prompts"""
+    def _cache_path(self, prompt: str, transcript: str) -> Optional[str]:
+        """Cache file for a (transcript hash, prompt hash, model_id) key"""
+        if not self.cache_dir:
+            return None
+        transcript_hash = hashlib.sha256(transcript.encode('utf-8')).hexdigest()
+        prompt_hash = hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+        key = hashlib.sha256(f"{transcript_hash}:{prompt_hash}:{self.model_id}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.txt")
+
+    def _invoke_bedrock_cached(self, prompt: str, transcript: str) -> Optional[str]:
+        """Call Bedrock unless the same prompt/transcript/model was already extracted"""
+        cache_path = self._cache_path(prompt, transcript)
+        if cache_path and os.path.exists(cache_path):
+            try:
+                with open(cache_path, 'r', encoding='utf-8') as f:
+                    return f.read()
+            except Exception as e:
+                print(f"Error reading cache {cache_path}: {str(e)}")
+
+        result = self._invoke_bedrock(prompt, transcript)
+
+        if result and cache_path:
+            try:
+                os.makedirs(self.cache_dir, exist_ok=True)
+                # Write to a temp file of our own first so concurrent threads and runs never see partial results
+                with tempfile.NamedTemporaryFile('w', encoding='utf-8', dir=self.cache_dir,
+                                                 suffix='.tmp', delete=False) as f:
+                    f.write(result)
+                os.replace(f.name, cache_path)
+            except Exception as e:
+                print(f"Error writing cache {cache_path}: {str(e)}")
+        return result
+
+    def _section_inputs(self, transcript: str, sections: List[int]) -> Tuple[Dict[int, str], Dict]:
+        """
+        Pick the transcript text sent with each section prompt.
+        Falls back to the full transcript when a section marker is missing.
+        Returns the inputs and their input token usage.
+        """
+        inputs = {}
+        fallbacks = []
+        for section_num in sections:
+            section_text = slice_transcript(transcript, section_num)
+            if section_text is None:
+                fallbacks.append(section_num)
+                section_text = transcript
+            inputs[section_num] = section_text
+
+        full_tokens = estimate_tokens(transcript) * len(sections)
+        sent_tokens = sum(estimate_tokens(text) for text in inputs.values())
+        stats = {
+            "input_tokens_full": full_tokens,
+            "input_tokens_sent": sent_tokens,
+            "input_tokens_saved": full_tokens - sent_tokens,
+            "fallback_sections": fallbacks,
+        }
+        return inputs, stats
+
+    def structure_transcript(self, transcript: str, sections: Iterable[int] = DEFAULT_SECTIONS) -> Dict[int, str]:
+        """Structure the transcript into sections, extracting each section concurrently"""
+        return self.structure_transcript_with_stats(transcript, sections)[0]
+
+    def structure_transcript_with_stats(self, transcript: str,
+                                        sections: Iterable[int] = DEFAULT_SECTIONS) -> Tuple[Dict[int, str], Dict]:
+        """
+        Structure the transcript like structure_transcript, also returning the
+        input token usage of this call (safe when files are structured concurrently)
+        """
+        sections = list(sections)
         results = {}
-        # Skipping section 1 for now
-        for section_num in range(2, 4):
-            result = self._invoke_bedrock(self.prompts[section_num], transcript)
-            if result:
-                results[section_num] = result
+        inputs, stats = self._section_inputs(transcript, sections)
+        if not sections:
+            return results, stats
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(sections))) as executor:
+            futures = {
+                executor.submit(self._invoke_bedrock_cached, self.prompts[section_num], inputs[section_num]): section_num
+                for section_num in sections
+            }
+            for future in as_completed(futures):
+                result = future.result()
+                if result:
+                    results[futures[future]] = result
+
+        # Keep section order stable regardless of completion order
+        return dict(sorted(results.items())), stats
+
+    def structure_file(self, transcript_file: str, questions_dir: str) -> bool:
+        """Structure a single transcript file and save its sections to questions_dir"""
+        transcript = self.load_transcript(transcript_file)
+        if not transcript:
+            return False
+        structured_sections, stats = self.structure_transcript_with_stats(transcript)
+        print(f"{os.path.basename(transcript_file)}: sent ~{stats['input_tokens_sent']} input tokens, "
+              f"saved ~{stats['input_tokens_saved']} of {stats['input_tokens_full']}"
+              + (f" (full transcript used for sections {stats['fallback_sections']})" if stats['fallback_sections'] else ""))
+        if not structured_sections:
+            return False
+        base_filename = os.path.join(questions_dir, os.path.basename(transcript_file))
+        return self.save_questions(structured_sections, base_filename)
+
+    def structure_directory(self, transcripts_dir: str, questions_dir: str, max_workers: int = 2) -> Dict[str, bool]:
+        """
+        Structure every transcript in a directory with bounded concurrency.
+        Returns a mapping of transcript filename to success.
+        """
+        transcript_files = sorted(
+            os.path.join(transcripts_dir, name)
+            for name in os.listdir(transcripts_dir)
+            if name.endswith('.txt')
+        )
+
+        results = {}
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                executor.submit(self.structure_file, transcript_file, questions_dir): transcript_file
+                for transcript_file in transcript_files
+            }
+            for future in as_completed(futures):
+                transcript_file = futures[future]
+                try:
+                    results[transcript_file] = future.result()
+                except Exception as e:
+                    print(f"Error structuring {transcript_file}: {str(e)}")
+                    results[transcript_file] = False
+                print(f"{'Structured' if results[transcript_file] else 'Failed'}: {transcript_file}")
         return results
 
     def save_questions(self, structured_sections: Dict[int, str], base_filename: str) -> bool:
@@ -175,9 +349,22 @@ class TranscriptStructurer:
             print(f"Error loading transcript: {str(e)}")
             return None
 
+def main():
+    parser = argparse.ArgumentParser(description="Structure JLPT transcripts into question files")
+    parser.add_argument("transcript", nargs="?", default="backend/data/transcripts/sY7L5cfCWno.txt",
+                        help="Transcript file to structure (ignored when --dir is given)")
+    parser.add_argument("--dir", help="Structure every .txt transcript in this directory")
+    parser.add_argument("--out", default="backend/data/questions", help="Directory to write question files to")
+    parser.add_argument("--workers", type=int, default=2, help="Number of transcripts processed concurrently")
+    parser.add_argument("--no-cache", action="store_true", help="Always call Bedrock, ignoring cached results")
+    args = parser.parse_args()
+
+    structurer = TranscriptStructurer(cache_dir=None if args.no_cache else CACHE_DIR)
+    if args.dir:
+        results = structurer.structure_directory(args.dir, args.out, max_workers=args.workers)
+        print(f"Structured {sum(results.values())}/{len(results)} transcripts")
+    else:
+        structurer.structure_file(args.transcript, args.out)
+
 if __name__ == "__main__":
-    structurer = TranscriptStructurer()
-    transcript = structurer.load_transcript("backend/data/transcripts/sY7L5cfCWno.txt")
-    if transcript:
-        structured_sections = structurer.structure_transcript(transcript)
-        structurer.save_questions(structured_sections, "backend/data/questions/sY7L5cfCWno.txt")
\ No newline at end of file
+    main()
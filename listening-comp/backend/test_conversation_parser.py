@@ -0,0 +1,120 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.conversation_parser import (
+    INTRO_PHRASE, QUESTION_PREFIX, parse_conversation_local, speaker_gender, split_conversation
+)
+
+
+def test_split_on_newlines():
+    conversation = """
+    男性: すみません、この電車は新宿駅に止まりますか。
+    女性: はい、次の駅が新宿です。
+    """
+    assert split_conversation(conversation) == [
+        ("男性", "すみません、この電車は新宿駅に止まりますか。"),
+        ("女性", "はい、次の駅が新宿です。"),
+    ]
+
+
+def test_split_after_sentence_end_without_whitespace():
+    conversation = "男性：会議は10:30からです。女性：わかりました。"
+    assert split_conversation(conversation) == [
+        ("男性", "会議は10:30からです。"),
+        ("女性", "わかりました。"),
+    ]
+
+
+def test_split_after_question_mark_and_quote():
+    conversation = "店員：いらっしゃいませ。何にしますか？客：コーヒーをください。男の人：「はい」女の人：どうぞ。"
+    assert [label for label, _ in split_conversation(conversation)] == ["店員", "客", "男の人", "女の人"]
+
+
+def test_times_are_not_speakers():
+    turns = split_conversation("女の人: 10:30 に駅で会いましょう。 男の人: 11：00 はどうですか。")
+    assert turns == [
+        ("女の人", "10:30 に駅で会いましょう。"),
+        ("男の人", "11：00 はどうですか。"),
+    ]
+
+
+def test_unlabelled_conversation_is_not_split():
+    assert split_conversation("今日はいい天気ですね。そうですね。") is None
+    # Text before the first label would be dropped, so it is not split either
+    assert split_conversation("あの、男性: こんにちは。") is None
+    # An empty turn means the labels were not speakers
+    assert split_conversation("男性: 女性: こんにちは。") is None
+
+
+def test_speaker_gender():
+    assert speaker_gender("男性") == "male"
+    assert speaker_gender("女の人") == "female"
+    assert speaker_gender("Woman") == "female"
+    assert speaker_gender("Man") == "male"
+    assert speaker_gender("店員") is None
+
+
+def test_parse_dialogue_question():
+    question = {
+        "Introduction": "次の会話を聞いて、質問に答えてください。",
+        "Conversation": "男性：会議は10:30からです。店員：わかりました。",
+        "Question": "会議は何時からですか。",
+    }
+    assert parse_conversation_local(question) == [
+        ("Announcer", INTRO_PHRASE, "male"),
+        ("男性", "会議は10:30からです。", "male"),
+        # Unmarked speakers take the less common voice
+        ("店員", "わかりました。", "female"),
+        ("Announcer", f"{QUESTION_PREFIX}会議は何時からですか。", "male"),
+    ]
+
+
+def test_parse_keeps_non_standard_introduction():
+    question = {
+        "Introduction": "駅で男の人と女の人が話しています。",
+        "Conversation": "男の人: 何番線ですか。\n女の人: 3番線です。",
+        "Question": "電車は何番線ですか。",
+    }
+    parts = parse_conversation_local(question)
+    assert parts[1] == ("Announcer", "駅で男の人と女の人が話しています。", "male")
+    assert [gender for _, _, gender in parts[2:4]] == ["male", "female"]
+
+
+def test_unmarked_speakers_get_different_voices():
+    question = {
+        "Conversation": "店員：いらっしゃいませ。客：コーヒーをください。店員：かしこまりました。",
+        "Question": "客は何を頼みましたか。",
+    }
+    parts = parse_conversation_local(question)
+    assert [(label, gender) for label, _, gender in parts[1:4]] == [
+        ("店員", "male"), ("客", "female"), ("店員", "male")
+    ]
+
+
+def test_parse_drops_only_the_standard_introduction_sentence():
+    question = {
+        "Introduction": "次の会話を聞いて、質問に答えてください。会社で男の人と女の人が話しています。",
+        "Conversation": "男の人: 会議は何時ですか。\n女の人: 3時です。",
+        "Question": "会議は何時ですか。",
+    }
+    parts = parse_conversation_local(question)
+    assert parts[:2] == [
+        ("Announcer", INTRO_PHRASE, "male"),
+        ("Announcer", "会社で男の人と女の人が話しています。", "male"),
+    ]
+
+
+def test_parse_situation_question():
+    question = {"Situation": "友達に本を借りたいです。何と言いますか。", "Question": "何と言いますか。"}
+    assert parse_conversation_local(question) == [
+        ("Announcer", INTRO_PHRASE, "male"),
+        ("Announcer", "友達に本を借りたいです。何と言いますか。", "male"),
+        ("Announcer", f"{QUESTION_PREFIX}何と言いますか。", "male"),
+    ]
+
+
+def test_parse_falls_back_when_unparseable():
+    assert parse_conversation_local({"Conversation": "こんにちは。", "Question": "何ですか。"}) is None
+    assert parse_conversation_local({"Conversation": "男性: はい。"}) is None
+    assert parse_conversation_local({"Question": "何ですか。"}) is None
@@ -0,0 +1,102 @@
+import sys
+import os
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from backend.question_parser import StreamingQuestionParser, parse_question_text, parse_questions
+
+GENERATED_QUESTION = """<question>
+Introduction: 次の会話を聞いて、質問に答えてください。
+Conversation:
+男性: すみません、この電車は新宿駅に止まりますか。
+女性: はい、次の駅が新宿です。
+Question: 新宿駅まで何分かかりますか。
+Options:
+1. 3分です。
+2. 5分です。
+3. 10分です。
+4. 15分です。
+Answer: 2
+</question>
+"""
+
+
+def test_multi_line_fields_are_joined():
+    question = parse_question_text(GENERATED_QUESTION)
+    assert question['Introduction'] == "次の会話を聞いて、質問に答えてください。"
+    assert question['Conversation'] == "男性: すみません、この電車は新宿駅に止まりますか。 女性: はい、次の駅が新宿です。"
+    assert question['Question'] == "新宿駅まで何分かかりますか。"
+
+
+def test_options_become_a_list():
+    question = parse_question_text(GENERATED_QUESTION)
+    assert question['Options'] == ["3分です。", "5分です。", "10分です。", "15分です。"]
+
+
+def test_answer_line_becomes_correct_answer():
+    assert parse_question_text(GENERATED_QUESTION)['CorrectAnswer'] == 2
+    assert parse_question_text("Question: どれですか。\nAnswer: 正解は 3 です")['CorrectAnswer'] == 3
+    assert 'CorrectAnswer' not in parse_question_text("Question: どれですか。\nAnswer: わかりません")
+
+
+def test_full_width_colons_and_numbering():
+    text = "Situation：駅で話しています。\nQuestion：どこへ行きますか。\nOptions：\n1．新宿\n2）渋谷\n3)池袋\n4. 上野\nAnswer：4"
+    assert parse_question_text(text) == {
+        'Situation': "駅で話しています。",
+        'Question': "どこへ行きますか。",
+        'Options': ["新宿", "渋谷", "池袋", "上野"],
+        'CorrectAnswer': 4,
+    }
+
+
+def test_parse_questions_joins_transcript_lines_without_separator():
+    text = """<question>
+Situation:
+男の人が駅員と
+話しています。
+Question: 男の人はどうしますか。
+</question>
+<question>
+Introduction: 次の会話を聞いてください。
+Conversation: 女：こんにちは。
+Question: 何をしますか。
+</question>
+"""
+    assert parse_questions(text) == [
+        {'Situation': "男の人が駅員と話しています。", 'Question': "男の人はどうしますか。"},
+        {'Introduction': "次の会話を聞いてください。", 'Conversation': "女：こんにちは。", 'Question': "何をしますか。"},
+    ]
+
+
+def test_parse_questions_skips_empty_blocks():
+    assert parse_questions("<question>\n</question>\n<question>Question: 何ですか。</question>") == [
+        {'Question': "何ですか。"}
+    ]
+
+
+def test_streaming_matches_whole_text_for_any_chunk_size():
+    expected = parse_question_text(GENERATED_QUESTION)
+    for size in (1, 3, 7, 64, len(GENERATED_QUESTION)):
+        parser = StreamingQuestionParser()
+        for start in range(0, len(GENERATED_QUESTION), size):
+            parser.feed(GENERATED_QUESTION[start:start + size])
+        assert parser.close() == expected
+
+
+def test_streaming_returns_fields_from_complete_lines():
+    parser = StreamingQuestionParser()
+    assert parser.feed("Introduction: 次の会話を") == {}
+    assert parser.feed("聞いてください。\nConversation:\n男性: こんにちは。\n") == {
+        'Introduction': "次の会話を聞いてください。",
+        'Conversation': "男性: こんにちは。",
+    }
+    assert parser.feed("女性: こんにちは。\nAnswer: 1") == {
+        'Introduction': "次の会話を聞いてください。",
+        'Conversation': "男性: こんにちは。 女性: こんにちは。",
+    }
+    assert parser.close()['CorrectAnswer'] == 1
+
+
+def test_streaming_stops_at_closing_tag():
+    parser = StreamingQuestionParser()
+    parser.feed("Question: 何ですか。</question>\nAnswer: 2\n")
+    assert parser.close() == {'Question': "何ですか。"}
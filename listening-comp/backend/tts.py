@@ -0,0 +1,27 @@
+from backend.clients import get_client
+
+
+class PollyTTS:
+    """Amazon Polly neural text-to-speech"""
+    engine = 'polly-neural'
+
+    def __init__(self, polly_client=None):
+        # A stand-in such as fakes.FakePollyClient can be given for tests and benchmarks
+        self._polly = polly_client
+
+    @property
+    def polly(self):
+        """Polly client (the shared one unless a client was given)"""
+        return self._polly or get_client('polly')
+
+    def synthesize(self, text: str, voice_name: str) -> bytes:
+        """Synthesize text and return MP3 bytes"""
+        response = self.polly.synthesize_speech(
+            Text=text,
+            OutputFormat='mp3',
+            VoiceId=voice_name,
+            Engine='neural',
+            LanguageCode='ja-JP'
+        )
+        return response['AudioStream'].read()
+
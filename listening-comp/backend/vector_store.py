@@ -2,15 +2,22 @@ import chromadb
 from chromadb.utils import embedding_functions
 import json
 import os
-import boto3
+import shutil
+from backend.clients import get_bedrock_client
+from backend.question_corpus import CORPUS_FILE, QuestionCorpus
+from backend.question_parser import parse_questions_file
 from typing import Dict, List, Optional
 
 class BedrockEmbeddingFunction(embedding_functions.EmbeddingFunction):
     def __init__(self, model_id="amazon.titan-embed-text-v1"):
         """Initialize Bedrock embedding function"""
-        self.bedrock_client = boto3.client('bedrock-runtime', region_name="us-east-1")
         self.model_id = model_id
 
+    @property
+    def bedrock_client(self):
+        """Shared Bedrock runtime client, created on first use"""
+        return get_bedrock_client()
+
     def __call__(self, texts: List[str]) -> List[List[float]]:
         """Generate embeddings for a list of texts using Bedrock"""
         embeddings = []
@@ -32,7 +39,7 @@ class BedrockEmbeddingFunction(embedding_functions.EmbeddingFunction):
         return embeddings
 
 class QuestionVectorStore:
-    def __init__(self, persist_directory: str = "backend/data/vectorstore"):
+    def __init__(self, persist_directory: str = "backend/data/vectorstore", corpus_file: str = CORPUS_FILE):
         """Initialize the vector store for JLPT listening questions"""
         self.persist_directory = persist_directory
         
@@ -42,6 +49,15 @@ class QuestionVectorStore:
         # Use Bedrock's Titan embedding model
         self.embedding_fn = BedrockEmbeddingFunction()
         
+        # The corpus used to live inside the Chroma directory; move it out once
+        legacy_corpus_file = os.path.join(persist_directory, "questions.sqlite3")
+        if os.path.exists(legacy_corpus_file) and not os.path.exists(corpus_file):
+            os.makedirs(os.path.dirname(corpus_file) or ".", exist_ok=True)
+            shutil.move(legacy_corpus_file, corpus_file)
+
+        # Full question structures live here; Chroma only stores ids and documents
+        self.corpus = QuestionCorpus(corpus_file)
+        
         # Create or get collections for each section type
         self.collections = {
             "section2": self.client.get_or_create_collection(
@@ -63,21 +79,17 @@ class QuestionVectorStore:
             
         collection = self.collections[f"section{section_num}"]
         
-        ids = []
+        # Store the full question structures keyed by id
+        ids = self.corpus.add_questions(section_num, questions, video_id)
+        
         documents = []
         metadatas = []
         
         for idx, question in enumerate(questions):
-            # Create a unique ID for each question
-            question_id = f"{video_id}_{section_num}_{idx}"
-            ids.append(question_id)
-            
-            # Store the full question structure as metadata
             metadatas.append({
                 "video_id": video_id,
                 "section": section_num,
-                "question_index": idx,
-                "full_structure": json.dumps(question)
+                "question_index": idx
             })
             
             # Create a searchable document from the question content
@@ -115,13 +127,22 @@ class QuestionVectorStore:
         
         results = collection.query(
             query_texts=[query],
-            n_results=n_results
+            n_results=n_results,
+            include=['metadatas', 'distances']
         )
         
-        # Convert results to more usable format
+        # Hydrate hits from the corpus by id
+        ids = results['ids'][0]
+        stored = self.corpus.get_questions(ids)
         questions = []
-        for idx, metadata in enumerate(results['metadatas'][0]):
-            question_data = json.loads(metadata['full_structure'])
+        for idx, question_id in enumerate(ids):
+            question_data = stored.get(question_id)
+            if question_data is None:
+                # Indexed before the corpus existed: fall back to the JSON metadata
+                metadata = results['metadatas'][0][idx]
+                if 'full_structure' not in metadata:
+                    continue
+                question_data = json.loads(metadata['full_structure'])
             question_data['similarity_score'] = results['distances'][0][idx]
             questions.append(question_data)
             
@@ -132,6 +153,10 @@ class QuestionVectorStore:
         if section_num not in [2, 3]:
             raise ValueError("Only sections 2 and 3 are currently supported")
             
+        stored = self.corpus.get_questions([question_id])
+        if question_id in stored:
+            return stored[question_id]
+        
         collection = self.collections[f"section{section_num}"]
         
         result = collection.get(
@@ -139,56 +164,14 @@ class QuestionVectorStore:
             include=['metadatas']
         )
         
-        if result['metadatas']:
+        if result['metadatas'] and 'full_structure' in result['metadatas'][0]:
             return json.loads(result['metadatas'][0]['full_structure'])
         return None
 
     def parse_questions_from_file(self, filename: str) -> List[Dict]:
         """Parse questions from a structured text file"""
-        questions = []
-        current_question = {}
-        
         try:
-            with open(filename, 'r', encoding='utf-8') as f:
-                lines = f.readlines()
-                
-            i = 0
-            while i < len(lines):
-                line = lines[i].strip()
-                
-                if line.startswith('<question>'):
-                    current_question = {}
-                elif line.startswith('Introduction:'):
-                    i += 1
-                    if i < len(lines):
-                        current_question['Introduction'] = lines[i].strip()
-                elif line.startswith('Conversation:'):
-                    i += 1
-                    if i < len(lines):
-                        current_question['Conversation'] = lines[i].strip()
-                elif line.startswith('Situation:'):
-                    i += 1
-                    if i < len(lines):
-                        current_question['Situation'] = lines[i].strip()
-                elif line.startswith('Question:'):
-                    i += 1
-                    if i < len(lines):
-                        current_question['Question'] = lines[i].strip()
-                elif line.startswith('Options:'):
-                    options = []
-                    for _ in range(4):
-                        i += 1
-                        if i < len(lines):
-                            option = lines[i].strip()
-                            if option.startswith('1.') or option.startswith('2.') or option.startswith('3.') or option.startswith('4.'):
-                                options.append(option[2:].strip())
-                    current_question['Options'] = options
-                elif line.startswith('</question>'):
-                    if current_question:
-                        questions.append(current_question)
-                        current_question = {}
-                i += 1
-            return questions
+            return parse_questions_file(filename)
         except Exception as e:
             print(f"Error parsing questions from {filename}: {str(e)}")
             return []
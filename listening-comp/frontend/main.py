@@ -1,12 +1,13 @@
 import streamlit as st
 import sys
 import os
-import json
-from datetime import datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from backend.question_generator import QuestionGenerator
 from backend.audio_generator import AudioGenerator
+from backend.audio_jobs import AudioJobQueue, DONE, FAILED
+from backend.question_store import QuestionStore
+from backend.question_pool import QuestionPool
 
 # Page config
 st.set_page_config(
@@ -15,58 +16,78 @@ st.set_page_config(
     layout="wide"
 )
 
-def load_stored_questions():
-    """Load previously stored questions from JSON file"""
-    questions_file = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-        "backend/data/stored_questions.json"
+# Questions shown per sidebar page
+SIDEBAR_PAGE_SIZE = 20
+
+@st.cache_resource
+def get_question_store():
+    """SQLite question store shared across sessions (imports stored_questions.json once)"""
+    return QuestionStore()
+
+@st.cache_resource
+def get_question_pool():
+    """Pre-generated questions per (section, topic), shared across sessions"""
+    return QuestionPool(QuestionGenerator())
+
+@st.cache_resource
+def get_audio_job_queue():
+    """Background audio generation shared across sessions"""
+    return AudioJobQueue(
+        AudioGenerator(),
+        on_complete=lambda job: get_question_store().update_audio(job['question_id'], job['audio_file'])
     )
-    if os.path.exists(questions_file):
-        with open(questions_file, 'r', encoding='utf-8') as f:
-            return json.load(f)
-    return {}
 
 def save_question(question, practice_type, topic, audio_file=None):
-    """Save a generated question to JSON file"""
-    questions_file = os.path.join(
-        os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
-        "backend/data/stored_questions.json"
-    )
-    
-    # Load existing questions
-    stored_questions = load_stored_questions()
-    
-    # Create a unique ID for the question using timestamp
-    question_id = datetime.now().strftime("%Y%m%d_%H%M%S")
-    
-    # Add metadata
-    question_data = {
-        "question": question,
-        "practice_type": practice_type,
-        "topic": topic,
-        "created_at": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
-        "audio_file": audio_file
-    }
-    
-    # Add to stored questions
-    stored_questions[question_id] = question_data
-    
-    # Save back to file
-    os.makedirs(os.path.dirname(questions_file), exist_ok=True)
-    with open(questions_file, 'w', encoding='utf-8') as f:
-        json.dump(stored_questions, f, ensure_ascii=False, indent=2)
-    
-    return question_id
+    """Save a generated question to the question store"""
+    return get_question_store().save_question(question, practice_type, topic, audio_file)
+
+@st.fragment(run_every=1)
+def render_audio_job_status():
+    """Poll the background audio job until it finishes"""
+    job = get_audio_job_queue().status(st.session_state.audio_job_id)
+    if job and job['status'] == DONE and os.path.exists(job['audio_file']):
+        st.session_state.current_audio = job['audio_file']
+        st.session_state.audio_job_id = None
+        st.rerun()
+    elif job is None or job['status'] in (DONE, FAILED):
+        error = job['error'] if job and job['error'] else "audio file was not created"
+        st.error(f"Error generating audio: {error}")
+        if st.button("Retry Audio"):
+            st.session_state.audio_job_id = get_audio_job_queue().submit(
+                st.session_state.current_question,
+                st.session_state.current_question_id
+            )
+            st.rerun()
+    else:
+        st.info("Generating audio in the background...")
+
+def render_question_stream(section_num, topic):
+    """Show a question as it is generated and return it once complete (None on failure)"""
+    placeholder = st.empty()
+    question = None
+    for question in st.session_state.question_generator.generate_similar_question_stream(section_num, topic):
+        if not question:
+            continue
+        with placeholder.container():
+            st.subheader("Generating question...")
+            for key in ('Introduction', 'Conversation', 'Situation', 'Question'):
+                if question.get(key):
+                    st.write(f"**{key}:**")
+                    st.write(question[key])
+    placeholder.empty()
+    return question
 
 def render_interactive_stage():
     """Render the interactive learning stage"""
     # Initialize session state
     if 'question_generator' not in st.session_state:
         st.session_state.question_generator = QuestionGenerator()
-    if 'audio_generator' not in st.session_state:
-        st.session_state.audio_generator = AudioGenerator()
     if 'current_question' not in st.session_state:
         st.session_state.current_question = None
+    if 'current_question_id' not in st.session_state:
+        st.session_state.current_question_id = None
+    if 'audio_job_id' not in st.session_state:
+        st.session_state.audio_job_id = None
     if 'feedback' not in st.session_state:
         st.session_state.feedback = None
     if 'current_practice_type' not in st.session_state:
@@ -75,24 +96,53 @@ def render_interactive_stage():
         st.session_state.current_topic = None
     if 'current_audio' not in st.session_state:
         st.session_state.current_audio = None
+    if 'sidebar_page' not in st.session_state:
+        st.session_state.sidebar_page = 0
         
-    # Load stored questions for sidebar
-    stored_questions = load_stored_questions()
+    # Load one page of stored questions for the sidebar
+    question_store = get_question_store()
+    total_questions = question_store.count_questions()
+    page_count = max(1, -(-total_questions // SIDEBAR_PAGE_SIZE))
+    st.session_state.sidebar_page = min(st.session_state.sidebar_page, page_count - 1)
+    stored_questions = question_store.list_questions(
+        limit=SIDEBAR_PAGE_SIZE,
+        offset=st.session_state.sidebar_page * SIDEBAR_PAGE_SIZE
+    )
     
     # Create sidebar
     with st.sidebar:
         st.header("Saved Questions")
         if stored_questions:
-            for qid, qdata in stored_questions.items():
+            for qdata in stored_questions:
+                qid = qdata['id']
                 # Create a button for each question
                 button_label = f"{qdata['practice_type']} - {qdata['topic']}\n{qdata['created_at']}"
                 if st.button(button_label, key=qid):
+                    qdata = question_store.get_question(qid)
                     st.session_state.current_question = qdata['question']
+                    st.session_state.current_question_id = qid
                     st.session_state.current_practice_type = qdata['practice_type']
                     st.session_state.current_topic = qdata['topic']
                     st.session_state.current_audio = qdata.get('audio_file')
+                    # Pick up audio still being generated in the background
+                    job = get_audio_job_queue().job_for_question(qid)
+                    st.session_state.audio_job_id = job['id'] if job and not st.session_state.current_audio else None
                     st.session_state.feedback = None
                     st.rerun()
+            
+            # Pagination
+            if page_count > 1:
+                prev_col, page_col, next_col = st.columns([1, 2, 1])
+                with prev_col:
+                    if st.button("◀", disabled=st.session_state.sidebar_page == 0):
+                        st.session_state.sidebar_page -= 1
+                        st.rerun()
+                with page_col:
+                    st.caption(f"Page {st.session_state.sidebar_page + 1} of {page_count}")
+                with next_col:
+                    if st.button("▶", disabled=st.session_state.sidebar_page >= page_count - 1):
+                        st.session_state.sidebar_page += 1
+                        st.rerun()
         else:
             st.info("No saved questions yet. Generate some questions to see them here!")
     
@@ -113,20 +163,35 @@ def render_interactive_stage():
         topics[practice_type]
     )
     
+    # Start filling the pool for the selected topic so the next question is instant
+    section_num = 2 if practice_type == "Dialogue Practice" else 3
+    question_pool = get_question_pool()
+    question_pool.prefetch(section_num, topic)
+    
     # Generate new question button
     if st.button("Generate New Question"):
-        section_num = 2 if practice_type == "Dialogue Practice" else 3
-        new_question = st.session_state.question_generator.generate_similar_question(
-            section_num, topic
-        )
+        # Serve a pre-generated question, or stream a new one while the pool fills
+        new_question = question_pool.take(section_num, topic)
+        if new_question is None:
+            new_question = render_question_stream(section_num, topic)
         st.session_state.current_question = new_question
         st.session_state.current_practice_type = practice_type
         st.session_state.current_topic = topic
         st.session_state.feedback = None
         
-        # Save the generated question
-        save_question(new_question, practice_type, topic)
+        st.session_state.current_question_id = None
         st.session_state.current_audio = None
+        st.session_state.audio_job_id = None
+        
+        if new_question:
+            # Save the generated question
+            st.session_state.current_question_id = save_question(new_question, practice_type, topic)
+            
+            # Pre-generate audio in the background while the user reads the question
+            st.session_state.audio_job_id = get_audio_job_queue().submit(
+                new_question,
+                st.session_state.current_question_id
+            )
     
     if st.session_state.current_question:
         st.subheader("Practice Scenario")
@@ -167,13 +232,21 @@ def render_interactive_stage():
                     else:
                         st.write(f"{i+1}. {option}")
                 
-                # Show explanation
-                st.write("\n**Explanation:**")
-                explanation = st.session_state.feedback.get('explanation', 'No feedback available')
-                if correct:
-                    st.success(explanation)
-                else:
-                    st.error(explanation)
+                # Show explanation (generated only when asked for)
+                explanation = st.session_state.feedback.get('explanation')
+                if explanation is None and st.button("Explain Answer"):
+                    with st.spinner("Generating explanation..."):
+                        explanation = st.session_state.question_generator.get_explanation(
+                            st.session_state.current_question,
+                            st.session_state.selected_answer
+                        ) or 'No explanation available'
+                    st.session_state.feedback['explanation'] = explanation
+                if explanation:
+                    st.write("\n**Explanation:**")
+                    if correct:
+                        st.success(explanation)
+                    else:
+                        st.error(explanation)
                 
                 # Add button to try new question
                 if st.button("Try Another Question"):
@@ -192,53 +265,37 @@ def render_interactive_stage():
                 if selected and st.button("Submit Answer"):
                     selected_index = options.index(selected) + 1
                     st.session_state.selected_answer = selected_index
+                    had_answer = 'CorrectAnswer' in st.session_state.current_question
                     st.session_state.feedback = st.session_state.question_generator.get_feedback(
                         st.session_state.current_question,
                         selected_index
                     )
-                    st.rerun()
+                    # Save an answer determined just now so it is not asked for again
+                    if st.session_state.feedback and not had_answer and st.session_state.current_question_id:
+                        get_question_store().update_correct_answer(
+                            st.session_state.current_question_id,
+                            st.session_state.feedback['correct_answer']
+                        )
+                    if st.session_state.feedback:
+                        st.rerun()
+                    else:
+                        st.error("Unable to check this answer. Please try again.")
         
         with col2:
             st.subheader("Audio")
             if st.session_state.current_audio:
                 # Display audio player
                 st.audio(st.session_state.current_audio)
+            elif st.session_state.audio_job_id:
+                render_audio_job_status()
             elif st.session_state.current_question:
-                # Show generate audio button
+                # Queue audio for questions saved without it
                 if st.button("Generate Audio"):
-                    with st.spinner("Generating audio..."):
-                        try:
-                            # Clear any previous audio
-                            if st.session_state.current_audio and os.path.exists(st.session_state.current_audio):
-                                try:
-                                    os.unlink(st.session_state.current_audio)
-                                except Exception:
-                                    pass
-                            st.session_state.current_audio = None
-                            
-                            # Generate new audio
-                            audio_file = st.session_state.audio_generator.generate_audio(
-                                st.session_state.current_question
-                            )
-                            
-                            # Verify the audio file exists
-                            if not os.path.exists(audio_file):
-                                raise Exception("Audio file was not created")
-                                
-                            st.session_state.current_audio = audio_file
-                            
-                            # Update stored question with audio file
-                            save_question(
-                                st.session_state.current_question,
-                                st.session_state.current_practice_type,
-                                st.session_state.current_topic,
-                                audio_file
-                            )
-                            st.rerun()
-                        except Exception as e:
-                            st.error(f"Error generating audio: {str(e)}")
-                            # Clear the audio state on error
-                            st.session_state.current_audio = None
+                    st.session_state.audio_job_id = get_audio_job_queue().submit(
+                        st.session_state.current_question,
+                        st.session_state.current_question_id
+                    )
+                    st.rerun()
             else:
                 st.info("Generate a question to create audio.")
     else: